@@ -0,0 +1,142 @@
+"""Authentication backends and token issuing.
+
+``StatelessJWTAuthentication`` trusts the role and profile-id claims that
+``issue_tokens`` embeds in access tokens, so an authenticated request needs
+no query: ``request.user`` is a User built from the claims with every other
+field deferred, and ``core.principal`` reads the profile ids straight from
+the token. Views that read more of the user load the row once with
+``full_user``. Tokens issued before a user's password, role, active flag or
+profiles change are rejected through a revocation mark kept in the cache for
+the refresh token lifetime.
+
+Revocation marks only reach every worker through a shared cache, so tokens
+are trusted this way only when ``settings.STATELESS_JWT`` is on (it follows
+REDIS_URL). Otherwise the user is loaded from the database on every request
+and simplejwt's password-hash claim catches password changes made in other
+processes.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .models import User
+from .principal import PROFILE_RELATIONS
+
+
+# Fields carried in the token; the rest of the User row is loaded only if read
+CLAIM_FIELDS = ("username", "role", "is_staff", "is_superuser")
+# Issue time as float seconds, compared with revocation marks
+ISSUED_AT_CLAIM = "issued_at"
+
+
+def _revoked_key(user_id):
+    return f"jwt-revoked:{user_id}"
+
+
+def revoke_tokens(user_id):
+    """Reject every JWT issued to `user_id` until now."""
+    cache.set(_revoked_key(user_id), time.time(), int(api_settings.REFRESH_TOKEN_LIFETIME.total_seconds()))
+
+
+def is_revoked(token):
+    revoked_at = cache.get(_revoked_key(token.get(api_settings.USER_ID_CLAIM)))
+    if revoked_at is None:
+        return False
+    # iat is whole seconds, so tokens from issue_tokens also carry a sub-second stamp;
+    # without one, a token from the revocation's own second counts as revoked
+    return token.get(ISSUED_AT_CLAIM, token.get("iat", 0)) <= revoked_at
+
+
+def authenticate_login(username, password):
+    """The active user with these credentials, or None.
+
+    One query loads the user with its DRF token and role profiles, which is
+    everything the login responses need.
+    """
+    user = User.objects.select_related("auth_token", *PROFILE_RELATIONS).filter(username=username).first()
+    if user is None:
+        # Run the hasher anyway so unknown usernames take as long as wrong passwords
+        User().set_password(password)
+        return None
+    if not user.is_active or not user.check_password(password):
+        return None
+    return user
+
+
+def issue_tokens(user):
+    """Refresh/access pair for `user`, whose profiles should already be loaded (select_related)."""
+    refresh = RefreshToken.for_user(user)
+    refresh[ISSUED_AT_CLAIM] = time.time()
+    for field in CLAIM_FIELDS:
+        refresh[field] = getattr(user, field)
+    for relation in PROFILE_RELATIONS:
+        profile = getattr(user, relation, None)
+        refresh[f"{relation}_id"] = profile.pk if profile is not None else None
+    return refresh
+
+
+def user_from_claims(token):
+    """A User instance backed by `token`; unclaimed fields are deferred."""
+    claimed = {field: token[field] for field in CLAIM_FIELDS}
+    claimed.update(id=token[api_settings.USER_ID_CLAIM], is_active=True)
+    # from_db expects the loaded values in model field order
+    names = [field.attname for field in User._meta.concrete_fields if field.attname in claimed]
+    user = User.from_db(DEFAULT_DB_ALIAS, names, [claimed[name] for name in names])
+    user.token_claims = token
+    return user
+
+
+def full_user(user, *related):
+    """`user` with all of its fields loaded, for views that read more than the claims.
+
+    A stateless JWT user is fetched in one query, joining the one-to-one
+    `related` profiles; any other user is returned as is.
+    """
+    if getattr(user, "token_claims", None) is None:
+        return user
+    return User.objects.select_related(*related).get(pk=user.pk)
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """JWT authentication that builds the user from role claims instead of loading it.
+
+    Without ``settings.STATELESS_JWT``, and for tokens without the claims
+    (issued before they existed), it falls back to the database lookup of the
+    parent class.
+    """
+
+    def get_user(self, validated_token):
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+        if is_revoked(validated_token):
+            raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+        if not settings.STATELESS_JWT or "role" not in validated_token:
+            return super().get_user(validated_token)
+        return user_from_claims(validated_token)
+
+
+class ProfileTokenAuthentication(TokenAuthentication):
+    """TokenAuthentication that loads the user's role profiles in the same query as the token."""
+
+    def authenticate_credentials(self, key):
+        model = self.get_model()
+        try:
+            token = model.objects.select_related(
+                "user", *(f"user__{relation}" for relation in PROFILE_RELATIONS)
+            ).get(key=key)
+        except model.DoesNotExist:
+            raise exceptions.AuthenticationFailed(_("Invalid token."))
+
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
+
+        return (token.user, token)
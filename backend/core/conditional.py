@@ -0,0 +1,25 @@
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+def conditional_response(request, version, build, last_modified=None):
+    """304 when the client's If-None-Match/If-Modified-Since still match `version`, else `build()`.
+
+    `build` is only called for a full response, so everything expensive belongs
+    in it. Successful and 304 responses carry the validators and
+    ``Cache-Control: no-cache`` so clients revalidate on every poll. A None
+    `version` (no trustworthy version) always builds, without validators.
+    """
+    if version is None:
+        return build()
+    etag = quote_etag(version)
+    last_modified = int(last_modified) if last_modified is not None else None
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = build()
+    if response.status_code in (200, 304):
+        response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified)
+        response["Cache-Control"] = "no-cache"
+    return response
@@ -0,0 +1,403 @@
+import json
+import random
+import statistics
+import subprocess
+import time
+from datetime import timedelta
+from itertools import islice
+
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import override_settings
+from django.urls import resolve
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.middleware import QueryTimer
+from core.models import (
+    User,
+    Player,
+    Coach,
+    Team,
+    Sport,
+    PlayerSportProfile,
+    CricketStats,
+    Leaderboard,
+    CoachingSession,
+    SessionAttendance,
+    DailyPerformanceScore,
+    Tournament,
+    TournamentTeam,
+    TournamentMatch,
+    TournamentPoints,
+    CricketMatchState,
+    MatchPlayerStats,
+)
+
+
+SCENARIOS = (
+    "end_session",
+    "player_dashboard",
+    "coach_dashboard",
+    "add_score",
+    "complete_match",
+    "end_tournament",
+    "leaderboard",
+)
+
+BATCH_SIZE = 2000
+UNUSABLE_PASSWORD = "!benchmark"
+
+
+def _chunks(rows, size=BATCH_SIZE):
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class BulkFactory:
+    """Seeds benchmark data with bulk_create (no per-row signals or save() hooks).
+
+    Every player belongs to a squad of ``squad_size`` under one coach and one
+    cricket team; teams are grouped four to a completed round-robin tournament.
+    """
+
+    def __init__(self, players, squad_size, history, seed):
+        self.n_players = players
+        self.squad_size = squad_size
+        self.history = history
+        self.rng = random.Random(seed)
+        self.serial = 0
+
+    def _name(self, prefix):
+        self.serial += 1
+        return f"bench_{prefix}_{self.serial}"
+
+    def users(self, role, count):
+        created = []
+        for chunk in _chunks(
+            User(username=self._name(role), password=UNUSABLE_PASSWORD, role=role) for _ in range(count)
+        ):
+            created.extend(User.objects.bulk_create(chunk))
+        return created
+
+    def seed(self):
+        self.sport, _ = Sport.objects.get_or_create(name="Cricket", defaults={"sport_type": "team"})
+        self.manager = self.users(User.Roles.MANAGER, 1)[0]
+
+        n_squads = max(2, -(-self.n_players // self.squad_size))
+        coach_users = self.users(User.Roles.COACH, n_squads)
+        self.coaches = Coach.objects.bulk_create(
+            Coach(user=u, coach_id=f"X{i:07d}", primary_sport=self.sport) for i, u in enumerate(coach_users)
+        )
+        self.teams = Team.objects.bulk_create(
+            Team(name=f"Bench XI {i}", coach=c, manager=self.manager, sport=self.sport)
+            for i, c in enumerate(self.coaches)
+        )
+
+        self.squads = {team.id: [] for team in self.teams}
+        player_users = self.users(User.Roles.PLAYER, self.n_players)
+        for offset, chunk in enumerate(_chunks(player_users)):
+            players = []
+            for i, user in enumerate(chunk, start=offset * BATCH_SIZE):
+                squad = i % n_squads
+                players.append(Player(
+                    user=user, player_id=f"B{i:08d}", team=self.teams[squad], coach=self.coaches[squad],
+                ))
+            for player in Player.objects.bulk_create(players):
+                self.squads[player.team_id].append(player)
+
+        profiles = []
+        for chunk in _chunks(
+            PlayerSportProfile(
+                player=p, sport=self.sport, team_id=p.team_id, coach_id=p.coach_id,
+                career_score=round(self.rng.uniform(0, 10), 2),
+            )
+            for squad in self.squads.values() for p in squad
+        ):
+            profiles.extend(PlayerSportProfile.objects.bulk_create(chunk))
+        for chunk in _chunks(
+            CricketStats(
+                profile=profile, runs=self.rng.randint(0, 2000), wickets=self.rng.randint(0, 80),
+                matches_played=self.rng.randint(1, 60), balls_faced=self.rng.randint(1, 1500),
+            )
+            for profile in profiles
+        ):
+            CricketStats.objects.bulk_create(chunk)
+        for chunk in _chunks(
+            Leaderboard(player_id=profile.player_id, score=int(profile.career_score)) for profile in profiles
+        ):
+            Leaderboard.objects.bulk_create(chunk)
+
+        self._seed_session_history()
+        self._seed_tournaments()
+
+    def _seed_session_history(self):
+        now = timezone.now()
+        sessions = CoachingSession.objects.bulk_create(
+            CoachingSession(
+                coach=coach, team=team, sport=self.sport, is_active=False,
+                session_date=now - timedelta(days=day + 1), title=f"History {day}",
+            )
+            for coach, team in zip(self.coaches, self.teams) for day in range(self.history)
+        )
+        for chunk in _chunks(
+            SessionAttendance(
+                session=session, player=player,
+                attended=self.rng.random() < 0.85, rating=self.rng.randint(1, 10),
+            )
+            for session in sessions for player in self.squads[session.team_id]
+        ):
+            SessionAttendance.objects.bulk_create(chunk)
+        for chunk in _chunks(
+            DailyPerformanceScore(
+                player=player, date=(now - timedelta(days=day + 1)).date(), score=self.rng.uniform(1, 10),
+            )
+            for squad in self.squads.values() for player in squad for day in range(self.history)
+        ):
+            DailyPerformanceScore.objects.bulk_create(chunk)
+
+    def _seed_tournaments(self):
+        groups = [self.teams[i:i + 4] for i in range(0, len(self.teams) - 1, 4)]
+        groups = [group for group in groups if len(group) > 1]
+        tournaments = Tournament.objects.bulk_create(
+            Tournament(
+                name=f"Bench Cup {i}", sport=self.sport, manager=self.manager,
+                status=Tournament.Status.COMPLETED, overs_per_match=5,
+            )
+            for i in range(len(groups))
+        )
+        TournamentTeam.objects.bulk_create(
+            TournamentTeam(tournament=t, team=team) for t, group in zip(tournaments, groups) for team in group
+        )
+        pairings = [
+            (t, a, b)
+            for t, group in zip(tournaments, groups)
+            for i, a in enumerate(group) for b in group[i + 1:]
+        ]
+        numbers = {}
+        matches = []
+        for tournament, team1, team2 in pairings:
+            numbers[tournament.id] = numbers.get(tournament.id, 0) + 1
+            matches.append(TournamentMatch(
+                tournament=tournament, team1=team1, team2=team2, match_number=numbers[tournament.id],
+                status=TournamentMatch.Status.COMPLETED, is_completed=True,
+                score_team1=self.rng.randint(20, 80), score_team2=self.rng.randint(20, 80),
+            ))
+        matches = TournamentMatch.objects.bulk_create(matches)
+        for chunk in _chunks(stat for match in matches for stat in self._match_stats(match)):
+            MatchPlayerStats.objects.bulk_create(chunk)
+        TournamentPoints.objects.bulk_create(
+            TournamentPoints(tournament=t, team=team, matches_played=len(group) - 1)
+            for t, group in zip(tournaments, groups) for team in group
+        )
+
+    def _match_stats(self, match):
+        rng = self.rng
+        return [
+            MatchPlayerStats(
+                match=match, player=player, team_id=team_id,
+                runs_scored=rng.randint(0, 60),
+                balls_faced=rng.randint(1, 40),
+                wickets_taken=rng.randint(0, 3),
+                runs_conceded=rng.randint(0, 40),
+            )
+            for team_id in (match.team1_id, match.team2_id)
+            for player in self.squads[team_id]
+        ]
+
+    # -- per-repetition fixtures for mutating endpoints -------------------
+
+    def live_match(self):
+        """An in-progress match between the first two squads, in its own ongoing tournament."""
+        team1, team2 = self.teams[0], self.teams[1]
+        tournament = Tournament.objects.create(
+            name=self._name("cup"), sport=self.sport, manager=self.manager,
+            status=Tournament.Status.ONGOING, overs_per_match=20,
+        )
+        TournamentTeam.objects.bulk_create(
+            [TournamentTeam(tournament=tournament, team=team1), TournamentTeam(tournament=tournament, team=team2)]
+        )
+        TournamentPoints.objects.bulk_create(
+            [TournamentPoints(tournament=tournament, team=team1), TournamentPoints(tournament=tournament, team=team2)]
+        )
+        match = TournamentMatch.objects.create(
+            tournament=tournament, team1=team1, team2=team2, status=TournamentMatch.Status.IN_PROGRESS,
+        )
+        MatchPlayerStats.objects.bulk_create(self._match_stats(match))
+        squad1, squad2 = self.squads[team1.id], self.squads[team2.id]
+        CricketMatchState.objects.create(
+            match=match, toss_won_by=team1, batting_first=team1,
+            current_batting_team=team1, current_bowling_team=team2,
+            batsman1=squad1[0], batsman2=squad1[1], current_striker=squad1[0], current_bowler=squad2[0],
+            team1_runs=self.rng.randint(50, 150), team2_runs=self.rng.randint(50, 150),
+        )
+        return match
+
+    def open_session(self):
+        return CoachingSession.objects.create(
+            coach=self.coaches[0], team=self.teams[0], sport=self.sport, title=self._name("session"),
+        )
+
+    def session_csv(self):
+        rows = ["player_id,attended,score"]
+        rows += [
+            f"{p.player_id},{int(self.rng.random() < 0.9)},{self.rng.randint(1, 10)}"
+            for p in self.squads[self.teams[0].id]
+        ]
+        return SimpleUploadedFile("attendance.csv", ("\n".join(rows) + "\n").encode(), content_type="text/csv")
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark hot endpoints against bulk-seeded synthetic data at several scales. "
+        "Everything runs inside a transaction that is rolled back; results are printed as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--players", type=int, nargs="+", default=[1000, 10000, 100000],
+            help="Player counts to benchmark at (default: 1000 10000 100000)",
+        )
+        parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+        parser.add_argument("--repeat", type=int, default=5, help="Timed runs per scenario")
+        parser.add_argument("--squad-size", type=int, default=25, help="Players per coach/team")
+        parser.add_argument("--history", type=int, default=10, help="Past sessions per squad")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+
+    def handle(self, *args, **options):
+        if options["repeat"] < 1:
+            raise CommandError("--repeat must be at least 1")
+        if options["squad_size"] < 2:
+            raise CommandError("--squad-size must be at least 2")
+
+        report = {
+            "commit": self._git_commit(),
+            "timestamp": timezone.now().isoformat(),
+            "database": connection.vendor,
+            "config": {k: options[k] for k in ("players", "scenarios", "repeat", "squad_size", "history", "seed")},
+            "results": [],
+        }
+        self.factory = APIRequestFactory()
+        # Paginators build absolute links from the request factory's host
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+            for players in options["players"]:
+                self._bench_scale(report, players, options)
+
+        payload = json.dumps(report, indent=2)
+
+        if options["output"]:
+            with open(options["output"], "w") as fh:
+                fh.write(payload + "\n")
+            self.stderr.write(self.style.SUCCESS(f"Wrote {options['output']}"))
+        else:
+            self.stdout.write(payload)
+
+    # -- scenario plumbing -------------------------------------------------
+
+    def _bench_scale(self, report, players, options):
+        self.stderr.write(f"Seeding {players} players...")
+        with transaction.atomic():
+            bulk = BulkFactory(players, options["squad_size"], options["history"], options["seed"])
+            started = time.perf_counter()
+            bulk.seed()
+            seed_seconds = time.perf_counter() - started
+            self.stderr.write(f"  seeded in {seed_seconds:.1f}s")
+            for scenario in options["scenarios"]:
+                result = self._run(scenario, bulk, options["repeat"])
+                result.update(players=players, seed_seconds=round(seed_seconds, 3))
+                report["results"].append(result)
+                self.stderr.write(f"  {scenario}: median {result['median_ms']}ms, {result['queries']} queries")
+            transaction.set_rollback(True)
+
+    def _call(self, user, method, path, data=None, fmt=None):
+        if method == "get":
+            request = self.factory.get(path)
+        else:
+            request = self.factory.post(path, data, format=fmt)
+        force_authenticate(request, user=user)
+        match = resolve(path)
+        response = match.func(request, *match.args, **match.kwargs)
+        if hasattr(response, "render"):
+            response.render()
+        return response
+
+    def _run(self, scenario, bulk, repeat):
+        prepare = getattr(self, f"_prepare_{scenario}")
+        timings, db_times, queries, statuses = [], [], [], set()
+        for _ in range(repeat):
+            user, method, path, data, fmt = prepare(bulk)
+            timer = QueryTimer()
+            with connection.execute_wrapper(timer):
+                started = time.perf_counter()
+                response = self._call(user, method, path, data, fmt)
+                timings.append((time.perf_counter() - started) * 1000)
+            db_times.append(timer.elapsed * 1000)
+            queries.append(timer.count)
+            statuses.add(response.status_code)
+        timings.sort()
+        return {
+            "scenario": scenario,
+            "repeat": repeat,
+            "status_codes": sorted(statuses),
+            "min_ms": round(timings[0], 3),
+            "median_ms": round(statistics.median(timings), 3),
+            "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+            "max_ms": round(timings[-1], 3),
+            "mean_ms": round(statistics.fmean(timings), 3),
+            "db_median_ms": round(statistics.median(db_times), 3),
+            "queries": max(queries),
+        }
+
+    def _prepare_end_session(self, bulk):
+        session = bulk.open_session()
+        return (
+            bulk.coaches[0].user, "post", f"/api/sessions/{session.id}/end-session/",
+            {"file": bulk.session_csv()}, "multipart",
+        )
+
+    def _prepare_player_dashboard(self, bulk):
+        return bulk.squads[bulk.teams[0].id][0].user, "get", "/api/dashboard/player/", None, None
+
+    def _prepare_coach_dashboard(self, bulk):
+        return bulk.coaches[0].user, "get", "/api/dashboard/coach/", None, None
+
+    def _prepare_add_score(self, bulk):
+        if not hasattr(bulk, "scoring_match"):
+            bulk.scoring_match = bulk.live_match()
+        return (
+            bulk.manager, "post", f"/api/tournament-matches/{bulk.scoring_match.id}/score/",
+            {"runs": bulk.rng.randint(0, 6)}, "json",
+        )
+
+    def _prepare_complete_match(self, bulk):
+        match = bulk.live_match()
+        return bulk.manager, "post", f"/api/tournament-matches/{match.id}/complete/", {}, "json"
+
+    def _prepare_end_tournament(self, bulk):
+        match = bulk.live_match()
+        TournamentMatch.objects.filter(pk=match.pk).update(
+            status=TournamentMatch.Status.COMPLETED, is_completed=True,
+        )
+        TournamentPoints.objects.filter(tournament=match.tournament, team=match.team1).update(
+            matches_played=1, matches_won=1, points=2,
+        )
+        return bulk.manager, "post", f"/api/tournaments/{match.tournament_id}/end/", {}, "json"
+
+    def _prepare_leaderboard(self, bulk):
+        return bulk.manager, "get", "/api/leaderboard/", None, None
+
+    @staticmethod
+    def _git_commit():
+        try:
+            return subprocess.run(
+                ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
@@ -0,0 +1,37 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.exports import DATASETS, DEFAULT_CHUNK_SIZE, FORMATS, ExportError, encode, export_rows
+
+
+class Command(BaseCommand):
+    help = "Stream session attendance, daily performance or match stats history as CSV or NDJSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument("dataset", choices=list(DATASETS))
+        parser.add_argument("--format", choices=list(FORMATS), default="csv")
+        parser.add_argument("--output", help="File to write (default: stdout)")
+        parser.add_argument("--sport", type=int, help="Sport id")
+        parser.add_argument("--coach", type=int, help="Coach id")
+        parser.add_argument("--tournament", type=int, help="Tournament id")
+        parser.add_argument("--date-from", type=datetime.date.fromisoformat, help="YYYY-MM-DD, inclusive")
+        parser.add_argument("--date-to", type=datetime.date.fromisoformat, help="YYYY-MM-DD, inclusive")
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows fetched per round trip")
+
+    def handle(self, *args, **options):
+        filters = {name: options[name] for name in ("sport", "coach", "tournament", "date_from", "date_to")}
+        try:
+            header, rows = export_rows(options["dataset"], filters, chunk_size=options["chunk_size"])
+            chunks = encode(options["format"], header, rows)
+        except ExportError as exc:
+            raise CommandError(str(exc))
+
+        if not options["output"]:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+            return
+        with open(options["output"], "w", encoding="utf-8", newline="") as out:
+            for chunk in chunks:
+                out.write(chunk)
+        self.stderr.write(self.style.SUCCESS(f"✓ Exported {options['dataset']} to {options['output']}"))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.columnar import PARTITIONS, export_parquet
+from core.services.exports import DEFAULT_CHUNK_SIZE, ExportError
+
+
+class Command(BaseCommand):
+    help = "Rewrite the Parquet partitions of match stats, attendance and daily scores that changed (needs pyarrow)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("datasets", nargs="*", choices=list(PARTITIONS), help="Default: all datasets")
+        parser.add_argument("--root", help="Export directory (default: settings.ANALYTICS_EXPORT_DIR)")
+        parser.add_argument("--full", action="store_true", help="Drop existing files and export everything again")
+        parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Rows fetched per round trip")
+
+    def handle(self, *args, **options):
+        for name in options["datasets"] or PARTITIONS:
+            try:
+                result = export_parquet(
+                    name, root=options["root"], full=options["full"], chunk_size=options["chunk_size"]
+                )
+            except ExportError as exc:
+                raise CommandError(str(exc))
+            self.stdout.write(self.style.SUCCESS(
+                f"✓ {name}: rewrote {len(result['files'])} partitions ({result['rows']} rows), "
+                f"removed {len(result['removed'])}"
+            ))
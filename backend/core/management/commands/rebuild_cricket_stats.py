@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from core.services.career import rebuild_cricket_stats
+
+
+class Command(BaseCommand):
+    help = "Rebuild every player's career CricketStats from the match stats of completed matches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Rows per bulk update")
+
+    def handle(self, *args, **options):
+        profiles = rebuild_cricket_stats(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"✓ Rebuilt cricket stats for {profiles} profiles"))
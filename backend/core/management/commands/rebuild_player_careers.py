@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from core.services.career import refresh_player_careers
+
+
+class Command(BaseCommand):
+    help = "Rebuild the materialised PlayerCareer table from the match stats of completed matches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--player", type=int, nargs="*", help="Only refresh these Player ids")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Rows per bulk upsert")
+
+    def handle(self, *args, **options):
+        rows = refresh_player_careers(options["player"] or None, batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"✓ Rebuilt {rows} player career rows"))
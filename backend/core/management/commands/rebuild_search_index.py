@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from core.services.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the player and coach search index"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Rows per bulk insert")
+
+    def handle(self, *args, **options):
+        documents = rebuild_search_index(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"✓ Indexed {documents} players and coaches"))
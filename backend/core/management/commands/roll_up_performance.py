@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from core.services.rollups import roll_up_performance
+
+
+class Command(BaseCommand):
+    help = "Recompute the weekly and monthly performance scores of players whose daily scores changed"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000, help="Rows inserted per statement")
+
+    def handle(self, *args, **options):
+        written = roll_up_performance(batch_size=options["batch_size"])
+        for period, count in written.items():
+            self.stdout.write(self.style.SUCCESS(f"✓ {period}: {count} buckets rebuilt"))
@@ -0,0 +1,123 @@
+import threading
+from bisect import bisect_left
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+class Histogram:
+    """Cumulative Prometheus-style histogram keyed by a label tuple."""
+
+    def __init__(self, name, help_text, label_names, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series = {}
+
+    def observe(self, labels, value):
+        series = self._series.get(labels)
+        if series is None:
+            # one slot per bucket plus the +Inf overflow, then [sum]
+            series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for labels, series in sorted(self._series.items()):
+            base = _format_labels(self.label_names, labels)
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), series[:-1]):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{{{base},le=\"{bound}\"}} {cumulative}")
+            lines.append(f"{self.name}_sum{{{base}}} {series[-1]:.6f}")
+            lines.append(f"{self.name}_count{{{base}}} {cumulative}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name, help_text, label_names):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._series = {}
+
+    def inc(self, labels, amount=1):
+        self._series[labels] = self._series.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        for labels, value in sorted(self._series.items()):
+            lines.append(f"{self.name}{{{_format_labels(self.label_names, labels)}}} {value}")
+        return lines
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names, values):
+    return ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+
+
+class RequestMetrics:
+    """In-process per-endpoint request metrics, rendered in Prometheus text format.
+
+    Series are per worker process; scrape each worker (or sum on the
+    Prometheus side) when running several.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = Counter(
+                "http_requests_total", "Requests by resolved URL name.", ("view", "method", "status"),
+            )
+            self.over_budget = Counter(
+                "http_requests_over_query_budget_total",
+                "Requests that ran more SQL queries than METRICS_QUERY_BUDGET.",
+                ("view", "method"),
+            )
+            self.latency = Histogram(
+                "http_request_duration_seconds", "Total request latency.", ("view", "method"), LATENCY_BUCKETS,
+            )
+            self.db_time = Histogram(
+                "http_request_db_seconds", "Time spent executing SQL.", ("view", "method"), LATENCY_BUCKETS,
+            )
+            self.render_time = Histogram(
+                "http_request_renderer_seconds",
+                "Time the renderer spends encoding the response body; serializer work in the view is not included.",
+                ("view", "method"),
+                LATENCY_BUCKETS,
+            )
+            self.queries = Histogram(
+                "http_request_queries", "SQL queries per request.", ("view", "method"), QUERY_BUCKETS,
+            )
+
+    def record(self, view, method, status, latency, db_time, render_time, queries, over_budget):
+        labels = (view, method)
+        with self._lock:
+            self.requests.inc((view, method, str(status)))
+            self.latency.observe(labels, latency)
+            self.db_time.observe(labels, db_time)
+            self.render_time.observe(labels, render_time)
+            self.queries.observe(labels, queries)
+            if over_budget:
+                self.over_budget.inc(labels)
+
+    def render(self):
+        with self._lock:
+            lines = []
+            for metric in (
+                self.requests, self.over_budget, self.latency, self.db_time, self.render_time, self.queries,
+            ):
+                lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = RequestMetrics()
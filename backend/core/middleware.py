@@ -0,0 +1,86 @@
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from .metrics import registry
+
+
+logger = logging.getLogger(__name__)
+
+
+class QueryTimer:
+    """execute_wrapper that counts queries and accumulates their wall time."""
+
+    def __init__(self):
+        self.count = 0
+        self.elapsed = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.elapsed += time.perf_counter() - start
+            self.count += 1
+
+
+class QueryMetricsMiddleware:
+    """Record query count, DB time, renderer time and latency per resolved URL name.
+
+    Renderer time only covers encoding the response after the view returns;
+    building serializer ``.data`` happens inside the view and counts toward
+    latency alone.
+
+    Requests running more than ``settings.METRICS_QUERY_BUDGET`` queries are
+    logged as warnings. Aggregates are exposed by ``core.views.metrics``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.query_budget = getattr(settings, "METRICS_QUERY_BUDGET", 50)
+
+    def __call__(self, request):
+        timer = QueryTimer()
+        request._metrics_render = [0.0, 0.0]
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timer))
+            response = self.get_response(request)
+        latency = time.perf_counter() - start
+
+        view = self._view_name(request)
+        render_start, render_end = request._metrics_render
+        over_budget = timer.count > self.query_budget
+        registry.record(
+            view, request.method, response.status_code, latency, timer.elapsed,
+            max(render_end - render_start, 0.0), timer.count, over_budget,
+        )
+        if over_budget:
+            logger.warning(
+                "%s %s (%s) ran %d queries (budget %d) in %.1fms, %.1fms in DB",
+                request.method, request.path, view, timer.count, self.query_budget,
+                latency * 1000, timer.elapsed * 1000,
+            )
+        return response
+
+    def process_template_response(self, request, response):
+        # DRF responses render after this hook returns; bracket the renderer (encoding only)
+        timings = request._metrics_render
+        timings[0] = time.perf_counter()
+
+        def _rendered(_response):
+            timings[1] = time.perf_counter()
+
+        response.add_post_render_callback(_rendered)
+        return response
+
+    @staticmethod
+    def _view_name(request):
+        match = getattr(request, "resolver_match", None)
+        if match is None:
+            return "unresolved"
+        return match.view_name or match.route
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.7 on 2026-10-19 10:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="cricketmatchstate",
+            name="ball_seq",
+            field=models.PositiveIntegerField(
+                default=0, help_text="Sequence number of the last delivery recorded"
+            ),
+        ),
+    ]
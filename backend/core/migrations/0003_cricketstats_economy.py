@@ -0,0 +1,25 @@
+# Generated by Django 5.2.7 on 2026-10-19 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0002_cricketmatchstate_ball_seq"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="cricketstats",
+            name="economy",
+            field=models.FloatField(
+                default=0.0, help_text="Runs conceded per six balls bowled"
+            ),
+        ),
+        migrations.AddField(
+            model_name="cricketstats",
+            name="runs_conceded",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
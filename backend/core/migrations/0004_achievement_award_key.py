@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-19 10:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0003_cricketstats_economy"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="achievement",
+            name="award_key",
+            field=models.CharField(
+                blank=True,
+                help_text="Stable key of a system-awarded achievement (e.g. mom:match:12); null for manual entries",
+                max_length=100,
+                null=True,
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="achievement",
+            constraint=models.UniqueConstraint(
+                fields=("player", "award_key"), name="unique_player_award_key"
+            ),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.7 on 2026-10-19 10:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0004_achievement_award_key"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="tournament",
+            name="bracket",
+            field=models.JSONField(
+                blank=True,
+                help_text="Seeded first knockout round as [team_id, team_id or null] slots; null is a bye",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="tournamentmatch",
+            name="bracket_slot",
+            field=models.PositiveIntegerField(
+                blank=True, help_text="Position within a knockout round", null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="tournamentmatch",
+            name="group_name",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text="Group label for group-stage matches",
+                max_length=10,
+            ),
+        ),
+        migrations.AddField(
+            model_name="tournamentmatch",
+            name="round_number",
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name="tournamentmatch",
+            name="stage",
+            field=models.CharField(
+                choices=[
+                    ("league", "League"),
+                    ("group", "Group"),
+                    ("knockout", "Knockout"),
+                ],
+                default="league",
+                max_length=20,
+            ),
+        ),
+    ]
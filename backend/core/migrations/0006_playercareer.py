@@ -0,0 +1,94 @@
+# Generated by Django 5.2.7 on 2026-10-19 10:24
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0005_fixture_stages"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PlayerCareer",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("matches", models.PositiveIntegerField(default=0)),
+                ("innings", models.PositiveIntegerField(default=0)),
+                ("not_outs", models.PositiveIntegerField(default=0)),
+                ("runs", models.PositiveIntegerField(default=0)),
+                ("balls_faced", models.PositiveIntegerField(default=0)),
+                ("highest_score", models.PositiveIntegerField(default=0)),
+                ("fours", models.PositiveIntegerField(default=0)),
+                ("sixes", models.PositiveIntegerField(default=0)),
+                ("fifties", models.PositiveIntegerField(default=0)),
+                ("hundreds", models.PositiveIntegerField(default=0)),
+                (
+                    "batting_average",
+                    models.FloatField(
+                        blank=True,
+                        help_text="Runs per dismissal; null until first dismissal",
+                        null=True,
+                    ),
+                ),
+                ("strike_rate", models.FloatField(default=0.0)),
+                ("balls_bowled", models.PositiveIntegerField(default=0)),
+                ("runs_conceded", models.PositiveIntegerField(default=0)),
+                ("wickets", models.PositiveIntegerField(default=0)),
+                ("maidens", models.PositiveIntegerField(default=0)),
+                ("best_bowling_wickets", models.PositiveIntegerField(default=0)),
+                ("best_bowling_runs", models.PositiveIntegerField(default=0)),
+                (
+                    "bowling_average",
+                    models.FloatField(
+                        blank=True, help_text="Runs conceded per wicket", null=True
+                    ),
+                ),
+                ("economy", models.FloatField(default=0.0)),
+                ("catches", models.PositiveIntegerField(default=0)),
+                ("stumpings", models.PositiveIntegerField(default=0)),
+                ("run_outs", models.PositiveIntegerField(default=0)),
+                ("mom_awards", models.PositiveIntegerField(default=0)),
+                ("last_match_at", models.DateTimeField(blank=True, null=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "player",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="careers",
+                        to="core.player",
+                    ),
+                ),
+                (
+                    "sport",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="player_careers",
+                        to="core.sport",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["sport", "-runs"], name="core_player_sport_i_294998_idx"
+                    ),
+                    models.Index(
+                        fields=["sport", "-wickets"],
+                        name="core_player_sport_i_b2b638_idx",
+                    ),
+                ],
+                "unique_together": {("player", "sport")},
+            },
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.7 on 2026-10-19 10:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0006_playercareer"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="matchplayerstats",
+            name="dismissed_by",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="dismissals",
+                to="core.player",
+            ),
+        ),
+        migrations.AddField(
+            model_name="matchplayerstats",
+            name="fall_of_wicket_ball",
+            field=models.PositiveIntegerField(
+                blank=True, help_text="Legal balls into the innings when out", null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="matchplayerstats",
+            name="fall_of_wicket_number",
+            field=models.PositiveIntegerField(
+                blank=True, help_text="Wicket number in the innings", null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="matchplayerstats",
+            name="fall_of_wicket_score",
+            field=models.PositiveIntegerField(
+                blank=True, help_text="Team score when out", null=True
+            ),
+        ),
+    ]
@@ -0,0 +1,144 @@
+# Generated by Django 5.2.7 on 2026-10-19 10:46
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+# SQLite: an external-content FTS5 table kept in step with core_searchdocument by triggers
+SQLITE_FTS = [
+    """CREATE VIRTUAL TABLE core_searchdocument_fts USING fts5(
+        kind, document, content='core_searchdocument', content_rowid='id', tokenize='trigram'
+    )""",
+    """CREATE TRIGGER core_searchdocument_fts_ai AFTER INSERT ON core_searchdocument BEGIN
+        INSERT INTO core_searchdocument_fts(rowid, kind, document) VALUES (new.id, new.kind, new.document);
+    END""",
+    """CREATE TRIGGER core_searchdocument_fts_ad AFTER DELETE ON core_searchdocument BEGIN
+        INSERT INTO core_searchdocument_fts(core_searchdocument_fts, rowid, kind, document)
+        VALUES ('delete', old.id, old.kind, old.document);
+    END""",
+    """CREATE TRIGGER core_searchdocument_fts_au AFTER UPDATE ON core_searchdocument BEGIN
+        INSERT INTO core_searchdocument_fts(core_searchdocument_fts, rowid, kind, document)
+        VALUES ('delete', old.id, old.kind, old.document);
+        INSERT INTO core_searchdocument_fts(rowid, kind, document) VALUES (new.id, new.kind, new.document);
+    END""",
+]
+SQLITE_FTS_DROP = [
+    "DROP TRIGGER IF EXISTS core_searchdocument_fts_au",
+    "DROP TRIGGER IF EXISTS core_searchdocument_fts_ad",
+    "DROP TRIGGER IF EXISTS core_searchdocument_fts_ai",
+    "DROP TABLE IF EXISTS core_searchdocument_fts",
+]
+
+POSTGRES_TRGM = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX core_searchdocument_document_trgm ON core_searchdocument USING gin (document gin_trgm_ops)",
+]
+POSTGRES_TRGM_DROP = [
+    "DROP INDEX IF EXISTS core_searchdocument_document_trgm",
+]
+
+
+def _run(statements):
+    def run(apps, schema_editor):
+        vendor = schema_editor.connection.vendor
+        for statement in statements.get(vendor, []):
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0007_match_stats_fall_of_wicket"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchDocument",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[("player", "Player"), ("coach", "Coach")],
+                        max_length=10,
+                    ),
+                ),
+                ("object_id", models.PositiveIntegerField()),
+                (
+                    "label",
+                    models.CharField(
+                        help_text="Username shown in results", max_length=150
+                    ),
+                ),
+                (
+                    "external_id",
+                    models.CharField(
+                        blank=True,
+                        default="",
+                        help_text="Player or coach ID",
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "detail",
+                    models.CharField(
+                        blank=True,
+                        default="",
+                        help_text="College or specialization",
+                        max_length=150,
+                    ),
+                ),
+                ("is_public", models.BooleanField(default=True)),
+                (
+                    "document",
+                    models.TextField(
+                        help_text="Lower-cased text that queries match against"
+                    ),
+                ),
+                (
+                    "sport",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="core.sport",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="search_documents",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["kind", "label"], name="core_search_kind_c2b868_idx"
+                    ),
+                    models.Index(
+                        fields=["kind", "external_id"],
+                        name="core_search_kind_f3eb60_idx",
+                    ),
+                ],
+                "unique_together": {("kind", "object_id")},
+            },
+        ),
+        migrations.RunPython(
+            _run({"sqlite": SQLITE_FTS, "postgresql": POSTGRES_TRGM}),
+            _run({"sqlite": SQLITE_FTS_DROP, "postgresql": POSTGRES_TRGM_DROP}),
+        ),
+    ]
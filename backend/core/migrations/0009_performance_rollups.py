@@ -0,0 +1,89 @@
+# Generated by Django 5.2.7 on 2026-10-19 11:09
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0008_search_documents"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="performancescore",
+            name="days",
+            field=models.PositiveIntegerField(
+                default=0, help_text="Daily scores averaged into this week"
+            ),
+        ),
+        migrations.CreateModel(
+            name="MonthlyPerformanceScore",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("month_start", models.DateField(help_text="First day of the month")),
+                ("score", models.FloatField(default=0.0)),
+                (
+                    "days",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Daily scores averaged into this month"
+                    ),
+                ),
+                (
+                    "player",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="monthly_performance_scores",
+                        to="core.player",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-month_start"],
+                "unique_together": {("player", "month_start")},
+            },
+        ),
+        migrations.CreateModel(
+            name="PerformanceRollupQueue",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "period",
+                    models.CharField(
+                        choices=[("week", "Week"), ("month", "Month")], max_length=5
+                    ),
+                ),
+                ("period_start", models.DateField()),
+                ("marked_at", models.DateTimeField(default=django.utils.timezone.now)),
+                (
+                    "player",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="core.player",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("player", "period", "period_start")},
+            },
+        ),
+    ]
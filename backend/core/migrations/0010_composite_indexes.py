@@ -0,0 +1,55 @@
+# Generated by Django 5.2.7 on 2026-10-19 11:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0009_performance_rollups"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="coachingsession",
+            index=models.Index(
+                fields=["sport", "session_date"], name="session_sport_date"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="coachplayerlinkrequest",
+            index=models.Index(
+                fields=["coach", "status", "direction"],
+                name="link_coach_status_direction",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="matchplayerstats",
+            index=models.Index(fields=["match", "team"], name="match_stats_match_team"),
+        ),
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                fields=["user", "-created_at"], name="notification_user_created"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="playersportprofile",
+            index=models.Index(
+                fields=["coach", "sport", "is_active"],
+                name="profile_coach_sport_active",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="playersportprofile",
+            index=models.Index(
+                fields=["team", "sport", "is_active"], name="profile_team_sport_active"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="sessionattendance",
+            index=models.Index(
+                fields=["player", "attended"], name="attendance_player_attended"
+            ),
+        ),
+    ]
@@ -0,0 +1,61 @@
+from django.db import migrations
+
+
+BATCH_SIZE = 1000
+
+
+def _document(*parts):
+    return " ".join(part.strip().lower() for part in parts if part)
+
+
+def _player(SearchDocument, player):
+    user = player.user
+    return SearchDocument(
+        kind="player",
+        object_id=player.pk,
+        user_id=user.pk,
+        label=user.username,
+        external_id=player.player_id or "",
+        detail=player.college or "",
+        is_public=player.is_public and player.is_active,
+        document=_document(user.username, user.first_name, user.last_name, player.player_id, player.college),
+    )
+
+
+def _coach(SearchDocument, coach):
+    user = coach.user
+    return SearchDocument(
+        kind="coach",
+        object_id=coach.pk,
+        user_id=user.pk,
+        label=user.username,
+        external_id=coach.coach_id or "",
+        detail=coach.specialization or "",
+        sport_id=coach.primary_sport_id,
+        document=_document(user.username, user.first_name, user.last_name, coach.coach_id, coach.specialization),
+    )
+
+
+def backfill(apps, schema_editor):
+    """Index the players and coaches that existed before the search index."""
+    SearchDocument = apps.get_model("core", "SearchDocument")
+    for model_name, build in (("Player", _player), ("Coach", _coach)):
+        profiles = apps.get_model("core", model_name).objects.select_related("user").order_by("pk")
+        batch = []
+        for profile in profiles.iterator(chunk_size=BATCH_SIZE):
+            batch.append(build(SearchDocument, profile))
+            if len(batch) >= BATCH_SIZE:
+                SearchDocument.objects.bulk_create(batch, ignore_conflicts=True)
+                batch = []
+        SearchDocument.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0010_composite_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-19 11:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0011_backfill_search_documents"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="dailyperformancescore",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="sessionattendance",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.7 on 2026-10-19 11:43
+
+from django.db import migrations, models
+from django.db.models import F, IntegerField
+from django.db.models.functions import Cast, Round
+
+
+def from_overs(apps, schema_editor):
+    # Existing rows only have overs_bowled (balls / 6); per-bowler balls were never recorded
+    MatchPlayerStats = apps.get_model("core", "MatchPlayerStats")
+    MatchPlayerStats.objects.filter(overs_bowled__gt=0).update(
+        legal_balls=Cast(Round(F("overs_bowled") * 6), IntegerField())
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0012_export_change_stamps"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="matchplayerstats",
+            name="legal_balls",
+            field=models.PositiveIntegerField(
+                default=0, help_text="Balls bowled, not counting wides and no-balls"
+            ),
+        ),
+        migrations.RunPython(from_overs, migrations.RunPython.noop),
+    ]
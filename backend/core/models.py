@@ -101,6 +101,11 @@ class PlayerSportProfile(models.Model):
 
     class Meta:
         unique_together = ("player", "sport")
+        indexes = [
+            # Roster lookups: a coach's or a team's active players in one sport
+            models.Index(fields=["coach", "sport", "is_active"], name="profile_coach_sport_active"),
+            models.Index(fields=["team", "sport", "is_active"], name="profile_team_sport_active"),
+        ]
 
     def __str__(self):
         return f"{self.player.user.username} - {self.sport.name if self.sport else 'Unknown'}"
@@ -143,14 +148,18 @@ class CricketStats(SportStatsBase):
     wickets = models.PositiveIntegerField(default=0)
     balls_faced = models.PositiveIntegerField(default=0)
     balls_bowled = models.PositiveIntegerField(default=0)
+    runs_conceded = models.PositiveIntegerField(default=0)
     average = models.FloatField(default=0.0)
     strike_rate = models.FloatField(default=0.0)
+    economy = models.FloatField(default=0.0, help_text="Runs conceded per six balls bowled")
 
     def save(self, *args, **kwargs):
         if self.balls_faced > 0:
             self.strike_rate = (self.runs / self.balls_faced) * 100
         if self.matches_played > 0:
             self.average = self.runs / self.matches_played
+        if self.balls_bowled > 0:
+            self.economy = self.runs_conceded * 6 / self.balls_bowled
         super().save(*args, **kwargs)
 
     def __str__(self):
@@ -208,6 +217,15 @@ class Achievement(models.Model):
     title = models.CharField(max_length=100)
     description = models.TextField(blank=True, null=True)
     date_awarded = models.DateField(default=timezone.now)
+    award_key = models.CharField(
+        max_length=100, blank=True, null=True,
+        help_text="Stable key of a system-awarded achievement (e.g. mom:match:12); null for manual entries",
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["player", "award_key"], name="unique_player_award_key"),
+        ]
 
     def __str__(self):
         return f"{self.title} - {self.player.user.username}"
@@ -324,6 +342,7 @@ class PerformanceScore(models.Model):
     player = models.ForeignKey(Player, on_delete=models.CASCADE, related_name="performance_scores")
     week_start = models.DateField(help_text="Start of ISO week (Monday)")
     score = models.FloatField(default=0.0)
+    days = models.PositiveIntegerField(default=0, help_text="Daily scores averaged into this week")
 
     class Meta:
         unique_together = ("player", "week_start")
@@ -333,6 +352,39 @@ class PerformanceScore(models.Model):
         return f"{self.player.user.username} @ {self.week_start}: {self.score}"
 
 
+class MonthlyPerformanceScore(models.Model):
+    player = models.ForeignKey(Player, on_delete=models.CASCADE, related_name="monthly_performance_scores")
+    month_start = models.DateField(help_text="First day of the month")
+    score = models.FloatField(default=0.0)
+    days = models.PositiveIntegerField(default=0, help_text="Daily scores averaged into this month")
+
+    class Meta:
+        unique_together = ("player", "month_start")
+        ordering = ["-month_start"]
+
+    def __str__(self):
+        return f"{self.player.user.username} @ {self.month_start:%Y-%m}: {self.score}"
+
+
+class PerformanceRollupQueue(models.Model):
+    """Weeks and months whose daily scores changed since the last rollup (see core/services/rollups.py)."""
+
+    class Period(models.TextChoices):
+        WEEK = "week", "Week"
+        MONTH = "month", "Month"
+
+    player = models.ForeignKey(Player, on_delete=models.CASCADE, related_name="+")
+    period = models.CharField(max_length=5, choices=Period.choices)
+    period_start = models.DateField()
+    marked_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        unique_together = ("player", "period", "period_start")
+
+    def __str__(self):
+        return f"{self.player_id} {self.period} {self.period_start}"
+
+
 # -----------------------------
 # Coaching sessions and attendance
 # -----------------------------
@@ -347,6 +399,9 @@ class CoachingSession(models.Model):
 
     class Meta:
         ordering = ["-session_date"]
+        indexes = [
+            models.Index(fields=["sport", "session_date"], name="session_sport_date"),
+        ]
 
     def __str__(self):
         return f"{getattr(self.coach.user, 'username', 'Coach')} session on {self.session_date.date()}"
@@ -357,9 +412,13 @@ class SessionAttendance(models.Model):
     player = models.ForeignKey(Player, on_delete=models.CASCADE, related_name="session_attendances")
     attended = models.BooleanField(default=True)
     rating = models.PositiveIntegerField(default=0, help_text="Optional per-session rating by coach")
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ("session", "player")
+        indexes = [
+            models.Index(fields=["player", "attended"], name="attendance_player_attended"),
+        ]
 
     def __str__(self):
         return f"{self.player} - {self.session} ({'Present' if self.attended else 'Absent'})"
@@ -391,6 +450,7 @@ class DailyPerformanceScore(models.Model):
     player = models.ForeignKey(Player, on_delete=models.CASCADE, related_name="daily_performance_scores")
     date = models.DateField(help_text="Calendar day")
     score = models.FloatField(default=0.0)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ("player", "date")
@@ -423,6 +483,9 @@ class CoachPlayerLinkRequest(models.Model):
 
     class Meta:
         unique_together = ("coach", "player", "sport", "status")
+        indexes = [
+            models.Index(fields=["coach", "status", "direction"], name="link_coach_status_direction"),
+        ]
 
     def __str__(self):
         return f"{self.get_direction_display()}: {getattr(self.coach.user, 'username', 'coach')} ↔ {getattr(self.player.user, 'username', 'player')} [{self.get_status_display()}]"
@@ -535,6 +598,19 @@ class TeamAssignmentRequest(models.Model):
 # -----------------------------
 # Tournament Models (base + flexible)
 # -----------------------------
+class TournamentQuerySet(models.QuerySet):
+    def with_counts(self):
+        """Annotate teams_count / matches_count so serializers don't COUNT per row."""
+        return self.annotate(
+            teams_count=models.Count("teams", distinct=True),
+            matches_count=models.Count("matches", distinct=True),
+        )
+
+
+class TournamentManager(models.Manager.from_queryset(TournamentQuerySet)):
+    pass
+
+
 class Tournament(models.Model):
     class Status(models.TextChoices):
         UPCOMING = "upcoming", "Upcoming"
@@ -560,8 +636,13 @@ class Tournament(models.Model):
     end_date = models.DateTimeField(null=True, blank=True)
     location = models.CharField(max_length=200, blank=True, null=True)
     description = models.TextField(blank=True, null=True)
+    bracket = models.JSONField(
+        null=True, blank=True, help_text="Seeded first knockout round as [team_id, team_id or null] slots; null is a bye"
+    )
     created_at = models.DateTimeField(default=timezone.now)
 
+    objects = TournamentManager()
+
     class Meta:
         ordering = ["-created_at"]
 
@@ -589,6 +670,11 @@ class TournamentMatch(models.Model):
         CANCELLED = "cancelled", "Cancelled"
         NO_RESULT = "no_result", "No Result"
 
+    class Stage(models.TextChoices):
+        LEAGUE = "league", "League"
+        GROUP = "group", "Group"
+        KNOCKOUT = "knockout", "Knockout"
+
     tournament = models.ForeignKey(Tournament, on_delete=models.CASCADE, related_name="matches")
     team1 = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="tournament_matches_as_team1")
     team2 = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="tournament_matches_as_team2")
@@ -603,6 +689,10 @@ class TournamentMatch(models.Model):
     is_completed = models.BooleanField(default=False)
     man_of_the_match = models.ForeignKey(Player, on_delete=models.SET_NULL, null=True, blank=True, related_name="mom_awards")
     notes = models.TextField(blank=True, null=True)
+    stage = models.CharField(max_length=20, choices=Stage.choices, default=Stage.LEAGUE)
+    group_name = models.CharField(max_length=10, blank=True, default="", help_text="Group label for group-stage matches")
+    round_number = models.PositiveIntegerField(default=1)
+    bracket_slot = models.PositiveIntegerField(null=True, blank=True, help_text="Position within a knockout round")
     created_at = models.DateTimeField(default=timezone.now)
 
     class Meta:
@@ -640,6 +730,7 @@ class CricketMatchState(models.Model):
     current_over = models.PositiveIntegerField(default=0, help_text="Current over number (0-indexed)")
     current_ball = models.PositiveIntegerField(default=0, help_text="Current ball in over (0-5)")
     total_balls_bowled = models.PositiveIntegerField(default=0, help_text="Total balls bowled in match")
+    ball_seq = models.PositiveIntegerField(default=0, help_text="Sequence number of the last delivery recorded")
     
     # Team scores
     team1_runs = models.PositiveIntegerField(default=0)
@@ -669,9 +760,14 @@ class MatchPlayerStats(models.Model):
     sixes = models.PositiveIntegerField(default=0)
     is_out = models.BooleanField(default=False)
     dismissal_type = models.CharField(max_length=50, blank=True, null=True, help_text="bowled, caught, lbw, etc.")
+    dismissed_by = models.ForeignKey(Player, on_delete=models.SET_NULL, null=True, blank=True, related_name="dismissals")
+    fall_of_wicket_number = models.PositiveIntegerField(null=True, blank=True, help_text="Wicket number in the innings")
+    fall_of_wicket_score = models.PositiveIntegerField(null=True, blank=True, help_text="Team score when out")
+    fall_of_wicket_ball = models.PositiveIntegerField(null=True, blank=True, help_text="Legal balls into the innings when out")
     
     # Bowling stats
     overs_bowled = models.DecimalField(max_digits=4, decimal_places=1, default=0.0, help_text="Overs bowled (e.g., 5.3 = 5.3 overs)")
+    legal_balls = models.PositiveIntegerField(default=0, help_text="Balls bowled, not counting wides and no-balls")
     runs_conceded = models.PositiveIntegerField(default=0)
     wickets_taken = models.PositiveIntegerField(default=0)
     maidens = models.PositiveIntegerField(default=0)
@@ -689,11 +785,68 @@ class MatchPlayerStats(models.Model):
     class Meta:
         unique_together = ("match", "player")
         ordering = ["-runs_scored", "-wickets_taken"]
+        indexes = [
+            # Per-innings totals; (match, player) above serves lookups by match alone
+            models.Index(fields=["match", "team"], name="match_stats_match_team"),
+        ]
 
     def __str__(self):
         return f"{self.player.user.username} - {self.match} ({self.runs_scored} runs, {self.wickets_taken} wickets)"
 
 
+# -----------------------------
+# Materialised career per player and sport
+# -----------------------------
+class PlayerCareer(models.Model):
+    """Career totals rebuilt from MatchPlayerStats of completed matches (see core/services/career.py)."""
+    player = models.ForeignKey(Player, on_delete=models.CASCADE, related_name="careers")
+    sport = models.ForeignKey(Sport, on_delete=models.CASCADE, related_name="player_careers")
+
+    matches = models.PositiveIntegerField(default=0)
+    innings = models.PositiveIntegerField(default=0)
+    not_outs = models.PositiveIntegerField(default=0)
+    runs = models.PositiveIntegerField(default=0)
+    balls_faced = models.PositiveIntegerField(default=0)
+    highest_score = models.PositiveIntegerField(default=0)
+    fours = models.PositiveIntegerField(default=0)
+    sixes = models.PositiveIntegerField(default=0)
+    fifties = models.PositiveIntegerField(default=0)
+    hundreds = models.PositiveIntegerField(default=0)
+    batting_average = models.FloatField(null=True, blank=True, help_text="Runs per dismissal; null until first dismissal")
+    strike_rate = models.FloatField(default=0.0)
+
+    balls_bowled = models.PositiveIntegerField(default=0)
+    runs_conceded = models.PositiveIntegerField(default=0)
+    wickets = models.PositiveIntegerField(default=0)
+    maidens = models.PositiveIntegerField(default=0)
+    best_bowling_wickets = models.PositiveIntegerField(default=0)
+    best_bowling_runs = models.PositiveIntegerField(default=0)
+    bowling_average = models.FloatField(null=True, blank=True, help_text="Runs conceded per wicket")
+    economy = models.FloatField(default=0.0)
+
+    catches = models.PositiveIntegerField(default=0)
+    stumpings = models.PositiveIntegerField(default=0)
+    run_outs = models.PositiveIntegerField(default=0)
+    mom_awards = models.PositiveIntegerField(default=0)
+
+    last_match_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("player", "sport")
+        indexes = [
+            models.Index(fields=["sport", "-runs"]),
+            models.Index(fields=["sport", "-wickets"]),
+        ]
+
+    @property
+    def best_bowling(self):
+        return f"{self.best_bowling_wickets}/{self.best_bowling_runs}" if self.balls_bowled else None
+
+    def __str__(self):
+        return f"{self.player.user.username} - {self.sport.name} career"
+
+
 # -----------------------------
 # Tournament Points Table
 # -----------------------------
@@ -744,6 +897,43 @@ class Notification(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["user", "-created_at"], name="notification_user_created"),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username}: {self.title}"
+
+
+# -----------------------------
+# Search index (players and coaches)
+# -----------------------------
+class SearchDocument(models.Model):
+    """Denormalised search text for one player or coach (see core/services/search.py).
+
+    ``document`` is indexed with pg_trgm on PostgreSQL and mirrored into an
+    FTS5 trigram table on SQLite; both are created by migration 0008.
+    """
+    class Kind(models.TextChoices):
+        PLAYER = "player", _("Player")
+        COACH = "coach", _("Coach")
+
+    kind = models.CharField(max_length=10, choices=Kind.choices)
+    object_id = models.PositiveIntegerField()
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="search_documents")
+    label = models.CharField(max_length=150, help_text="Username shown in results")
+    external_id = models.CharField(max_length=10, blank=True, default="", help_text="Player or coach ID")
+    detail = models.CharField(max_length=150, blank=True, default="", help_text="College or specialization")
+    sport = models.ForeignKey(Sport, on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+    is_public = models.BooleanField(default=True)
+    document = models.TextField(help_text="Lower-cased text that queries match against")
+
+    class Meta:
+        unique_together = ("kind", "object_id")
+        indexes = [
+            models.Index(fields=["kind", "label"]),
+            models.Index(fields=["kind", "external_id"]),
+        ]
 
     def __str__(self):
-        return f"{self.user.username}: {self.title}"
\ No newline at end of file
+        return f"{self.kind}:{self.label}"
@@ -0,0 +1,64 @@
+from rest_framework.pagination import BasePagination, CursorPagination, LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+
+MAX_PAGE_SIZE = 100
+
+
+class _LimitOffset(LimitOffsetPagination):
+    # Clients that send no limit read the body as the whole list; give them as much as the cap allows
+    default_limit = MAX_PAGE_SIZE
+    max_limit = MAX_PAGE_SIZE
+
+
+class _Keyset(CursorPagination):
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "limit"
+    max_page_size = MAX_PAGE_SIZE
+
+    def get_ordering(self, request, queryset, view):
+        """Keyset on whatever order_by() the view's list already applied (model ordering as fallback)."""
+        ordering = list(queryset.query.order_by or queryset.model._meta.ordering or ["-pk"])
+        if not {"pk", "-pk", "id", "-id"} & set(ordering):
+            # Unique tie-breaker keeps rows sharing the leading key in a stable order
+            ordering.append("-pk" if ordering[0].startswith("-") else "pk")
+        return tuple(ordering)
+
+
+class LinkHeaderPagination(BasePagination):
+    """Bounded list responses that keep the body a plain JSON list.
+
+    Paging metadata travels in headers instead of an envelope, so existing
+    clients reading ``response.data`` as an array keep working:
+
+    - ``?limit=&offset=`` (default mode): offset paging, ``X-Total-Count`` header.
+      Without ``limit`` a page holds MAX_PAGE_SIZE rows, so short lists come back whole.
+    - ``?cursor=`` (empty to start): keyset paging on the list's ordering; no
+      COUNT and no OFFSET scan, so deep pages stay cheap on large tables.
+
+    Both modes emit RFC 8288 ``Link`` headers with ``rel="next"``/``rel="prev"``.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if _Keyset.cursor_query_param in request.query_params:
+            self.paginator = _Keyset()
+        else:
+            self.paginator = _LimitOffset()
+        return self.paginator.paginate_queryset(queryset, request, view=view)
+
+    def get_paginated_response(self, data):
+        headers = {}
+        links = [
+            f'<{url}>; rel="{rel}"'
+            for url, rel in (
+                (self.paginator.get_next_link(), "next"),
+                (self.paginator.get_previous_link(), "prev"),
+            )
+            if url
+        ]
+        if links:
+            headers["Link"] = ", ".join(links)
+        if isinstance(self.paginator, _LimitOffset):
+            headers["X-Total-Count"] = str(self.paginator.count)
+        return Response(data, headers=headers)
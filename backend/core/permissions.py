@@ -1,21 +1,26 @@
 from rest_framework.permissions import BasePermission
 
+from .principal import get_principal
+
 
 class IsAuthenticatedAndPlayer(BasePermission):
     def has_permission(self, request, view):
-        return bool(request.user and request.user.is_authenticated and getattr(request.user, "role", None) == "player")
+        principal = get_principal(request)
+        return principal.is_player and principal.player_id is not None
 
 
 class IsAuthenticatedAndManagerOrAdmin(BasePermission):
     def has_permission(self, request, view):
-        if not (request.user and request.user.is_authenticated):
-            return False
-        role = getattr(request.user, "role", None)
-        return role in {"manager", "admin"}
+        principal = get_principal(request)
+        return principal.is_manager or principal.is_admin
 
 
 class IsAuthenticatedAndCoach(BasePermission):
     def has_permission(self, request, view):
-        return bool(request.user and request.user.is_authenticated and getattr(request.user, "role", None) == "coach")
+        principal = get_principal(request)
+        return principal.is_coach and principal.coach_id is not None
 
 
+class IsAuthenticatedAndAdmin(BasePermission):
+    def has_permission(self, request, view):
+        return get_principal(request).is_admin
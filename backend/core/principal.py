@@ -0,0 +1,88 @@
+"""Request-scoped view of who is calling: the user's role and role profile ids.
+
+``get_principal(request)`` builds it once per request and caches it on the
+request. Role checks are free; the first profile id asked for loads all three
+in one query, or in none when the authentication backend already loaded the
+profiles with the user or carries them as JWT claims (see
+``core.authentication``). Permission classes and views use it instead of
+the user's lazy one-to-one profile relations.
+"""
+from .models import User
+
+
+PROFILE_RELATIONS = ("player", "coach", "manager")
+
+
+class Principal:
+    """The user's id and role, plus role profile ids looked up on first use."""
+
+    __slots__ = ("user_id", "role", "_user", "_profiles")
+
+    def __init__(self, user_id, role, player_id=None, coach_id=None, manager_id=None, user=None):
+        self.user_id = user_id
+        self.role = role
+        self._user = user
+        self._profiles = None if user is not None else {
+            "player": player_id, "coach": coach_id, "manager": manager_id,
+        }
+
+    def __repr__(self):
+        return f"<Principal user={self.user_id} role={self.role}>"
+
+    @classmethod
+    def from_user(cls, user):
+        claims = getattr(user, "token_claims", None)
+        if claims is not None:
+            # Stateless JWT: the ids travel in the access token
+            return cls(user.pk, user.role, *(claims.get(f"{name}_id") for name in PROFILE_RELATIONS))
+        return cls(user.pk, user.role, user=user)
+
+    def _profile_id(self, relation):
+        if self._profiles is None:
+            loaded = self._user._state.fields_cache
+            if all(name in loaded for name in PROFILE_RELATIONS):
+                self._profiles = {name: getattr(loaded[name], "pk", None) for name in PROFILE_RELATIONS}
+            else:
+                self._profiles = User.objects.filter(pk=self.user_id).values(*PROFILE_RELATIONS).first() or {}
+        return self._profiles.get(relation)
+
+    @property
+    def player_id(self):
+        return self._profile_id("player")
+
+    @property
+    def coach_id(self):
+        return self._profile_id("coach")
+
+    @property
+    def manager_id(self):
+        return self._profile_id("manager")
+
+    @property
+    def is_player(self):
+        return self.role == User.Roles.PLAYER
+
+    @property
+    def is_coach(self):
+        return self.role == User.Roles.COACH
+
+    @property
+    def is_manager(self):
+        return self.role == User.Roles.MANAGER
+
+    @property
+    def is_admin(self):
+        return self.role == User.Roles.ADMIN
+
+
+ANONYMOUS = Principal(None, None)
+
+
+def get_principal(request):
+    """The Principal for `request`, resolved on first use."""
+    principal = getattr(request, "_principal", None)
+    if principal is None:
+        user = request.user
+        principal = Principal.from_user(user) if user and user.is_authenticated else ANONYMOUS
+        request._principal = principal
+    return principal
@@ -1,18 +1,122 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.core.exceptions import FieldDoesNotExist
 from django.db import transaction
 
 from .models import (
     PromotionRequest, Player, Sport, CoachingSession, CoachPlayerLinkRequest, Coach, Leaderboard, Notification,
     Team, Match, Attendance, PlayerSportProfile,
     Manager, ManagerSport, TeamProposal, TeamAssignmentRequest, Tournament, TournamentTeam, TournamentMatch,
-    CricketMatchState, MatchPlayerStats, TournamentPoints
+    CricketMatchState, MatchPlayerStats, TournamentPoints, PlayerCareer
 )
+from .authentication import authenticate_login, is_revoked, issue_tokens
+from .principal import get_principal
 import datetime
+from operator import attrgetter
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, TokenError
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
 
 User = get_user_model()
 
 
+# -----------------------------
+# Sparse fieldsets (?fields= / ?expand=)
+# -----------------------------
+def parse_field_names(value):
+    """Split a comma-separated query param into a set of names."""
+    return {name.strip() for name in (value or "").split(",") if name.strip()}
+
+
+class RefField(serializers.Field):
+    """Compact ``{"id", ...}`` reference to a related object; `ref` maps keys to dotted attributes."""
+
+    def __init__(self, ref, **kwargs):
+        self.ref = ref
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        data = {"id": value.pk}
+        for key, path in self.ref.items():
+            data[key] = attrgetter(path)(value)
+        return data
+
+
+class DynamicFieldsMixin:
+    """``fields``/``expand`` support for read serializers.
+
+    With a ``fields`` set in the context, only those top-level fields are
+    rendered and the relations in ``DYNAMIC_RELATIONS`` shrink to ``RefField``
+    references unless also named in ``expand`` (``all`` expands them all).
+    Without ``fields`` the representation is unchanged. ``optimize()`` shapes
+    a queryset with the select_related()/only() that selection needs. Only
+    the root serializer is trimmed; nested serializers always render in full.
+    """
+    # relation -> ({ref key: dotted attribute}, select_related paths of the full nested serializer)
+    DYNAMIC_RELATIONS = {}
+
+    def _selection(self):
+        parent = self.parent
+        if parent is not None and not (isinstance(parent, serializers.ListSerializer) and parent.parent is None):
+            return None, set()
+        return self.context.get("fields"), self.context.get("expand", set())
+
+    @classmethod
+    def _expanded(cls, expand):
+        return set(cls.DYNAMIC_RELATIONS) if "all" in expand else set(expand)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        selected, expand = self._selection()
+        if not selected:
+            return fields
+        expanded = self._expanded(expand)
+        fields = {name: field for name, field in fields.items() if name in selected}
+        for name, (ref, _) in self.DYNAMIC_RELATIONS.items():
+            if name in fields and name not in expanded:
+                fields[name] = RefField(ref)
+        return fields
+
+    @classmethod
+    def optimize(cls, queryset, fields=None, expand=()):
+        """`queryset` with the joins and columns needed to render this selection."""
+        model = cls.Meta.model
+        declared = cls().fields
+        expanded = cls._expanded(expand)
+        related, columns, exact = [], set(), True
+        for name in (fields & set(declared)) if fields else declared:
+            if name in cls.DYNAMIC_RELATIONS:
+                ref, full = cls.DYNAMIC_RELATIONS[name]
+                columns.add(name)
+                if fields is None or name in expanded:
+                    related.extend([name, *full])
+                    continue
+                related.append(name)
+                for path in ref.values():
+                    parts = path.split(".")
+                    # Every hop of a ref path is a column of the row it starts from
+                    for depth in range(1, len(parts) + 1):
+                        columns.add("__".join([name, *parts[:depth]]))
+                    related.extend("__".join([name, *parts[:depth]]) for depth in range(1, len(parts)))
+                continue
+            source = declared[name].source
+            try:
+                field = model._meta.get_field(source)
+            except FieldDoesNotExist:
+                # Computed field: its inputs are unknown, so keep every column
+                exact = False
+                continue
+            if not field.concrete:
+                exact = False
+                continue
+            columns.add(source)
+        queryset = queryset.select_related(None).select_related(*dict.fromkeys(related))
+        if fields and exact:
+            queryset = queryset.only(*columns)
+        return queryset
+
+
 class PromotionRequestCreateSerializer(serializers.Serializer):
     sport_id = serializers.IntegerField()
     player_id = serializers.CharField(required=False, allow_null=True, allow_blank=True)
@@ -20,7 +124,7 @@ class PromotionRequestCreateSerializer(serializers.Serializer):
 
     def validate(self, attrs):
         user = self.context["request"].user
-        if hasattr(user, "coach"):
+        if get_principal(self.context["request"]).coach_id is not None:
             raise serializers.ValidationError("User is already a coach")
         # ensure sport exists
         try:
@@ -283,6 +387,38 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
 
         return user
 
+
+class LoginSerializer(serializers.Serializer):
+    """Username/password check for the DRF token login (one query, see authenticate_login)."""
+    username = serializers.CharField()
+    password = serializers.CharField(trim_whitespace=False, write_only=True)
+
+    def validate(self, attrs):
+        user = authenticate_login(attrs["username"], attrs["password"])
+        if user is None:
+            raise serializers.ValidationError(_("Unable to log in with provided credentials."), code="authorization")
+        attrs["user"] = user
+        return attrs
+
+
+class RoleTokenObtainPairSerializer(LoginSerializer):
+    """Issues a JWT pair carrying the user's role and profile ids."""
+
+    def validate(self, attrs):
+        user = authenticate_login(attrs["username"], attrs["password"])
+        if user is None:
+            raise AuthenticationFailed(_("No active account found with the given credentials"), "no_active_account")
+        refresh = issue_tokens(user)
+        return {"refresh": str(refresh), "access": str(refresh.access_token)}
+
+
+class RoleTokenRefreshSerializer(TokenRefreshSerializer):
+    def validate(self, attrs):
+        if is_revoked(self.token_class(attrs["refresh"])):
+            raise TokenError(_("Token has been revoked"))
+        return super().validate(attrs)
+
+
 class TeamCreateSerializer(serializers.ModelSerializer):
     sport_id = serializers.IntegerField(required=False, allow_null=True)
     coach_id = serializers.CharField(required=False, allow_null=True)
@@ -354,10 +490,16 @@ class TeamCreateSerializer(serializers.ModelSerializer):
         return attrs
 
 
-class TeamSerializer(serializers.ModelSerializer):
+class TeamSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     coach = serializers.SerializerMethodField()
     manager = UserPublicSerializer(read_only=True)
     sport = SportSerializer(read_only=True)
+
+    DYNAMIC_RELATIONS = {
+        "coach": ({"coach_id": "coach_id", "username": "user.username"}, ["coach__user"]),
+        "manager": ({"username": "username"}, []),
+        "sport": ({"name": "name"}, []),
+    }
     
     class Meta:
         model = Team
@@ -368,10 +510,15 @@ class TeamSerializer(serializers.ModelSerializer):
             return UserPublicSerializer(obj.coach.user).data
         return None
 
-class PlayerSerializer(serializers.ModelSerializer):
+class PlayerSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     user = UserProfileSerializer(read_only=True)
     team = TeamSerializer(read_only=True)
 
+    DYNAMIC_RELATIONS = {
+        "user": ({"username": "username"}, []),
+        "team": ({"name": "name"}, ["team__coach__user", "team__manager", "team__sport"]),
+    }
+
     class Meta:
         model = Player
         fields = ['id', 'user', 'bio', 'team', 'joined_at']
@@ -406,11 +553,16 @@ class LeaderboardSerializer(serializers.ModelSerializer):
         model = Leaderboard
         fields = "__all__"
         
-class CoachSerializer(serializers.ModelSerializer):
+class CoachSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     user = UserProfileSerializer(read_only=True)
     coach_id = serializers.CharField(read_only=True)
     primary_sport = SportSerializer(read_only=True)
 
+    DYNAMIC_RELATIONS = {
+        "user": ({"username": "username"}, []),
+        "primary_sport": ({"name": "name"}, []),
+    }
+
     class Meta:
         model = Coach
         fields = ['id', 'coach_id', 'user', 'primary_sport', 'experience', 'specialization']
@@ -586,7 +738,7 @@ class TournamentCreateSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError({"manager_id": "Manager is not assigned to this sport"})
             attrs["manager"] = manager
         elif user.role == User.Roles.MANAGER:
-            if not hasattr(user, "manager"):
+            if get_principal(request).manager_id is None:
                 raise serializers.ValidationError("Manager profile not found")
             sport = attrs["sport"]
             if not ManagerSport.objects.filter(manager__user=user, sport=sport).exists():
@@ -616,10 +768,22 @@ class TournamentSerializer(serializers.ModelSerializer):
         read_only_fields = ["teams_count", "matches_count"]
 
     def get_teams_count(self, obj):
-        return obj.teams.count()
+        # Prefer the Tournament.objects.with_counts() annotation when present
+        count = getattr(obj, "teams_count", None)
+        return count if count is not None else obj.teams.count()
     
     def get_matches_count(self, obj):
-        return obj.matches.count()
+        count = getattr(obj, "matches_count", None)
+        return count if count is not None else obj.matches.count()
+
+
+class TournamentSummarySerializer(serializers.ModelSerializer):
+    """Slim tournament for compact match list rows (``?expand=tournament``); no counts or users."""
+    sport = SportSerializer(read_only=True)
+
+    class Meta:
+        model = Tournament
+        fields = ["id", "name", "sport", "status", "overs_per_match"]
 
 
 class TournamentTeamSerializer(serializers.ModelSerializer):
@@ -707,7 +871,7 @@ class TournamentMatchSerializer(serializers.ModelSerializer):
             "id", "tournament", "team1", "team2", "match_number", "date",
             "score_team1", "score_team2", "wickets_team1", "wickets_team2",
             "location", "status", "is_completed", "man_of_the_match", "notes",
-            "created_at", "cricket_state"
+            "stage", "group_name", "round_number", "bracket_slot", "created_at", "cricket_state"
         ]
         read_only_fields = ["cricket_state"]
 
@@ -719,12 +883,22 @@ class TournamentMatchSerializer(serializers.ModelSerializer):
             return None
 
 
-class PlayerSportProfileSerializer(serializers.ModelSerializer):
+class PlayerSportProfileSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     player = PlayerSerializer(read_only=True)
     sport = SportSerializer(read_only=True)
     team = TeamSerializer(read_only=True)
     coach = CoachSerializer(read_only=True)
 
+    DYNAMIC_RELATIONS = {
+        "player": (
+            {"player_id": "player_id", "username": "user.username"},
+            ["player__user", "player__team__coach__user", "player__team__manager", "player__team__sport"],
+        ),
+        "sport": ({"name": "name"}, []),
+        "team": ({"name": "name"}, ["team__coach__user", "team__manager", "team__sport"]),
+        "coach": ({"coach_id": "coach_id", "username": "user.username"}, ["coach__user", "coach__primary_sport"]),
+    }
+
     class Meta:
         model = PlayerSportProfile
         fields = ["id", "player", "sport", "team", "coach", "joined_date", "is_active", "career_score"]
@@ -808,7 +982,7 @@ class CricketMatchStateSerializer(serializers.ModelSerializer):
         fields = [
             "id", "toss_won_by", "batting_first", "current_batting_team", "current_bowling_team",
             "batsman1", "batsman2", "current_striker", "current_bowler",
-            "current_over", "current_ball", "total_balls_bowled",
+            "current_over", "current_ball", "total_balls_bowled", "ball_seq",
             "team1_runs", "team1_wickets", "team2_runs", "team2_wickets", "updated_at"
         ]
 
@@ -833,6 +1007,67 @@ class CricketMatchStateSerializer(serializers.ModelSerializer):
         return None
 
 
+class TournamentMatchListSerializer(serializers.ModelSerializer):
+    """Compact fixture row: related objects as ids + names.
+
+    Full nested objects are opt-in per field through the "expand" context
+    (``?expand=team1,cricket_state`` or ``?expand=all``).
+    """
+    tournament = serializers.SerializerMethodField()
+    team1 = serializers.SerializerMethodField()
+    team2 = serializers.SerializerMethodField()
+    man_of_the_match = serializers.SerializerMethodField()
+
+    EXPANDABLE_FIELDS = {
+        "tournament": TournamentSummarySerializer,
+        "team1": TeamSerializer,
+        "team2": TeamSerializer,
+        "man_of_the_match": PlayerSerializer,
+        "cricket_state": CricketMatchStateSerializer,
+    }
+
+    class Meta:
+        model = TournamentMatch
+        fields = [
+            "id", "tournament", "team1", "team2", "match_number", "date",
+            "score_team1", "score_team2", "wickets_team1", "wickets_team2",
+            "location", "status", "is_completed", "man_of_the_match",
+            "stage", "group_name", "round_number", "bracket_slot",
+        ]
+
+    @classmethod
+    def parse_expand(cls, value):
+        """Turn an ``expand`` query param into the set of expandable field names."""
+        names = {name.strip() for name in (value or "").split(",") if name.strip()}
+        if "all" in names:
+            return set(cls.EXPANDABLE_FIELDS)
+        return names & set(cls.EXPANDABLE_FIELDS)
+
+    def get_tournament(self, obj):
+        t = obj.tournament
+        return {"id": t.id, "name": t.name, "overs_per_match": t.overs_per_match}
+
+    def get_team1(self, obj):
+        return {"id": obj.team1_id, "name": obj.team1.name}
+
+    def get_team2(self, obj):
+        return {"id": obj.team2_id, "name": obj.team2.name}
+
+    def get_man_of_the_match(self, obj):
+        if not obj.man_of_the_match_id:
+            return None
+        p = obj.man_of_the_match
+        return {"id": p.id, "player_id": p.player_id, "username": p.user.username}
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        for name in self.context.get("expand", ()):
+            # getattr default also covers a missing reverse one-to-one (cricket_state)
+            value = getattr(instance, name, None)
+            data[name] = self.EXPANDABLE_FIELDS[name](value).data if value is not None else None
+        return data
+
+
 class MatchPlayerStatsSerializer(serializers.ModelSerializer):
     player = PlayerSerializer(read_only=True)
     team = TeamSerializer(read_only=True)
@@ -849,6 +1084,20 @@ class MatchPlayerStatsSerializer(serializers.ModelSerializer):
         ]
 
 
+class PlayerCareerSerializer(serializers.ModelSerializer):
+    sport = serializers.CharField(source="sport.name", read_only=True)
+    best_bowling = serializers.CharField(read_only=True)
+
+    class Meta:
+        model = PlayerCareer
+        fields = [
+            "sport", "matches", "innings", "not_outs", "runs", "balls_faced", "highest_score", "fours", "sixes",
+            "fifties", "hundreds", "batting_average", "strike_rate", "balls_bowled", "runs_conceded", "wickets",
+            "maidens", "best_bowling", "bowling_average", "economy", "catches", "stumpings", "run_outs",
+            "mom_awards", "last_match_at", "updated_at",
+        ]
+
+
 class TournamentPointsSerializer(serializers.ModelSerializer):
     tournament = TournamentSerializer(read_only=True)
     team = TeamSerializer(read_only=True)
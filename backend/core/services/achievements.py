@@ -0,0 +1,98 @@
+# backend/core/services/achievements.py
+"""Rule engine for system-awarded achievements.
+
+Each rule turns a match or tournament (plus the aggregates loaded once for
+it) into ``(label, Achievement)`` pairs carrying a stable ``award_key``.
+Awards are written with one ``bulk_create(ignore_conflicts=True)`` against
+the (player, award_key) unique constraint, so re-running a rule is a no-op.
+"""
+from django.utils import timezone
+
+from ..models import Achievement, PlayerSportProfile, TournamentPoints
+from .tournament_stats import tournament_leaders
+from .versions import RESULTS, bump
+
+
+# (leaderboard, award key, label, description) for the tournament leader awards
+LEADER_RULES = [
+    ("runs", "top-scorer", "Top Scorer", "Highest run scorer in {name}"),
+    ("wickets", "top-wicket-taker", "Highest Wicket Taker", "Most wickets in {name}"),
+]
+
+
+def man_of_the_match(match):
+    if not match.man_of_the_match_id:
+        return []
+    tournament = match.tournament
+    return [("Man of the Match", Achievement(
+        player_id=match.man_of_the_match_id,
+        award_key=f"mom:match:{match.pk}",
+        sport_id=tournament.sport_id,
+        tournament_name=tournament.name,
+        title=f"Man of the Match - {tournament.name}",
+        description=f"Man of the Match in {match.team1.name} vs {match.team2.name}",
+        date_awarded=match.date.date() if match.date else timezone.now().date(),
+    ))]
+
+
+def leader_awards(tournament, boards):
+    awards = []
+    for board, key, label, description in LEADER_RULES:
+        if boards[board]:
+            awards.append((label, Achievement(
+                player_id=boards[board][0]["player"],
+                award_key=f"{key}:tournament:{tournament.pk}",
+                sport_id=tournament.sport_id,
+                tournament_name=tournament.name,
+                title=f"{label} - {tournament.name}",
+                description=description.format(name=tournament.name),
+                date_awarded=timezone.now().date(),
+            )))
+    return awards
+
+
+def tournament_winners(tournament, winner):
+    if winner is None:
+        return []
+    squad = PlayerSportProfile.objects.filter(
+        team_id=winner.team_id, sport_id=tournament.sport_id, is_active=True
+    ).values_list("player_id", "player__user__username")
+    return [
+        (f"Winner: {username}", Achievement(
+            player_id=player_id,
+            award_key=f"winner:tournament:{tournament.pk}",
+            sport_id=tournament.sport_id,
+            tournament_name=tournament.name,
+            title=f"Tournament Winner - {tournament.name}",
+            description=f"Won {tournament.name} with {winner.team.name}",
+            date_awarded=timezone.now().date(),
+        ))
+        for player_id, username in squad
+    ]
+
+
+def grant(awards):
+    """Write `awards` in one insert; returns the labels of those not held already."""
+    if not awards:
+        return []
+    held = set(Achievement.objects.filter(
+        award_key__in={achievement.award_key for _, achievement in awards},
+    ).values_list("player_id", "award_key"))
+    new = [(label, a) for label, a in awards if (a.player_id, a.award_key) not in held]
+    Achievement.objects.bulk_create([a for _, a in new], ignore_conflicts=True)
+    if new:
+        bump(RESULTS)
+    return [label for label, _ in new]
+
+
+def award_match(match):
+    return grant(man_of_the_match(match))
+
+
+def award_tournament(tournament):
+    """Evaluate every tournament rule. Returns (created labels, winning TournamentPoints or None)."""
+    boards = tournament_leaders(tournament.pk, k=1, refresh=True)
+    winner = TournamentPoints.objects.filter(tournament=tournament).select_related("team").order_by(
+        "-points", "-net_run_rate"
+    ).first()
+    return grant(leader_awards(tournament, boards) + tournament_winners(tournament, winner)), winner
@@ -0,0 +1,192 @@
+# backend/core/services/career.py
+"""Set-based roll-ups of MatchPlayerStats into career tables.
+
+CricketStats totals are aggregated per active sport profile in SQL and
+applied with F-expression increments, so completing a match costs the same
+handful of queries however large the squads are. Derived ratios (average,
+strike rate, economy) are recomputed in the database from the new totals.
+
+PlayerCareer rows are materialised per player and sport: each refresh
+recomputes the affected players' rows from all their completed matches in
+one grouped query and upserts them, so it is idempotent and safe to rerun.
+"""
+from django.db import transaction
+from django.db.models import Case, Count, F, FloatField, IntegerField, Max, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Cast, Coalesce
+from django.utils import timezone
+
+from ..models import CricketStats, MatchPlayerStats, PlayerCareer
+from .versions import RESULTS, bump
+
+
+# MatchPlayerStats field -> aggregate feeding the CricketStats field of the same key
+CAREER_TOTALS = {
+    "runs": Sum("runs_scored"),
+    "wickets": Sum("wickets_taken"),
+    "balls_faced": Sum("balls_faced"),
+    "balls_bowled": Sum("legal_balls"),
+    "runs_conceded": Sum("runs_conceded"),
+    "matches_played": Count("match", distinct=True),
+}
+
+
+def _ratio(numerator, denominator, scale):
+    return Case(
+        When(**{f"{denominator}__gt": 0}, then=Cast(F(numerator), FloatField()) * scale / F(denominator)),
+        default=Value(0.0),
+        output_field=FloatField(),
+    )
+
+
+RATIOS = {
+    "average": _ratio("runs", "matches_played", 1),
+    "strike_rate": _ratio("runs", "balls_faced", 100),
+    "economy": _ratio("runs_conceded", "balls_bowled", 6),
+}
+
+
+def career_totals(stats):
+    """Aggregate a MatchPlayerStats queryset into {profile_id: {field: total}}.
+
+    Rows are credited to the player's active profile for the match's sport.
+    """
+    rows = stats.filter(
+        player__sport_profiles__sport=F("match__tournament__sport"),
+        player__sport_profiles__is_active=True,
+    ).values(profile_id=F("player__sport_profiles__id")).annotate(**CAREER_TOTALS).order_by()
+    return {row.pop("profile_id"): {field: int(value or 0) for field, value in row.items()} for row in rows}
+
+
+def _ensure_rows(profile_ids):
+    existing = set(CricketStats.objects.filter(profile_id__in=profile_ids).values_list("profile_id", flat=True))
+    CricketStats.objects.bulk_create([CricketStats(profile_id=pid) for pid in profile_ids if pid not in existing])
+
+
+def _refresh_ratios(queryset):
+    queryset.update(last_updated=timezone.now(), **RATIOS)
+    # update() and bulk writes send no signals
+    bump(RESULTS)
+
+
+@transaction.atomic
+def roll_up_match(match):
+    """Add one match's player stats to career CricketStats. Returns the number of profiles updated."""
+    totals = career_totals(MatchPlayerStats.objects.filter(match=match))
+    if not totals:
+        return 0
+    _ensure_rows(totals)
+    career = CricketStats.objects.filter(profile_id__in=totals)
+    career.update(**{
+        field: F(field) + Case(
+            *[When(profile_id=pid, then=Value(row[field])) for pid, row in totals.items()],
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+        for field in CAREER_TOTALS
+    })
+    _refresh_ratios(career)
+    return len(totals)
+
+
+@transaction.atomic
+def rebuild_cricket_stats(batch_size=1000):
+    """Recompute every CricketStats row from completed matches. Returns the number of profiles with totals."""
+    totals = career_totals(MatchPlayerStats.objects.filter(match__is_completed=True))
+    CricketStats.objects.update(**{field: 0 for field in CAREER_TOTALS})
+
+    ids = dict(CricketStats.objects.values_list("profile_id", "id"))
+    created = CricketStats.objects.bulk_create(
+        [CricketStats(profile_id=pid) for pid in totals if pid not in ids], batch_size=batch_size
+    )
+    ids.update((stat.profile_id, stat.pk) for stat in created)
+    CricketStats.objects.bulk_update(
+        [CricketStats(pk=ids[pid], **row) for pid, row in totals.items()],
+        list(CAREER_TOTALS),
+        batch_size=batch_size,
+    )
+    _refresh_ratios(CricketStats.objects.all())
+    return len(totals)
+
+
+# -----------------------------
+# PlayerCareer
+# -----------------------------
+BATTED = Q(balls_faced__gt=0) | Q(is_out=True)
+
+PLAYER_CAREER_TOTALS = {
+    "matches": Count("match", distinct=True),
+    "innings": Count("id", filter=BATTED),
+    "not_outs": Count("id", filter=BATTED & Q(is_out=False)),
+    "runs": Sum("runs_scored"),
+    "balls_faced": Sum("balls_faced"),
+    "highest_score": Max("runs_scored"),
+    "fours": Sum("fours"),
+    "sixes": Sum("sixes"),
+    "fifties": Count("id", filter=Q(runs_scored__gte=50, runs_scored__lt=100)),
+    "hundreds": Count("id", filter=Q(runs_scored__gte=100)),
+    "balls_bowled": Sum("legal_balls"),
+    "runs_conceded": Sum("runs_conceded"),
+    "wickets": Sum("wickets_taken"),
+    "maidens": Sum("maidens"),
+    "best_bowling_wickets": Max("wickets_taken"),
+    "catches": Sum("catches"),
+    "stumpings": Sum("stumpings"),
+    "run_outs": Sum("run_outs"),
+    "mom_awards": Count("match", filter=Q(match__man_of_the_match=F("player"))),
+}
+PLAYER_CAREER_FIELDS = list(PLAYER_CAREER_TOTALS) + [
+    "best_bowling_runs", "batting_average", "strike_rate", "bowling_average", "economy", "last_match_at", "updated_at",
+]
+
+
+def _career_row(row):
+    career = PlayerCareer(player_id=row["player"], sport_id=row["sport"], last_match_at=row["last_match_at"])
+    for field in PLAYER_CAREER_TOTALS:
+        setattr(career, field, row[field] or 0)
+    career.best_bowling_runs = row["best_bowling_runs"] or 0
+    dismissals = career.innings - career.not_outs
+    career.batting_average = career.runs / dismissals if dismissals else None
+    career.strike_rate = career.runs * 100 / career.balls_faced if career.balls_faced else 0.0
+    career.bowling_average = career.runs_conceded / career.wickets if career.wickets else None
+    career.economy = career.runs_conceded * 6 / career.balls_bowled if career.balls_bowled else 0.0
+    career.updated_at = timezone.now()
+    return career
+
+
+@transaction.atomic
+def refresh_player_careers(players=None, batch_size=1000):
+    """Rebuild PlayerCareer rows for `players` (ids or a values() subquery), or for everyone when None.
+
+    Returns the number of rows written.
+    """
+    completed = MatchPlayerStats.objects.filter(match__is_completed=True)
+    if players is not None:
+        completed = completed.filter(player_id__in=players)
+    # Only matches the player bowled in; a batting-only row would read as 0/0
+    best_figures = MatchPlayerStats.objects.filter(
+        match__is_completed=True, player=OuterRef("player"), match__tournament__sport=OuterRef("sport"),
+        legal_balls__gt=0,
+    ).order_by("-wickets_taken", "runs_conceded").values("runs_conceded")[:1]
+    rows = (
+        completed.values("player", sport=F("match__tournament__sport"))
+        .annotate(last_match_at=Max("match__date"), **PLAYER_CAREER_TOTALS)
+        .annotate(best_bowling_runs=Coalesce(Subquery(best_figures), 0))
+        .order_by()
+    )
+    careers = [_career_row(row) for row in rows]
+    if players is None:
+        PlayerCareer.objects.all().delete()
+    PlayerCareer.objects.bulk_create(
+        careers,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=["player", "sport"],
+        update_fields=PLAYER_CAREER_FIELDS,
+    )
+    bump(RESULTS)
+    return len(careers)
+
+
+def refresh_match_careers(match):
+    """Incremental refresh after `match` completes: only its players' rows are rebuilt."""
+    return refresh_player_careers(MatchPlayerStats.objects.filter(match=match).values("player_id"))
@@ -0,0 +1,279 @@
+# backend/core/services/columnar.py
+"""Incremental, partitioned Parquet exports for analytics and the ML trainer.
+
+Each dataset of ``core.services.exports`` is written under
+``<root>/<dataset>/sport=<name>/month=<YYYY-MM>/part-<first pk>-<last pk>.parquet``.
+This is hive layout with URI-encoded values, so ``pandas.read_parquet(<root>/<dataset>)``
+and pyarrow datasets recover ``sport`` and ``month`` as columns. The files
+themselves do not repeat the sport.
+
+Only settled rows are exported:
+- match stats once their match is over;
+- attendance once its session has ended;
+- daily scores once the day has passed.
+Settled rows can still change (a re-rated session, a recomputed daily
+score), so runs are incremental per partition rather than per row. One
+grouped query fingerprints every partition's settled rows (count, pk sum,
+latest ``updated_at``) and ``<root>/_manifest.json`` keeps the fingerprints
+of the last run. A partition is rewritten whole when its fingerprint
+changed, which covers new, newly settled, edited and deleted rows alike, and
+removed when it no longer has settled rows. An unsettled row only holds
+back its own partition's copy of itself.
+Rows are streamed from the database in chunks and written as row groups.
+
+pyarrow is optional; it is only imported when an export runs.
+"""
+import datetime
+import json
+import os
+import shutil
+from dataclasses import dataclass
+from decimal import Decimal
+from urllib.parse import quote
+
+from django.conf import settings
+from django.db import models
+from django.db.models import Count, Max, Q, Sum
+from django.db.models.functions import Trunc
+from django.utils import timezone
+
+from ..models import TournamentMatch
+from .exports import DATASETS, DEFAULT_CHUNK_SIZE, ExportError, export_queryset
+
+
+MANIFEST = "_manifest.json"
+# Partition value pyarrow reads back as null
+HIVE_NULL = "__HIVE_DEFAULT_PARTITION__"
+# Rows buffered per partition before they are written as one row group
+ROW_GROUP_SIZE = 50_000
+
+
+@dataclass(frozen=True)
+class Partitioning:
+    # export column holding the sport name, moved into the path; None puts every row under sport=all
+    sport: str | None
+    # export column holding the date or datetime that picks the month
+    date: str
+
+
+PARTITIONS = {
+    "session-attendance": Partitioning("sport", "session_date"),
+    # Daily scores average every session of the day, whatever the sport
+    "daily-performance": Partitioning(None, "date"),
+    "match-stats": Partitioning("sport", "match_date"),
+}
+
+
+def _settled(name):
+    """Rows of dataset `name` that are ready to export; see the module docstring."""
+    if name == "match-stats":
+        return Q(match__is_completed=True) | Q(
+            match__status__in=[TournamentMatch.Status.CANCELLED, TournamentMatch.Status.NO_RESULT]
+        )
+    if name == "session-attendance":
+        return Q(session__is_active=False)
+    return Q(date__lt=timezone.localdate())
+
+
+def _arrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ExportError("Parquet exports need pyarrow: pip install pyarrow")
+    return pyarrow
+
+
+def _field(model, path):
+    *relations, name = path.split("__")
+    for relation in relations:
+        model = model._meta.get_field(relation).related_model
+    return model._meta.get_field(name)
+
+
+def _arrow_type(pa, field):
+    if field.is_relation:
+        return pa.int64()
+    if isinstance(field, models.BooleanField):
+        return pa.bool_()
+    if isinstance(field, (models.IntegerField, models.AutoField)):
+        return pa.int64()
+    if isinstance(field, (models.FloatField, models.DecimalField)):
+        return pa.float64()
+    if isinstance(field, models.DateTimeField):
+        return pa.timestamp("us", tz="UTC")
+    if isinstance(field, models.DateField):
+        return pa.date32()
+    return pa.string()
+
+
+def arrow_schema(name):
+    """pyarrow schema of dataset `name`'s files, from the model fields behind its columns."""
+    pa = _arrow()
+    dataset = DATASETS[name]
+    return pa.schema([
+        (column, _arrow_type(pa, _field(dataset.model, path)))
+        for column, path in dataset.columns.items()
+        if column != PARTITIONS[name].sport
+    ])
+
+
+def _month_label(day):
+    if day is None:
+        return HIVE_NULL
+    if isinstance(day, datetime.datetime) and timezone.is_aware(day):
+        day = timezone.localtime(day)
+    return f"{day:%Y-%m}"
+
+
+def _partition_key(spec, sport, month):
+    if spec.sport is None:
+        sport = "all"
+    else:
+        sport = quote(sport, safe="") if sport else HIVE_NULL
+    return f"sport={sport}/month={_month_label(month)}"
+
+
+def _next_month(month):
+    return (month.replace(day=1) + datetime.timedelta(days=32)).replace(day=1)
+
+
+def _plain(value):
+    # Arrow float columns take floats, not Decimals
+    return float(value) if isinstance(value, Decimal) else value
+
+
+def read_manifest(root):
+    try:
+        with open(os.path.join(root, MANIFEST), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def _write_manifest(root, manifest):
+    path = os.path.join(root, MANIFEST)
+    with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(f"{path}.tmp", path)
+
+
+def _fingerprints(name):
+    """{partition key: (settled rows, pk sum, latest updated_at)} -> (sport, month) values behind each key."""
+    spec = PARTITIONS[name]
+    dataset = DATASETS[name]
+    group_by = [dataset.columns[spec.sport]] if spec.sport else []
+    rows = (
+        dataset.model.objects.filter(_settled(name))
+        .annotate(partition_month=Trunc(dataset.columns[spec.date], "month"))
+        .values(*group_by, "partition_month")
+        .annotate(rows=Count("pk"), pk_sum=Sum("pk"), changed=Max("updated_at"))
+        .order_by()
+    )
+    partitions = {}
+    for row in rows:
+        sport = row[group_by[0]] if group_by else None
+        key = _partition_key(spec, sport, row["partition_month"])
+        changed = row["changed"].isoformat() if row["changed"] else None
+        partitions[key] = ([row["rows"], row["pk_sum"], changed], (sport, row["partition_month"]))
+    return partitions
+
+
+def _partition_rows(name, sport, month):
+    """values_list() rows of one partition, settled only, in pk order."""
+    spec = PARTITIONS[name]
+    dataset = DATASETS[name]
+    rows = export_queryset(name).filter(_settled(name))
+    if spec.sport is not None:
+        sport_path = dataset.columns[spec.sport]
+        rows = rows.filter(**({sport_path: sport} if sport else {f"{sport_path}__isnull": True}))
+    date_path = dataset.columns[spec.date]
+    if month is None:
+        return rows.filter(**{f"{date_path}__isnull": True})
+    return rows.filter(**{f"{date_path}__gte": month, f"{date_path}__lt": _next_month(month)})
+
+
+def _write_partition(pa, schema, folder, rows, stored):
+    """Write `rows` to one part file in `folder`, replacing the files there. Returns (path, rows written)."""
+    os.makedirs(folder, exist_ok=True)
+    tmp = os.path.join(folder, ".part.parquet.tmp")
+    writer = pa.parquet.ParquetWriter(tmp, schema)
+    batch, count, first_pk, last_pk = [], 0, None, None
+
+    def flush():
+        columns = list(zip(*batch)) if batch else [[] for _ in schema]
+        writer.write_table(pa.Table.from_arrays(
+            [pa.array(values, type=field.type) for values, field in zip(columns, schema)], schema=schema
+        ))
+
+    for values in rows:
+        batch.append(tuple(_plain(values[i]) for i in stored))
+        first_pk = values[0] if first_pk is None else first_pk
+        last_pk = values[0]
+        count += 1
+        if len(batch) >= ROW_GROUP_SIZE:
+            flush()
+            batch = []
+    if batch or not count:
+        flush()
+    writer.close()
+
+    for old in os.listdir(folder):
+        if old.endswith(".parquet"):
+            os.remove(os.path.join(folder, old))
+    path = os.path.join(folder, f"part-{first_pk or 0:012d}-{last_pk or 0:012d}.parquet")
+    os.replace(tmp, path)
+    return path, count
+
+
+def export_parquet(name, root=None, full=False, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Bring dataset `name`'s Parquet partitions in line with its settled rows.
+
+    Only partitions whose settled rows changed since the last run are
+    rewritten; with `full`, every partition is. Returns {"rows", "files", "removed"}.
+    """
+    pa = _arrow()
+    if name not in PARTITIONS:
+        raise ExportError(f"Unknown dataset '{name}'. Choose from: {', '.join(PARTITIONS)}")
+    root = root or settings.ANALYTICS_EXPORT_DIR
+    directory = os.path.join(root, name)
+    manifest = read_manifest(root)
+    if full:
+        shutil.rmtree(directory, ignore_errors=True)
+        manifest.pop(name, None)
+    exported = manifest.get(name, {}).get("partitions", {})
+
+    spec = PARTITIONS[name]
+    columns = list(DATASETS[name].columns)
+    # export_queryset() puts "id" first, which _write_partition() relies on for file names
+    stored = [i for i, column in enumerate(columns) if column != spec.sport]
+    schema = arrow_schema(name)
+    current = _fingerprints(name)
+    count, files = 0, []
+    for key, (fingerprint, (sport, month)) in sorted(current.items()):
+        if exported.get(key) == fingerprint:
+            continue
+        rows = _partition_rows(name, sport, month).iterator(chunk_size=chunk_size)
+        path, written = _write_partition(pa, schema, os.path.join(directory, *key.split("/")), rows, stored)
+        files.append(path)
+        count += written
+    removed = sorted(set(exported) - set(current))
+    for key in removed:
+        shutil.rmtree(os.path.join(directory, *key.split("/")), ignore_errors=True)
+
+    manifest[name] = {
+        "partitions": {key: fingerprint for key, (fingerprint, _) in current.items()},
+        "rows": sum(fingerprint[0] for fingerprint, _ in current.values()),
+        "exported_at": timezone.now().isoformat(),
+    }
+    os.makedirs(root, exist_ok=True)
+    _write_manifest(root, manifest)
+    return {"rows": count, "files": files, "removed": removed}
+
+
+def read_frame(name, root=None, **kwargs):
+    """pandas DataFrame of dataset `name`'s Parquet export; kwargs go to pandas.read_parquet (e.g. filters)."""
+    _arrow()
+    import pandas as pd
+
+    return pd.read_parquet(os.path.join(root or settings.ANALYTICS_EXPORT_DIR, name), **kwargs)
@@ -0,0 +1,129 @@
+# backend/core/services/deliveries.py
+"""Apply a queued batch of scoring events to a match in one transaction.
+
+Offline scorers number every event (runs, extras, wickets, bowler changes)
+with a sequence number continuing from ``CricketMatchState.ball_seq``. A
+batch must start at ``ball_seq + 1`` and be gap-free; anything already
+applied or out of order is rejected as a whole, so replaying a batch after a
+lost response can never double-count.
+"""
+from django.db import transaction
+
+from ..models import CricketMatchState, MatchPlayerStats, PlayerSportProfile, TournamentMatch
+from .scoring import EXTRAS, change_bowler, score_extra, score_runs, take_wicket
+
+
+MAX_BATCH = 600  # a 50-over innings each way, plus extras and bowler changes
+
+STATS_FIELDS = [
+    "runs_scored", "balls_faced", "fours", "sixes", "is_out", "runs_conceded", "wickets_taken",
+    "overs_bowled", "legal_balls", "wides", "no_balls",
+    "dismissed_by", "fall_of_wicket_number", "fall_of_wicket_score", "fall_of_wicket_ball",
+]
+
+
+class DeliveryError(Exception):
+    def __init__(self, message, seq=None):
+        super().__init__(message)
+        self.seq = seq
+
+
+class SequenceError(DeliveryError):
+    """The batch does not continue exactly from the last recorded event."""
+
+    def __init__(self, message, seq, expected):
+        super().__init__(message, seq)
+        self.expected = expected
+
+
+def _int(event, key, low=None, high=None):
+    try:
+        value = int(event[key])
+    except (KeyError, ValueError, TypeError):
+        raise DeliveryError(f"{key} must be an integer", event.get("seq"))
+    if (low is not None and value < low) or (high is not None and value > high):
+        raise DeliveryError(f"{key} must be between {low} and {high}", event.get("seq"))
+    return value
+
+
+def check_sequence(deliveries, last_seq):
+    """Require seqs to run consecutively from `last_seq + 1`."""
+    for offset, event in enumerate(deliveries):
+        if not isinstance(event, dict):
+            raise DeliveryError("Each delivery must be an object")
+        seq = _int(event, "seq")
+        expected = last_seq + 1 + offset
+        if seq != expected:
+            kind = "Duplicate" if seq < expected else "Gap before"
+            raise SequenceError(f"{kind} sequence number {seq}; expected {expected}", seq, last_seq + 1)
+        event["seq"] = seq
+
+
+@transaction.atomic
+def apply_deliveries(match, deliveries):
+    """Apply `deliveries` to `match` and return its updated CricketMatchState.
+
+    Nothing is written unless every event in the batch is valid.
+    """
+    if not isinstance(deliveries, list) or not deliveries:
+        raise DeliveryError("deliveries must be a non-empty list")
+    if len(deliveries) > MAX_BATCH:
+        raise DeliveryError(f"At most {MAX_BATCH} deliveries per batch")
+
+    try:
+        # Row lock serialises concurrent batches for the same match
+        state = CricketMatchState.objects.select_for_update().get(match=match)
+    except CricketMatchState.DoesNotExist:
+        raise DeliveryError("Match not in progress")
+    if match.status != TournamentMatch.Status.IN_PROGRESS:
+        raise DeliveryError("Match not in progress")
+
+    check_sequence(deliveries, state.ball_seq)
+
+    squads = {match.team1_id: {}, match.team2_id: {}}
+    for profile in PlayerSportProfile.objects.filter(
+        team_id__in=squads, sport=match.tournament.sport, is_active=True
+    ).select_related("player__user"):
+        squads[profile.team_id][profile.player_id] = profile.player
+    stats = {stat.player_id: stat for stat in MatchPlayerStats.objects.filter(match=match)}
+    touched = set()
+
+    def stats_for(player, team_id):
+        stat = stats.get(player.id)
+        if stat is None:
+            stat = stats[player.id] = MatchPlayerStats.objects.create(match=match, player=player, team_id=team_id)
+        touched.add(player.id)
+        return stat
+
+    def squad_player(event, key, team_id, label, side):
+        player = squads[team_id].get(_int(event, key))
+        if player is None:
+            raise DeliveryError(f"{label} must be in {side} team", event["seq"])
+        return player
+
+    for event in deliveries:
+        seq, kind = event["seq"], event.get("type")
+        if kind == "bowler":
+            change_bowler(state, squad_player(event, "bowler_id", state.current_bowling_team_id, "Bowler", "bowling"))
+            continue
+        if kind not in ("runs", "extra", "wicket"):
+            raise DeliveryError("type must be one of runs, extra, wicket, bowler", seq)
+        if not state.current_striker_id or (kind != "wicket" and not state.current_bowler_id):
+            raise DeliveryError("Batsman and bowler must be set", seq)
+
+        striker = stats_for(state.current_striker, state.current_batting_team_id)
+        bowler = stats_for(state.current_bowler, state.current_bowling_team_id) if state.current_bowler_id else None
+        if kind == "runs":
+            score_runs(match, state, striker, bowler, _int(event, "runs", 0, 6))
+        elif kind == "extra":
+            if event.get("extra") not in EXTRAS:
+                raise DeliveryError(f"extra must be one of {', '.join(EXTRAS)}", seq)
+            score_extra(match, state, striker, bowler, event["extra"], _int(event, "runs", 0, 6))
+        else:
+            next_batsman = squad_player(event, "next_batsman_id", state.current_batting_team_id, "Next batsman", "batting")
+            take_wicket(match, state, striker, bowler, next_batsman)
+
+    MatchPlayerStats.objects.bulk_update([stats[pid] for pid in touched], STATS_FIELDS)
+    state.save()
+    match.save(update_fields=["score_team1", "score_team2", "wickets_team1", "wickets_team2"])
+    return state
@@ -0,0 +1,186 @@
+# backend/core/services/exports.py
+"""Streaming CSV / NDJSON exports of training and match history.
+
+Rows are read with ``values_list().iterator(chunk_size=...)``, which uses a
+server-side cursor on PostgreSQL, and encoded as they arrive. Memory use
+stays constant however many rows match, so the HTTP endpoint can hand the
+generator to a ``StreamingHttpResponse`` and the ``export_data`` command can
+write it straight to a file.
+"""
+import csv
+from dataclasses import dataclass
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from ..models import DailyPerformanceScore, MatchPlayerStats, PlayerSportProfile, SessionAttendance
+
+
+FORMATS = {"csv": "text/csv; charset=utf-8", "ndjson": "application/x-ndjson"}
+FILTERS = ("sport", "coach", "tournament", "date_from", "date_to")
+DEFAULT_CHUNK_SIZE = 2000
+# Encoded rows joined into one chunk of the response body
+LINES_PER_CHUNK = 500
+
+
+class ExportError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class Dataset:
+    model: type
+    # output column -> values() path
+    columns: dict
+    # filter -> lookup path; "date" backs date_from/date_to
+    lookups: dict
+    # sport/coach filters go through the player's sport profiles (rows are not per sport)
+    via_profiles: bool = False
+    ordering: tuple = ("pk",)
+
+
+DATASETS = {
+    "session-attendance": Dataset(
+        SessionAttendance,
+        {
+            "id": "id",
+            "session_id": "session_id",
+            "session_date": "session__session_date",
+            "session_title": "session__title",
+            "sport": "session__sport__name",
+            "coach_id": "session__coach__coach_id",
+            "coach": "session__coach__user__username",
+            "team": "session__team__name",
+            "player_id": "player__player_id",
+            "player": "player__user__username",
+            "attended": "attended",
+            "rating": "rating",
+        },
+        {"sport": "session__sport", "coach": "session__coach", "date": "session__session_date__date"},
+    ),
+    "daily-performance": Dataset(
+        DailyPerformanceScore,
+        {
+            "id": "id",
+            "date": "date",
+            "player_id": "player__player_id",
+            "player": "player__user__username",
+            "score": "score",
+        },
+        {"sport": "sport", "coach": "coach", "date": "date"},
+        via_profiles=True,
+    ),
+    "match-stats": Dataset(
+        MatchPlayerStats,
+        {
+            "id": "id",
+            "match_id": "match_id",
+            "match_number": "match__match_number",
+            "match_date": "match__date",
+            "tournament_id": "match__tournament_id",
+            "tournament": "match__tournament__name",
+            "sport": "match__tournament__sport__name",
+            "team": "team__name",
+            "player_id": "player__player_id",
+            "player": "player__user__username",
+            "runs_scored": "runs_scored",
+            "balls_faced": "balls_faced",
+            "fours": "fours",
+            "sixes": "sixes",
+            "is_out": "is_out",
+            "dismissal_type": "dismissal_type",
+            "overs_bowled": "overs_bowled",
+            "runs_conceded": "runs_conceded",
+            "wickets_taken": "wickets_taken",
+            "maidens": "maidens",
+            "wides": "wides",
+            "no_balls": "no_balls",
+            "catches": "catches",
+            "stumpings": "stumpings",
+            "run_outs": "run_outs",
+        },
+        {
+            "sport": "match__tournament__sport",
+            "coach": "team__coach",
+            "tournament": "match__tournament",
+            "date": "match__date__date",
+        },
+    ),
+}
+
+
+def _dataset(name):
+    try:
+        return DATASETS[name]
+    except KeyError:
+        raise ExportError(f"Unknown dataset '{name}'. Choose from: {', '.join(DATASETS)}")
+
+
+def export_queryset(name, filters=None, sports=None):
+    """values_list() queryset of dataset `name`, filtered.
+
+    `filters` maps names from FILTERS to ids or dates; `sports`, when given,
+    restricts rows to those sports (ids or a values() subquery).
+    """
+    dataset = _dataset(name)
+    filters = {key: value for key, value in (filters or {}).items() if value is not None}
+    unsupported = sorted(key for key in filters if ("date" if key.startswith("date_") else key) not in dataset.lookups)
+    if unsupported:
+        raise ExportError(f"'{name}' cannot be filtered by {', '.join(unsupported)}")
+
+    qs = dataset.model.objects.all()
+    if "date_from" in filters:
+        qs = qs.filter(**{f"{dataset.lookups['date']}__gte": filters["date_from"]})
+    if "date_to" in filters:
+        qs = qs.filter(**{f"{dataset.lookups['date']}__lte": filters["date_to"]})
+    scope = {dataset.lookups[key]: filters[key] for key in ("sport", "coach", "tournament") if key in filters}
+    if sports is not None:
+        scope[f"{dataset.lookups['sport']}__in"] = sports
+    if scope and dataset.via_profiles:
+        qs = qs.filter(player_id__in=PlayerSportProfile.objects.filter(**scope).values("player_id"))
+    elif scope:
+        qs = qs.filter(**scope)
+    return qs.order_by(*dataset.ordering).values_list(*dataset.columns.values())
+
+
+def export_rows(name, filters=None, sports=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """(header, row iterator) for dataset `name`; rows are fetched `chunk_size` at a time."""
+    header = list(_dataset(name).columns)
+    return header, export_queryset(name, filters, sports).iterator(chunk_size=chunk_size)
+
+
+class _Echo:
+    """File-like object whose write() returns the line, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_lines(header, rows):
+    writer = csv.writer(_Echo(), lineterminator="\n")
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def _ndjson_lines(header, rows):
+    encoder = DjangoJSONEncoder(separators=(",", ":"))
+    for row in rows:
+        yield encoder.encode(dict(zip(header, row))) + "\n"
+
+
+def _chunks(lines):
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= LINES_PER_CHUNK:
+            yield "".join(chunk)
+            chunk = []
+    if chunk:
+        yield "".join(chunk)
+
+
+def encode(fmt, header, rows):
+    """Iterator of `rows` encoded as `fmt`, in strings of up to LINES_PER_CHUNK lines."""
+    if fmt not in FORMATS:
+        raise ExportError(f"Unknown format '{fmt}'. Choose from: {', '.join(FORMATS)}")
+    return _chunks((_csv_lines if fmt == "csv" else _ndjson_lines)(header, rows))
@@ -0,0 +1,229 @@
+# backend/core/services/fixtures.py
+"""Fixture generation for tournaments.
+
+Three formats build on the registered TournamentTeam rows (in registration
+order, which doubles as seeding):
+
+- ``round_robin``: every team plays every other team once (circle method);
+- ``groups``: teams are snake-seeded into groups that each play a round robin;
+- ``knockout``: single elimination. The first call seeds round 1 from all
+  teams, from the top ``qualifiers`` of a finished league, or from the top
+  ``qualifiers`` of every finished group; each later call creates the next
+  round from the previous round's winners.
+
+Byes go to the top seeds when the field is not a power of two. The seeded
+first round is kept on ``Tournament.bracket`` so later rounds can be paired
+in bracket order. Every call inserts its matches with one bulk_create.
+"""
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from ..models import TournamentMatch, TournamentPoints, TournamentTeam
+from .versions import bump
+
+
+FORMATS = ("round_robin", "groups", "knockout")
+
+
+class FixtureError(Exception):
+    pass
+
+
+def round_robin_rounds(teams):
+    """Split all-play-all pairings into rounds in which no team plays twice."""
+    teams = list(teams)
+    if len(teams) % 2:
+        teams.append(None)
+    rounds = []
+    for number in range(len(teams) - 1):
+        half = len(teams) // 2
+        pairs = [(teams[i], teams[-1 - i]) for i in range(half)]
+        if number % 2:
+            # Alternate the fixed team's home/away side
+            pairs[0] = pairs[0][::-1]
+        rounds.append([pair for pair in pairs if None not in pair])
+        teams = [teams[0], teams[-1]] + teams[1:-1]
+    return rounds
+
+
+def snake_groups(teams, count):
+    groups = [[] for _ in range(count)]
+    for index, team in enumerate(teams):
+        lap, offset = divmod(index, count)
+        groups[offset if lap % 2 == 0 else count - 1 - offset].append(team)
+    return groups
+
+
+def group_label(index):
+    return chr(ord("A") + index) if index < 26 else str(index + 1)
+
+
+def bracket_order(size):
+    """Seed numbers (1-based) in bracket slot order, e.g. 8 -> 1, 8, 4, 5, 2, 7, 3, 6."""
+    order = [1]
+    while len(order) < size:
+        order = [seed for top in order for seed in (top, 2 * len(order) + 1 - top)]
+    return order
+
+
+def seed_bracket(seeds):
+    """First knockout round as [team, team or None] slots; None is a bye."""
+    size = 1
+    while size < len(seeds):
+        size *= 2
+    order = bracket_order(size)
+    return [
+        [seeds[order[i] - 1], seeds[order[i + 1] - 1] if order[i + 1] <= len(seeds) else None]
+        for i in range(0, size, 2)
+    ]
+
+
+def match_winner(match):
+    if not match.is_completed:
+        raise FixtureError(f"Match {match.match_number} is not completed")
+    if match.score_team1 == match.score_team2:
+        raise FixtureError(f"Match {match.match_number} has no winner")
+    return match.team1_id if match.score_team1 > match.score_team2 else match.team2_id
+
+
+class Scheduler:
+    """Builds and bulk-inserts the fixtures for one tournament."""
+
+    def __init__(self, tournament, start=None, interval_days=1, location=None):
+        self.tournament = tournament
+        self.interval = timedelta(days=interval_days)
+        self.location = location
+        existing = TournamentMatch.objects.filter(tournament=tournament).aggregate(
+            number=Max("match_number"), date=Max("date")
+        )
+        self.next_number = (existing["number"] or 0) + 1
+        if start is None and existing["date"]:
+            # Follow on from the fixtures already scheduled
+            start = existing["date"] + self.interval
+        self.start = start or tournament.start_date or timezone.now()
+        self.matches = []
+
+    def add(self, team1, team2, round_number, day=None, **fields):
+        """Queue a match; it is played `day` intervals after the start (default: one round per interval)."""
+        self.matches.append(TournamentMatch(
+            tournament=self.tournament,
+            team1_id=team1,
+            team2_id=team2,
+            match_number=self.next_number,
+            date=self.start + self.interval * (round_number - 1 if day is None else day),
+            location=self.location,
+            round_number=round_number,
+            **fields,
+        ))
+        self.next_number += 1
+
+    def save(self):
+        matches = TournamentMatch.objects.bulk_create(self.matches)
+        # bulk_create skips the signals that version the points table's match counts
+        bump(("tournament", self.tournament.pk))
+        return matches
+
+
+def _team_ids(tournament):
+    teams = list(
+        TournamentTeam.objects.filter(tournament=tournament).order_by("registered_at", "id").values_list("team_id", flat=True)
+    )
+    if len(teams) < 2:
+        raise FixtureError("At least two teams are required")
+    return teams
+
+
+def _standings(tournament, team_ids):
+    ranked = list(
+        TournamentPoints.objects.filter(tournament=tournament, team_id__in=team_ids)
+        .order_by("-points", "-net_run_rate").values_list("team_id", flat=True)
+    )
+    # Teams without a points row rank last, in seeding order
+    return ranked + [team for team in team_ids if team not in ranked]
+
+
+def _knockout_seeds(tournament, matches, qualifiers):
+    if any(not match.is_completed for match in matches):
+        raise FixtureError("All league and group matches must be completed first")
+    seeds = []
+    if any(match.stage == TournamentMatch.Stage.GROUP for match in matches):
+        groups = {}
+        for match in matches:
+            teams = groups.setdefault(match.group_name, [])
+            teams.extend(team for team in (match.team1_id, match.team2_id) if team not in teams)
+        tables = [_standings(tournament, groups[name])[:qualifiers] for name in sorted(groups)]
+        # Group winners first, then runners-up, ... so groups cross over in round 1
+        for place in range(qualifiers):
+            seeds.extend(table[place] for table in tables if place < len(table))
+    else:
+        teams = {team for match in matches for team in (match.team1_id, match.team2_id)}
+        seeds = _standings(tournament, [team for team in _team_ids(tournament) if team in teams])[:qualifiers]
+    return seeds
+
+
+@transaction.atomic
+def generate_fixtures(tournament, fmt, groups=2, qualifiers=None, **options):
+    """Create the next batch of fixtures for `tournament`; returns the created matches."""
+    if fmt not in FORMATS:
+        raise FixtureError(f"format must be one of {', '.join(FORMATS)}")
+    matches = list(TournamentMatch.objects.filter(tournament=tournament).order_by("match_number"))
+    knockout = [match for match in matches if match.stage == TournamentMatch.Stage.KNOCKOUT]
+    scheduler = Scheduler(tournament, **options)
+
+    if fmt in ("round_robin", "groups"):
+        if matches:
+            raise FixtureError("Fixtures already exist for this tournament")
+        teams = _team_ids(tournament)
+        if fmt == "round_robin":
+            for number, pairs in enumerate(round_robin_rounds(teams), start=1):
+                for team1, team2 in pairs:
+                    scheduler.add(team1, team2, number, stage=TournamentMatch.Stage.LEAGUE)
+        else:
+            if groups < 1 or len(teams) < 2 * groups:
+                raise FixtureError("Each group needs at least two teams")
+            for index, members in enumerate(snake_groups(teams, groups)):
+                for number, pairs in enumerate(round_robin_rounds(members), start=1):
+                    for team1, team2 in pairs:
+                        scheduler.add(
+                            team1, team2, number, stage=TournamentMatch.Stage.GROUP, group_name=group_label(index)
+                        )
+        return scheduler.save()
+
+    if not knockout:
+        if matches:
+            seeds = _knockout_seeds(tournament, matches, qualifiers or 2)
+        else:
+            seeds = _team_ids(tournament)[:qualifiers] if qualifiers else _team_ids(tournament)
+        if len(seeds) < 2:
+            raise FixtureError("At least two teams must qualify for the knockout")
+        tournament.bracket = seed_bracket(seeds)
+        tournament.save(update_fields=["bracket"])
+        for slot, (team1, team2) in enumerate(tournament.bracket):
+            if team2 is not None:
+                scheduler.add(team1, team2, 1, stage=TournamentMatch.Stage.KNOCKOUT, bracket_slot=slot)
+        return scheduler.save()
+
+    if not tournament.bracket:
+        raise FixtureError("Knockout matches exist without a seeded bracket")
+    last_round = max(match.round_number for match in knockout)
+    played = {match.bracket_slot: match for match in knockout if match.round_number == last_round}
+    slots = len(tournament.bracket) >> (last_round - 1)
+    if slots == 1:
+        raise FixtureError("The knockout is already complete")
+    winners = []
+    for slot in range(slots):
+        if slot in played:
+            winners.append(match_winner(played[slot]))
+        elif last_round == 1 and tournament.bracket[slot][1] is None:
+            winners.append(tournament.bracket[slot][0])
+        else:
+            raise FixtureError(f"Round {last_round} is missing the match for bracket slot {slot}")
+    for slot in range(0, slots, 2):
+        scheduler.add(
+            winners[slot], winners[slot + 1], last_round + 1, day=0,
+            stage=TournamentMatch.Stage.KNOCKOUT, bracket_slot=slot // 2,
+        )
+    return scheduler.save()
@@ -0,0 +1,305 @@
+# backend/core/services/live_scoring.py
+"""Optional write-behind engine for ball-by-ball cricket scoring.
+
+With ``LIVE_SCORING_ENABLED`` on, ``add_score``/``add_wicket`` apply each
+delivery to an in-memory copy of the match (its CricketMatchState and
+MatchPlayerStats rows) instead of writing through to the database:
+
+- every delivery is first appended to a per-match journal file and fsync'd,
+  so an acknowledged ball survives a crash;
+- dirty state is flushed in one transaction at every over boundary, when
+  ``LIVE_SCORING_FLUSH_SECONDS`` have passed, and on process exit; the
+  journal is truncated once the flush commits;
+- on (re)load, journal entries newer than ``CricketMatchState.ball_seq`` are
+  replayed on top of the database copy, so a crash between commit and
+  truncation cannot double-count a ball.
+
+State lives in the worker process, so scoring traffic for a match must reach
+a single process (one scoring worker, or sticky routing by match).
+"""
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from ..models import CricketMatchState, MatchPlayerStats, Player, PlayerSportProfile, TournamentMatch
+from .scoring import score_runs, take_wicket
+
+
+logger = logging.getLogger(__name__)
+
+STATE_FIELDS = [
+    "batsman1", "batsman2", "current_striker", "current_over", "current_ball", "total_balls_bowled",
+    "ball_seq", "team1_runs", "team1_wickets", "team2_runs", "team2_wickets", "updated_at",
+]
+STATS_FIELDS = [
+    "runs_scored", "balls_faced", "fours", "sixes", "is_out", "runs_conceded", "wickets_taken", "overs_bowled",
+    "legal_balls", "dismissed_by", "fall_of_wicket_number", "fall_of_wicket_score", "fall_of_wicket_ball",
+]
+MATCH_FIELDS = ["score_team1", "score_team2", "wickets_team1", "wickets_team2"]
+
+# Everything CricketMatchStateSerializer walks, so live responses need no queries
+STATE_RELATED = [
+    f"{team}{suffix}"
+    for team in ("toss_won_by", "batting_first", "current_batting_team", "current_bowling_team")
+    for suffix in ("", "__coach__user", "__manager", "__sport")
+] + [f"{player}__user" for player in ("batsman1", "batsman2", "current_striker", "current_bowler")]
+
+
+class LiveScoringError(Exception):
+    pass
+
+
+class LiveMatch:
+    """In-memory copy of one in-progress match."""
+
+    def __init__(self, match, state, stats, squads):
+        self.match = match
+        self.state = state
+        self.stats = stats  # player_id -> MatchPlayerStats
+        self.squads = squads  # team_id -> {player_id: Player}
+        self.dirty_stats = set()
+        self.dirty = False
+        self.last_flush = time.monotonic()
+        self.lock = threading.Lock()
+        self.journal = None
+
+
+class LiveScoringEngine:
+    def __init__(self, journal_dir, flush_seconds):
+        self.journal_dir = str(journal_dir)
+        self.flush_seconds = flush_seconds
+        self._matches = {}
+        self._lock = threading.Lock()
+        self._flusher = None
+        os.makedirs(self.journal_dir, exist_ok=True)
+
+    # -- public API ------------------------------------------------------
+
+    def get(self, match_id):
+        """The live copy of an in-progress match, loading (and replaying its journal) on first use."""
+        match_id = int(match_id)
+        with self._lock:
+            live = self._matches.get(match_id)
+            if live is None:
+                live = self._load(match_id)
+                self._matches[match_id] = live
+        return live
+
+    def record_runs(self, live, runs):
+        with live.lock:
+            state = live.state
+            if not state.current_striker_id or not state.current_bowler_id:
+                raise LiveScoringError("Batsman and bowler must be set")
+            self._commit_event(live, {"type": "runs", "runs": runs})
+        return live
+
+    def record_wicket(self, live, next_batsman_id):
+        with live.lock:
+            state = live.state
+            if not state.current_striker_id:
+                raise LiveScoringError("No batsman on strike")
+            if next_batsman_id not in live.squads.get(state.current_batting_team_id, {}):
+                if not Player.objects.filter(id=next_batsman_id).exists():
+                    raise Player.DoesNotExist
+                raise LiveScoringError("Next batsman must be in batting team")
+            self._commit_event(live, {"type": "wicket", "next_batsman_id": next_batsman_id})
+        return live
+
+    def flush(self, match_id):
+        """Write a match's dirty state to the database (no-op if not loaded or clean)."""
+        live = self._matches.get(int(match_id))
+        if live is not None:
+            with live.lock:
+                self._flush(live)
+
+    def release(self, match_id):
+        """Flush and forget a match so the database copy becomes authoritative again."""
+        with self._lock:
+            live = self._matches.pop(int(match_id), None)
+        if live is not None:
+            with live.lock:
+                self._flush(live)
+                self._close_journal(live, remove=True)
+
+    def flush_due(self):
+        now = time.monotonic()
+        for live in list(self._matches.values()):
+            if live.dirty and now - live.last_flush >= self.flush_seconds:
+                with live.lock:
+                    self._flush(live)
+
+    def flush_all(self):
+        for live in list(self._matches.values()):
+            try:
+                with live.lock:
+                    self._flush(live)
+            except Exception:
+                # The journal still holds these deliveries; they replay on next load
+                logger.exception("Could not flush live state for match %s", live.match.pk)
+
+    def start(self):
+        """Start the periodic flusher thread (no-op when LIVE_SCORING_FLUSH_SECONDS is 0)."""
+        if self.flush_seconds and self._flusher is None:
+            self._flusher = threading.Thread(target=self._flush_loop, name="live-scoring-flush", daemon=True)
+            self._flusher.start()
+
+    # -- internals -------------------------------------------------------
+
+    def _journal_path(self, match_id):
+        return os.path.join(self.journal_dir, f"match_{match_id}.jsonl")
+
+    def _load(self, match_id):
+        match = TournamentMatch.objects.select_related("tournament__sport", "team1", "team2").get(pk=match_id)
+        if match.status != TournamentMatch.Status.IN_PROGRESS:
+            raise LiveScoringError("Match not in progress")
+        try:
+            state = CricketMatchState.objects.select_related(*STATE_RELATED).get(match=match)
+        except CricketMatchState.DoesNotExist:
+            raise LiveScoringError("Match not in progress")
+
+        stats = {stat.player_id: stat for stat in MatchPlayerStats.objects.filter(match=match)}
+        squads = {match.team1_id: {}, match.team2_id: {}}
+        for profile in PlayerSportProfile.objects.filter(
+            team_id__in=squads, sport=match.tournament.sport, is_active=True
+        ).select_related("player__user"):
+            squads[profile.team_id][profile.player_id] = profile.player
+
+        live = LiveMatch(match, state, stats, squads)
+        self._replay(live)
+        return live
+
+    def _replay(self, live):
+        path = self._journal_path(live.match.pk)
+        replayed = 0
+        if os.path.exists(path):
+            with open(path, "rb") as fh:
+                for raw in fh:
+                    try:
+                        event = json.loads(raw)
+                    except ValueError:
+                        # Torn final write from a crash: the ball was never acknowledged
+                        break
+                    if event["seq"] <= live.state.ball_seq:
+                        continue
+                    self._apply(live, event)
+                    replayed += 1
+        if replayed:
+            logger.warning("Replayed %d journaled deliveries for match %s", replayed, live.match.pk)
+        # Checkpoint so the journal only ever holds unflushed deliveries
+        self._flush(live)
+        live.journal = open(path, "w")
+
+    def _commit_event(self, live, event):
+        event["seq"] = live.state.ball_seq + 1
+        if live.journal is None:
+            live.journal = open(self._journal_path(live.match.pk), "a")
+        live.journal.write(json.dumps(event) + "\n")
+        live.journal.flush()
+        os.fsync(live.journal.fileno())
+
+        over_complete = self._apply(live, event)
+        overdue = self.flush_seconds and time.monotonic() - live.last_flush >= self.flush_seconds
+        if over_complete or overdue:
+            # The ball is journaled and applied; failing the request now would make a retry count it twice
+            try:
+                self._flush(live)
+            except Exception:
+                logger.exception("Could not flush live state for match %s", live.match.pk)
+
+    def _apply(self, live, event):
+        state = live.state
+        striker = self._stats_for(live, state.current_striker_id, state.current_batting_team_id)
+        if event["type"] == "runs":
+            bowler = self._stats_for(live, state.current_bowler_id, state.current_bowling_team_id)
+            over_complete = score_runs(live.match, state, striker, bowler, event["runs"])
+        else:
+            bowler = None
+            if state.current_bowler_id:
+                bowler = self._stats_for(live, state.current_bowler_id, state.current_bowling_team_id)
+            next_batsman = live.squads.get(state.current_batting_team_id, {}).get(event["next_batsman_id"])
+            if next_batsman is None:
+                next_batsman = Player.objects.select_related("user").get(id=event["next_batsman_id"])
+            over_complete = take_wicket(live.match, state, striker, bowler, next_batsman)
+        live.dirty_stats.add(striker.player_id)
+        if bowler is not None:
+            live.dirty_stats.add(bowler.player_id)
+        live.dirty = True
+        return over_complete
+
+    def _stats_for(self, live, player_id, team_id):
+        stat = live.stats.get(player_id)
+        if stat is None:
+            stat, _ = MatchPlayerStats.objects.get_or_create(
+                match=live.match, player_id=player_id, defaults={"team_id": team_id}
+            )
+            live.stats[player_id] = stat
+        return stat
+
+    def _flush(self, live):
+        if not live.dirty:
+            return
+        with transaction.atomic():
+            MatchPlayerStats.objects.bulk_update([live.stats[pid] for pid in live.dirty_stats], STATS_FIELDS)
+            live.state.save(update_fields=STATE_FIELDS)
+            TournamentMatch.objects.filter(pk=live.match.pk).update(
+                **{field: getattr(live.match, field) for field in MATCH_FIELDS}
+            )
+        live.dirty_stats.clear()
+        live.dirty = False
+        live.last_flush = time.monotonic()
+        if live.journal is not None:
+            live.journal.seek(0)
+            live.journal.truncate()
+            live.journal.flush()
+            os.fsync(live.journal.fileno())
+
+    def _close_journal(self, live, remove=False):
+        if live.journal is not None:
+            live.journal.close()
+            live.journal = None
+        if remove:
+            try:
+                os.remove(self._journal_path(live.match.pk))
+            except FileNotFoundError:
+                pass
+
+    def _flush_loop(self):
+        while True:
+            time.sleep(self.flush_seconds)
+            try:
+                self.flush_due()
+            except Exception:
+                logger.exception("Periodic live-scoring flush failed")
+            finally:
+                close_old_connections()
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def _flush_on_exit():
+    if _engine is not None:
+        _engine.flush_all()
+
+
+atexit.register(_flush_on_exit)
+
+
+def get_engine():
+    """The process-wide engine, or None when LIVE_SCORING_ENABLED is off."""
+    global _engine
+    if not getattr(settings, "LIVE_SCORING_ENABLED", False):
+        return None
+    with _engine_lock:
+        journal_dir = str(settings.LIVE_SCORING_JOURNAL_DIR)
+        if _engine is None or _engine.journal_dir != journal_dir:
+            _engine = LiveScoringEngine(journal_dir, settings.LIVE_SCORING_FLUSH_SECONDS)
+            _engine.start()
+    return _engine
@@ -0,0 +1,109 @@
+# backend/core/services/performance.py
+"""Session-rating performance series for the player dashboard.
+
+The running average of a player's session ratings, per sport, is computed in
+one query with window functions: each row carries its position, the average
+of every rating up to it, and its sport's attendance totals. Long series are
+downsampled on the server to at most N points, either with
+Largest-Triangle-Three-Buckets (``lttb``, keeps the visual shape) or as
+equal-size bucket means (``bucket``).
+"""
+from django.db.models import Avg, Case, Count, F, FloatField, IntegerField, Sum, Value, When, Window
+from django.db.models.expressions import RowRange
+from django.db.models.functions import Cast, Least, RowNumber
+
+from ..models import SessionAttendance
+
+
+MAX_RATING = 10
+DEFAULT_SERIES_POINTS = 200
+DOWNSAMPLERS = ("lttb", "bucket")
+
+
+def _windows(partition_by):
+    order = [F("session__session_date").asc(), F("id").asc()]
+    rating = Cast(Least(F("rating"), Value(MAX_RATING)), FloatField())
+    attended = Case(When(attended=True, then=Value(1)), default=Value(0), output_field=IntegerField())
+    return {
+        "position": Window(RowNumber(), partition_by=partition_by, order_by=order),
+        "running_average": Window(
+            Avg(rating), partition_by=partition_by, order_by=order, frame=RowRange(start=None, end=0)
+        ),
+        "total_sessions": Window(Count("id"), partition_by=partition_by),
+        "attended_sessions": Window(Sum(attended), partition_by=partition_by),
+    }
+
+
+def rating_summaries(player_id, per_sport=True):
+    """{sport id: {"series": [(index, running average)], "attendance": {...}}} for a player.
+
+    With `per_sport` False every session counts toward one summary, keyed None.
+    """
+    partition_by = [F("session__sport")] if per_sport else None
+    rows = (
+        SessionAttendance.objects.filter(player_id=player_id)
+        .annotate(**_windows(partition_by))
+        .order_by(*(["session__sport", "position"] if per_sport else ["position"]))
+        .values_list("session__sport", "position", "running_average", "total_sessions", "attended_sessions")
+    )
+    summaries = {}
+    for sport_id, position, average, total, attended in rows:
+        key = sport_id if per_sport else None
+        summary = summaries.setdefault(key, {
+            "series": [],
+            "attendance": {"total_sessions": total, "attended": attended or 0},
+        })
+        summary["series"].append((position, average))
+    return summaries
+
+
+def lttb(points, threshold):
+    """Largest-Triangle-Three-Buckets: at most `threshold` of the (x, y) `points`, keeping the ends."""
+    n = len(points)
+    if threshold >= n:
+        return list(points)
+    if threshold <= 2:
+        return [points[0], points[-1]][:threshold]
+    sampled = [points[0]]
+    every = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        # Average of the next bucket is the third corner of the triangle
+        next_start, next_end = int((i + 1) * every) + 1, min(int((i + 2) * every) + 1, n)
+        next_bucket = points[next_start:next_end]
+        avg_x = sum(x for x, _ in next_bucket) / len(next_bucket)
+        avg_y = sum(y for _, y in next_bucket) / len(next_bucket)
+        ax, ay = points[a]
+        best, best_area = None, -1.0
+        for j in range(int(i * every) + 1, int((i + 1) * every) + 1):
+            x, y = points[j]
+            area = abs((ax - avg_x) * (y - ay) - (ax - x) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        sampled.append(points[best])
+        a = best
+    sampled.append(points[-1])
+    return sampled
+
+
+def bucket_means(points, buckets):
+    """`points` cut into at most `buckets` equal runs, each reduced to (last x, mean y)."""
+    n = len(points)
+    if buckets >= n:
+        return list(points)
+    reduced = []
+    for b in range(buckets):
+        run = points[b * n // buckets:(b + 1) * n // buckets]
+        reduced.append((run[-1][0], sum(y for _, y in run) / len(run)))
+    return reduced
+
+
+def downsample(points, limit, method="lttb"):
+    """At most `limit` points (0 keeps them all)."""
+    if not limit or len(points) <= limit:
+        return list(points)
+    return lttb(points, limit) if method == "lttb" else bucket_means(points, limit)
+
+
+def series_payload(points):
+    return [{"index": index, "average": round(average, 2)} for index, average in points]
@@ -0,0 +1,140 @@
+# backend/core/services/rollups.py
+"""Daily performance scores and their weekly and monthly rollups.
+
+``recompute_daily_scores`` sets the DailyPerformanceScore of a batch of
+(player, day) pairs from their attended session ratings in one grouped query
+and one bulk upsert.
+
+A changed daily score marks its (player, week) and (player, month) in
+PerformanceRollupQueue (``mark_dirty``; ``core.signals`` does it on save and
+delete, bulk writers call it themselves). ``roll_up_performance`` then
+rebuilds only the queued buckets: one grouped query per period averages the
+daily scores of every queued bucket, and the affected PerformanceScore /
+MonthlyPerformanceScore rows are replaced in bulk. Trend charts read those
+rows, a few dozen per player, instead of the daily history.
+
+Run it from a scheduler (``manage.py roll_up_performance``); marks made
+while it runs are kept for the next run.
+"""
+import datetime
+
+from django.db import transaction
+from django.db.models import Avg, Count, Exists, OuterRef
+from django.db.models.functions import TruncDate, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from ..models import (
+    DailyPerformanceScore, MonthlyPerformanceScore, PerformanceRollupQueue, PerformanceScore, SessionAttendance,
+)
+
+
+Period = PerformanceRollupQueue.Period
+
+# period -> (rollup model, its bucket field, truncation of a daily score's date)
+PERIODS = {
+    Period.WEEK: (PerformanceScore, "week_start", TruncWeek),
+    Period.MONTH: (MonthlyPerformanceScore, "month_start", TruncMonth),
+}
+
+
+def week_start(day):
+    return day - datetime.timedelta(days=day.weekday())
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def mark_dirty(player_days):
+    """Queue the weeks and months of (player id, date) pairs for the next rollup."""
+    now = timezone.now()
+    marks = {
+        (player_id, period, start)
+        for player_id, day in player_days
+        for period, start in ((Period.WEEK, week_start(day)), (Period.MONTH, month_start(day)))
+    }
+    PerformanceRollupQueue.objects.bulk_create(
+        [
+            PerformanceRollupQueue(player_id=player_id, period=period, period_start=start, marked_at=now)
+            for player_id, period, start in marks
+        ],
+        update_conflicts=True,
+        unique_fields=["player", "period", "period_start"],
+        update_fields=["marked_at"],
+    )
+
+
+def recompute_daily_scores(player_days):
+    """Set the daily score of each (player id, date) pair to the mean rating of its attended sessions.
+
+    Pairs without an attended session score 0. Their rollups are marked dirty.
+    """
+    player_days = set(player_days)
+    if not player_days:
+        return
+    averages = {
+        (row["player"], row["day"]): row["average"]
+        for row in SessionAttendance.objects.filter(
+            player__in={player_id for player_id, _ in player_days},
+            session__session_date__date__in={day for _, day in player_days},
+            attended=True,
+        )
+        .annotate(day=TruncDate("session__session_date"))
+        .values("player", "day")
+        .annotate(average=Avg("rating"))
+        .order_by()
+    }
+    DailyPerformanceScore.objects.bulk_create(
+        [
+            DailyPerformanceScore(player_id=player_id, date=day, score=float(averages.get((player_id, day)) or 0.0))
+            for player_id, day in player_days
+        ],
+        update_conflicts=True,
+        unique_fields=["player", "date"],
+        update_fields=["score", "updated_at"],
+    )
+    mark_dirty(player_days)
+
+
+def _queued(queue, period, field):
+    """Exists() over `queue` entries of `period` for the row's player and `field` bucket."""
+    return Exists(queue.filter(period=period, player=OuterRef("player"), period_start=OuterRef(field)))
+
+
+@transaction.atomic
+def roll_up_performance(batch_size=1000):
+    """Rebuild the queued weekly and monthly buckets. Returns {period: buckets written}."""
+    queue = PerformanceRollupQueue.objects.filter(marked_at__lte=timezone.now())
+    written = {}
+    for period, (model, field, trunc) in PERIODS.items():
+        rows = (
+            DailyPerformanceScore.objects.annotate(bucket=trunc("date"))
+            .filter(_queued(queue, period, "bucket"))
+            .values("player", "bucket")
+            .annotate(average=Avg("score"), days=Count("id"))
+            .order_by()
+        )
+        buckets = [
+            model(player_id=row["player"], score=row["average"], days=row["days"], **{field: row["bucket"]})
+            for row in rows
+        ]
+        # Replacing the queued buckets also drops those whose daily scores are gone
+        model.objects.filter(_queued(queue, period, field)).delete()
+        model.objects.bulk_create(buckets, batch_size=batch_size)
+        written[period] = len(buckets)
+    queue.delete()
+    return written
+
+
+def performance_trend(player_id, period=Period.WEEK, start=None, end=None):
+    """[{"period_start", "score", "days"}] oldest first, for buckets starting within [start, end]."""
+    model, field, _ = PERIODS[period]
+    rows = model.objects.filter(player_id=player_id)
+    if start:
+        rows = rows.filter(**{f"{field}__gte": start})
+    if end:
+        rows = rows.filter(**{f"{field}__lte": end})
+    return [
+        {"period_start": bucket, "score": round(score, 2), "days": days}
+        for bucket, score, days in rows.order_by(field).values_list(field, "score", "days")
+    ]
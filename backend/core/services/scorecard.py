@@ -0,0 +1,131 @@
+# backend/core/services/scorecard.py
+"""Compiled match scorecards.
+
+A scorecard (batting and bowling cards, fall of wickets and extras for each
+innings) is built from the match's MatchPlayerStats in one query and cached
+under the version of its CricketMatchState. Every recorded ball bumps that
+version, so all readers between two balls share one compile and the version
+doubles as the ETag.
+"""
+from django.conf import settings
+from django.core.cache import cache
+
+from ..models import MatchPlayerStats
+
+
+def _overs(balls):
+    return f"{balls // 6}.{balls % 6}"
+
+
+def _player(player):
+    return {"id": player.id, "player_id": player.player_id, "username": player.user.username}
+
+
+def _team(team):
+    return {"id": team.id, "name": team.name}
+
+
+def scorecard_version(match, state):
+    """Opaque token that changes whenever the compiled scorecard would."""
+    return f"{match.pk}.{state.ball_seq}.{int(state.updated_at.timestamp() * 1_000_000)}.{match.status}"
+
+
+def _innings(number, batting_team, bowling_team, runs, wickets, stats):
+    batting = [row for row in stats if row.team_id == batting_team.id and (row.balls_faced or row.is_out)]
+    bowling = [
+        row for row in stats
+        if row.team_id == bowling_team.id and (row.legal_balls or row.runs_conceded or row.wides or row.no_balls)
+    ]
+    bat_runs = sum(row.runs_scored for row in batting)
+    wides = sum(row.wides for row in bowling)
+    no_balls = sum(row.no_balls for row in bowling)
+    # Wides are not balls faced; no-balls are, but do not count toward the over
+    balls = sum(row.balls_faced for row in batting) - no_balls
+    extras = max(runs - bat_runs, 0)
+    return {
+        "number": number,
+        "batting_team": _team(batting_team),
+        "bowling_team": _team(bowling_team),
+        "runs": runs,
+        "wickets": wickets,
+        "overs": _overs(max(balls, 0)),
+        "batting": [
+            {
+                "player": _player(row.player),
+                "runs": row.runs_scored,
+                "balls": row.balls_faced,
+                "fours": row.fours,
+                "sixes": row.sixes,
+                "strike_rate": round(row.runs_scored * 100 / row.balls_faced, 2) if row.balls_faced else 0.0,
+                "is_out": row.is_out,
+                "dismissal_type": row.dismissal_type,
+                "bowler": _player(row.dismissed_by) if row.dismissed_by_id else None,
+            }
+            for row in batting
+        ],
+        "bowling": [
+            {
+                "player": _player(row.player),
+                "overs": _overs(row.legal_balls),
+                "maidens": row.maidens,
+                "runs": row.runs_conceded,
+                "wickets": row.wickets_taken,
+                "economy": round(row.runs_conceded * 6 / row.legal_balls, 2) if row.legal_balls else 0.0,
+                "wides": row.wides,
+                "no_balls": row.no_balls,
+            }
+            for row in bowling
+        ],
+        "fall_of_wickets": [
+            {
+                "wicket": row.fall_of_wicket_number,
+                "score": row.fall_of_wicket_score,
+                "overs": _overs(row.fall_of_wicket_ball) if row.fall_of_wicket_ball else None,
+                "player": _player(row.player),
+            }
+            for row in sorted(
+                (row for row in batting if row.fall_of_wicket_number), key=lambda row: row.fall_of_wicket_number
+            )
+        ],
+        # Byes, leg byes and runs taken off wides are not credited to a batsman or counted per bowler
+        "extras": {"total": extras, "wides": wides, "no_balls": no_balls, "other": max(extras - wides - no_balls, 0)},
+    }
+
+
+def compile_scorecard(match, state):
+    """Scorecard dict for a started match; `match` must have team1/team2 loaded."""
+    stats = list(
+        MatchPlayerStats.objects.filter(match=match)
+        .select_related("player__user", "dismissed_by__user")
+        .order_by("id")
+    )
+    first = match.team2 if state.batting_first_id == match.team2_id else match.team1
+    second = match.team1 if first is match.team2 else match.team2
+    totals = {
+        match.team1_id: (state.team1_runs, state.team1_wickets),
+        match.team2_id: (state.team2_runs, state.team2_wickets),
+    }
+    innings = []
+    for number, (batting, bowling) in enumerate(((first, second), (second, first)), start=1):
+        started = state.current_batting_team_id == batting.id or any(
+            row.team_id == batting.id and (row.balls_faced or row.is_out) for row in stats
+        )
+        if started:
+            innings.append(_innings(number, batting, bowling, *totals[batting.id], stats))
+    return {
+        "match_id": match.pk,
+        "status": match.status,
+        "ball_seq": state.ball_seq,
+        "current_batting_team": state.current_batting_team_id,
+        "innings": innings,
+    }
+
+
+def cached_scorecard(match, state, version=None):
+    version = version or scorecard_version(match, state)
+    key = f"scorecard:{version}"
+    scorecard = cache.get(key)
+    if scorecard is None:
+        scorecard = compile_scorecard(match, state)
+        cache.set(key, scorecard, settings.SCORECARD_CACHE_SECONDS)
+    return scorecard
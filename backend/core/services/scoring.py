@@ -0,0 +1,135 @@
+# backend/core/services/scoring.py
+"""Ball-by-ball cricket scoring rules.
+
+These functions only mutate in-memory model instances (the match, its
+CricketMatchState and the striker/bowler MatchPlayerStats rows); callers
+decide when and how the result is written. The synchronous scoring views and
+the write-behind live engine both go through them so the rules cannot drift.
+"""
+
+
+EXTRAS = ("wide", "no_ball", "bye", "leg_bye")
+
+
+def _add_team_runs(match, state, runs):
+    if state.current_batting_team_id == match.team1_id:
+        state.team1_runs += runs
+        match.score_team1 = state.team1_runs
+    else:
+        state.team2_runs += runs
+        match.score_team2 = state.team2_runs
+
+
+def _rotate_strike(state, runs, over_complete):
+    # Switch striker on odd runs off the last ball of the over
+    if over_complete and runs % 2 == 1:
+        state.current_striker = state.batsman2 if state.current_striker == state.batsman1 else state.batsman1
+
+
+def _advance_ball(state):
+    """Count one delivery; returns True when it completed the over."""
+    state.current_ball += 1
+    state.total_balls_bowled += 1
+    state.ball_seq += 1
+    if state.current_ball >= 6:
+        state.current_ball = 0
+        state.current_over += 1
+        return True
+    return False
+
+
+def _bowl_legal_ball(bowler_stats):
+    bowler_stats.legal_balls += 1
+    # overs_bowled is kept as balls / 6 for readers of the old field
+    bowler_stats.overs_bowled = bowler_stats.legal_balls / 6.0
+
+
+def score_runs(match, state, striker_stats, bowler_stats, runs):
+    """Apply a delivery worth `runs` (0-6). Returns True if it ended the over."""
+    _add_team_runs(match, state, runs)
+
+    striker_stats.runs_scored += runs
+    striker_stats.balls_faced += 1
+    if runs == 4:
+        striker_stats.fours += 1
+    elif runs == 6:
+        striker_stats.sixes += 1
+
+    bowler_stats.runs_conceded += runs
+    _bowl_legal_ball(bowler_stats)
+
+    over_complete = _advance_ball(state)
+    _rotate_strike(state, runs, over_complete)
+    return over_complete
+
+
+def score_extra(match, state, striker_stats, bowler_stats, kind, runs):
+    """Apply an extra (one of EXTRAS) plus `runs` taken off it. Returns True if it ended the over.
+
+    Wides and no-balls add a one-run penalty and are re-bowled, so they do not
+    count toward the over; byes and leg byes are legal balls not charged to
+    the bowler.
+    """
+    penalty = 1 if kind in ("wide", "no_ball") else 0
+    _add_team_runs(match, state, runs + penalty)
+
+    if kind == "wide":
+        bowler_stats.wides += 1
+    elif kind == "no_ball":
+        bowler_stats.no_balls += 1
+        striker_stats.runs_scored += runs
+        if runs == 4:
+            striker_stats.fours += 1
+        elif runs == 6:
+            striker_stats.sixes += 1
+    if kind != "wide":
+        striker_stats.balls_faced += 1
+    if penalty:
+        bowler_stats.runs_conceded += runs + penalty
+        state.ball_seq += 1
+        return False
+
+    _bowl_legal_ball(bowler_stats)
+    over_complete = _advance_ball(state)
+    _rotate_strike(state, runs, over_complete)
+    return over_complete
+
+
+def take_wicket(match, state, striker_stats, bowler_stats, next_batsman):
+    """Dismiss the striker and bring in `next_batsman`. Returns True if it ended the over.
+
+    `bowler_stats` may be None when no bowler has been set.
+    """
+    striker_stats.is_out = True
+    striker_stats.balls_faced += 1
+
+    if bowler_stats is not None:
+        striker_stats.dismissed_by_id = bowler_stats.player_id
+        bowler_stats.wickets_taken += 1
+        _bowl_legal_ball(bowler_stats)
+
+    if state.current_batting_team_id == match.team1_id:
+        state.team1_wickets += 1
+        match.wickets_team1 = state.team1_wickets
+        striker_stats.fall_of_wicket_number = state.team1_wickets
+        striker_stats.fall_of_wicket_score = state.team1_runs
+    else:
+        state.team2_wickets += 1
+        match.wickets_team2 = state.team2_wickets
+        striker_stats.fall_of_wicket_number = state.team2_wickets
+        striker_stats.fall_of_wicket_score = state.team2_runs
+    striker_stats.fall_of_wicket_ball = state.current_over * 6 + state.current_ball + 1
+
+    # Replace the out batsman
+    if state.current_striker == state.batsman1:
+        state.batsman1 = next_batsman
+    else:
+        state.batsman2 = next_batsman
+    state.current_striker = next_batsman
+
+    return _advance_ball(state)
+
+
+def change_bowler(state, bowler):
+    state.current_bowler = bowler
+    state.ball_seq += 1
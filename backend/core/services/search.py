@@ -0,0 +1,178 @@
+# backend/core/services/search.py
+"""Ranked player and coach search over SearchDocument.
+
+Every player and coach has one SearchDocument holding its username, names,
+external ID and college/specialization as lower-cased text. Signals keep the
+rows current (``index_users``); ``rebuild_search_index`` rebuilds them all.
+Migration 0011 indexed the profiles that predate the index.
+
+Matching is index-backed on both supported databases:
+
+- PostgreSQL: ``document`` carries a pg_trgm GIN index, so substring
+  (LIKE) and fuzzy (``%``) matches are ranked by trigram similarity;
+- SQLite: an FTS5 table with the trigram tokenizer mirrors ``document`` and
+  matches are ranked by bm25.
+
+Exact ID and username-prefix hits always rank first; queries shorter than
+three characters cannot use trigrams and only get those.
+"""
+from django.db import connection, transaction
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models.functions import Greatest
+
+from ..models import Coach, Player, PlayerSportProfile, SearchDocument
+
+
+MAX_LIMIT = 50
+MIN_TRIGRAM = 3
+
+
+# -----------------------------
+# Indexing
+# -----------------------------
+def _document(*parts):
+    return " ".join(part.strip().lower() for part in parts if part)
+
+
+def player_document(player):
+    user = player.user
+    return SearchDocument(
+        kind=SearchDocument.Kind.PLAYER,
+        object_id=player.pk,
+        user_id=user.pk,
+        label=user.username,
+        external_id=player.player_id or "",
+        detail=player.college or "",
+        is_public=player.is_public and player.is_active,
+        document=_document(user.username, user.first_name, user.last_name, player.player_id, player.college),
+    )
+
+
+def coach_document(coach):
+    user = coach.user
+    return SearchDocument(
+        kind=SearchDocument.Kind.COACH,
+        object_id=coach.pk,
+        user_id=user.pk,
+        label=user.username,
+        external_id=coach.coach_id or "",
+        detail=coach.specialization or "",
+        sport_id=coach.primary_sport_id,
+        document=_document(user.username, user.first_name, user.last_name, coach.coach_id, coach.specialization),
+    )
+
+
+def _upsert(documents, batch_size=1000):
+    SearchDocument.objects.bulk_create(
+        documents,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=["kind", "object_id"],
+        update_fields=["user", "label", "external_id", "detail", "sport", "is_public", "document"],
+    )
+
+
+def index_users(user_ids):
+    """Re-index the player and coach profiles of `user_ids`."""
+    _upsert(
+        [player_document(p) for p in Player.objects.filter(user_id__in=user_ids).select_related("user")]
+        + [coach_document(c) for c in Coach.objects.filter(user_id__in=user_ids).select_related("user")]
+    )
+
+
+def unindex(kind, object_id):
+    SearchDocument.objects.filter(kind=kind, object_id=object_id).delete()
+
+
+@transaction.atomic
+def rebuild_search_index(batch_size=1000):
+    """Rebuild every SearchDocument. Returns the number of documents written."""
+    SearchDocument.objects.all().delete()
+    count = 0
+    for model, build in ((Player, player_document), (Coach, coach_document)):
+        batch = []
+        for profile in model.objects.select_related("user").order_by("pk").iterator(chunk_size=batch_size):
+            batch.append(build(profile))
+            if len(batch) >= batch_size:
+                _upsert(batch, batch_size)
+                count += len(batch)
+                batch = []
+        _upsert(batch, batch_size)
+        count += len(batch)
+    return count
+
+
+# -----------------------------
+# Querying
+# -----------------------------
+def _candidates(kind, public_only, sport_id):
+    qs = SearchDocument.objects.filter(kind=kind)
+    if public_only:
+        qs = qs.filter(is_public=True)
+    if sport_id is None:
+        return qs
+    if kind == SearchDocument.Kind.PLAYER:
+        # Players can play several sports, so their documents carry none; go through the profiles
+        return qs.filter(object_id__in=PlayerSportProfile.objects.filter(sport_id=sport_id).values("player_id"))
+    return qs.filter(sport_id=sport_id)
+
+
+def _strong_matches(qs, term, limit):
+    """Exact external IDs, then documents starting with `term` (i.e. username prefixes)."""
+    external_id = term.upper()
+    return list(
+        qs.filter(Q(external_id=external_id) | Q(document__startswith=term))
+        .annotate(boost=Case(When(external_id=external_id, then=Value(1)), default=Value(0), output_field=IntegerField()))
+        .order_by("-boost", "label")[:limit]
+    )
+
+
+def _fts_ids(kind, term, limit):
+    """Row ids of FTS5 trigram matches for `term` among documents of `kind`, best bm25 first."""
+    phrase = '"' + term.replace('"', '""') + '"'
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT rowid FROM core_searchdocument_fts WHERE core_searchdocument_fts MATCH %s "
+            "ORDER BY rank LIMIT %s",
+            [f'kind : "{kind}" AND document : {phrase}', limit],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _matches(kind, qs, term, limit):
+    if connection.vendor == "postgresql":
+        from django.contrib.postgres.search import TrigramSimilarity
+
+        return list(
+            qs.filter(Q(document__contains=term) | Q(document__trigram_similar=term))
+            .annotate(score=Greatest(TrigramSimilarity("label", term), TrigramSimilarity("document", term)))
+            .order_by("-score", "label")[:limit]
+        )
+    if connection.vendor == "sqlite":
+        # Over-fetch so the public/sport filters applied afterwards still fill the page
+        ids = _fts_ids(kind, term, limit * 5)
+        found = qs.in_bulk(ids)
+        return [found[pk] for pk in ids if pk in found][:limit]
+    return list(qs.filter(document__contains=term).order_by("label")[:limit])
+
+
+def search(kind, query, limit=20, public_only=False, sport_id=None):
+    """SearchDocuments of `kind` matching `query`, best first."""
+    term = " ".join(query.lower().split())
+    if not term:
+        return []
+    limit = max(1, min(limit, MAX_LIMIT))
+    qs = _candidates(kind, public_only, sport_id)
+    strong = _strong_matches(qs, term, limit)
+    if len(term) < MIN_TRIGRAM:
+        return strong
+    seen = {doc.pk for doc in strong}
+    return (strong + [doc for doc in _matches(kind, qs, term, limit) if doc.pk not in seen])[:limit]
+
+
+def autocomplete(kind, query, limit=10, public_only=False, sport_id=None):
+    """Light suggestions for a search box: [{"id", "external_id", "label", "detail"}]."""
+    return [
+        {"id": doc.object_id, "external_id": doc.external_id, "label": doc.label, "detail": doc.detail}
+        for doc in search(kind, query, limit=limit, public_only=public_only, sport_id=sport_id)
+    ]
@@ -0,0 +1,101 @@
+# backend/core/services/tournament_stats.py
+"""Top-K player leaderboards for a tournament.
+
+All boards come from one grouped query over MatchPlayerStats: per-player
+totals are ranked with one ROW_NUMBER() window per board and only rows inside
+some board's top ``MAX_K`` are returned, with player names joined in. The
+result is cached per tournament until a match completes (see
+``core.signals``) or ``TOURNAMENT_LEADERS_CACHE_SECONDS`` pass.
+"""
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, Count, F, FloatField, IntegerField, Q, Sum, Value, When, Window
+from django.db.models.functions import Cast, RowNumber
+
+from ..models import MatchPlayerStats
+
+
+MAX_K = 50
+
+
+def _ratio(numerator, denominator, scale):
+    return Case(
+        When(**{f"{denominator}__gt": 0}, then=Cast(F(numerator), FloatField()) * scale / F(denominator)),
+        default=Value(None),
+        output_field=FloatField(),
+    )
+
+
+def _qualified_first(field):
+    return Case(When(**{f"{field}__gt": 0}, then=Value(0)), default=Value(1), output_field=IntegerField())
+
+
+# board -> (value field, qualifying field, window ordering); rows whose qualifying total is 0 never make a
+# board, so a 0.0 economy or strike rate over some balls still does
+BOARDS = {
+    "runs": ("runs", "runs", [F("runs").desc(), F("player")]),
+    "wickets": ("wickets", "wickets", [F("wickets").desc(), F("player")]),
+    "sixes": ("sixes", "sixes", [F("sixes").desc(), F("player")]),
+    "strike_rate": ("strike_rate", "balls_faced", [_qualified_first("balls_faced"), F("strike_rate").desc(), F("player")]),
+    "economy": ("economy", "balls_bowled", [_qualified_first("balls_bowled"), F("economy").asc(), F("player")]),
+    "mom": ("mom", "mom", [F("mom").desc(), F("player")]),
+}
+
+
+def _cache_key(tournament_id):
+    return f"tournament-leaders:{tournament_id}"
+
+
+def compute_leaders(tournament_id):
+    """{board: [{"rank", "player", "player_id", "username", "value"}, ...]} for the top MAX_K of every board."""
+    rows = (
+        MatchPlayerStats.objects.filter(match__tournament_id=tournament_id)
+        .values("player", "player__player_id", "player__user__username")
+        .annotate(
+            runs=Sum("runs_scored"),
+            wickets=Sum("wickets_taken"),
+            sixes=Sum("sixes"),
+            balls_faced=Sum("balls_faced"),
+            runs_conceded=Sum("runs_conceded"),
+            balls_bowled=Sum("legal_balls"),
+            mom=Count("match", filter=Q(match__man_of_the_match=F("player"))),
+        )
+        .annotate(strike_rate=_ratio("runs", "balls_faced", 100), economy=_ratio("runs_conceded", "balls_bowled", 6))
+        .annotate(**{
+            f"{board}_rank": Window(RowNumber(), order_by=ordering) for board, (_, _, ordering) in BOARDS.items()
+        })
+        .filter(reduce(or_, (Q(**{f"{board}_rank__lte": MAX_K}) for board in BOARDS)))
+        .order_by()
+    )
+    boards = {board: [] for board in BOARDS}
+    for row in rows:
+        for board, (field, qualifier, _) in BOARDS.items():
+            value = row[field]
+            if row[f"{board}_rank"] <= MAX_K and row[qualifier]:
+                boards[board].append({
+                    "rank": row[f"{board}_rank"],
+                    "player": row["player"],
+                    "player_id": row["player__player_id"],
+                    "username": row["player__user__username"],
+                    "value": round(value, 2) if isinstance(value, float) else value,
+                })
+    for entries in boards.values():
+        entries.sort(key=lambda entry: entry["rank"])
+    return boards
+
+
+def tournament_leaders(tournament_id, k=MAX_K, refresh=False):
+    """Cached top-`k` boards for a tournament (k is capped at MAX_K)."""
+    key = _cache_key(tournament_id)
+    boards = None if refresh else cache.get(key)
+    if boards is None:
+        boards = compute_leaders(tournament_id)
+        cache.set(key, boards, settings.TOURNAMENT_LEADERS_CACHE_SECONDS)
+    return {board: entries[:k] for board, entries in boards.items()}
+
+
+def invalidate_leaders(tournament_id):
+    cache.delete(_cache_key(tournament_id))
@@ -0,0 +1,64 @@
+# backend/core/services/versions.py
+"""Version stamps for conditional GETs.
+
+Each scope (``directory``, ``results``, or a per-entity scope such as
+``("player", 7)``) holds the time, in nanoseconds, of its last change. Readers
+combine the stamps of every scope a response depends on into an ETag and a
+Last-Modified date with one cache round trip, before any heavy query.
+
+Signals bump the scopes for ordinary saves (see ``core.signals``); services
+that write with ``update()`` or ``bulk_create()`` bump them explicitly. A
+scope missing from the cache gets a fresh stamp, so evicting one can only
+cost a full response.
+
+Stamps are only trusted when ``SHARED_VERSION_STAMPS`` is on (a shared
+cache): with per-process memory a write in one worker never reaches the
+stamps of the others, so ``current_version`` returns no version and every
+response is built in full.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+
+# Names, teams, sports and rosters shown across dashboards and match views
+DIRECTORY = "directory"
+# Career stats, rankings and achievements written as matches complete
+RESULTS = "results"
+
+
+def _key(scope):
+    if isinstance(scope, tuple):
+        return "version:" + ":".join(str(part) for part in scope)
+    return f"version:{scope}"
+
+
+def _stamp(keys):
+    cache.set_many({key: time.time_ns() for key in keys}, None)
+
+
+def bump(*scopes):
+    """Mark `scopes` changed, now and again when the current transaction commits."""
+    keys = [_key(scope) for scope in scopes]
+    _stamp(keys)
+    # A reader between the two stamps may pair the old rows with the new stamp
+    transaction.on_commit(lambda: _stamp(keys))
+
+
+def current_version(*scopes):
+    """(ETag value, last-modified timestamp in seconds) for a response built from `scopes`.
+
+    (None, None) when the stamps are not shared between workers.
+    """
+    if not settings.SHARED_VERSION_STAMPS:
+        return None, None
+    keys = [_key(scope) for scope in scopes]
+    stamps = cache.get_many(keys)
+    missing = [key for key in keys if key not in stamps]
+    if missing:
+        stamps.update({key: time.time_ns() for key in missing})
+        cache.set_many({key: stamps[key] for key in missing}, None)
+    values = [stamps[key] for key in keys]
+    return ".".join(f"{value:x}" for value in values), max(values) / 1_000_000_000
@@ -1,11 +1,20 @@
 # core/signals.py
-from django.db.models.signals import post_save, pre_save   # ✅ include pre_save here
+from django.db.models.signals import post_delete, post_save, pre_save   # ✅ include pre_save here
 from django.dispatch import receiver
 from django.db import transaction
 from django.db.models import Max
 import datetime
 
-from .models import User, Player, Coach, Manager, Admin, PlayerSportProfile, CricketStats, Sport, ManagerSport
+from .models import User, Player, Coach, Manager, Admin, PlayerSportProfile, CricketStats, Sport, ManagerSport, TournamentMatch, SearchDocument
+from .models import (
+    Team, FootballStats, BasketballStats, RunningStats, Achievement, PlayerCareer, SessionAttendance, TournamentPoints,
+    DailyPerformanceScore, Tournament, TournamentTeam,
+)
+from .authentication import revoke_tokens
+from .services.rollups import mark_dirty
+from .services.search import index_users, unindex
+from .services.tournament_stats import invalidate_leaders
+from .services.versions import DIRECTORY, RESULTS, bump
 from .utils import generate_coach_id
 
 
@@ -127,13 +136,32 @@ def create_or_update_admin(sender, instance, created, **kwargs):
 
 @receiver(pre_save, sender=User)
 def store_old_role(sender, instance, **kwargs):
-    if not instance.pk:
-        instance._old_role = None
-    else:
-        try:
-            instance._old_role = User.objects.get(pk=instance.pk).role
-        except User.DoesNotExist:
-            instance._old_role = None
+    old = None
+    if instance.pk:
+        old = User.objects.filter(pk=instance.pk).values("role", "password", "is_active").first()
+    instance._old_role = old["role"] if old else None
+    # Role, password and active flag are what issued JWTs vouch for
+    instance._credentials_changed = bool(old) and (
+        old["role"] != instance.role or old["password"] != instance.password or old["is_active"] != instance.is_active
+    )
+
+
+@receiver(post_save, sender=User)
+def revoke_stale_tokens(sender, instance, created, **kwargs):
+    if getattr(instance, "_credentials_changed", False):
+        revoke_tokens(instance.pk)
+
+
+@receiver(post_save, sender=Player)
+@receiver(post_save, sender=Coach)
+@receiver(post_save, sender=Manager)
+@receiver(post_delete, sender=Player)
+@receiver(post_delete, sender=Coach)
+@receiver(post_delete, sender=Manager)
+def revoke_tokens_on_profile_change(sender, instance, created=True, **kwargs):
+    """JWTs carry the profile ids, so a new or removed profile invalidates them."""
+    if created:
+        revoke_tokens(instance.user_id)
 
 
 #-----------------------------
@@ -143,3 +171,108 @@ def store_old_role(sender, instance, **kwargs):
 # REMOVED: Auto-creation of Cricket profile
 # The serializer now handles sport profile creation based on user selection
 # This signal was causing all players to get Cricket regardless of their choice
+
+
+@receiver(post_save, sender=TournamentMatch)
+def invalidate_tournament_leaders(sender, instance, **kwargs):
+    """Completed matches change the cached tournament leaderboards."""
+    if instance.is_completed:
+        invalidate_leaders(instance.tournament_id)
+
+
+#-----------------------------
+# Search index
+#-----------------------------
+@receiver(post_save, sender=Player)
+@receiver(post_save, sender=Coach)
+def index_profile(sender, instance, **kwargs):
+    index_users([instance.user_id])
+
+
+@receiver(post_save, sender=User)
+def reindex_user(sender, instance, created, update_fields=None, **kwargs):
+    # New users are indexed when their profile is created; logins only touch last_login
+    if not created and (update_fields is None or set(update_fields) - {"last_login"}):
+        index_users([instance.pk])
+
+
+@receiver(post_delete, sender=Player)
+def unindex_player(sender, instance, **kwargs):
+    unindex(SearchDocument.Kind.PLAYER, instance.pk)
+
+
+@receiver(post_delete, sender=Coach)
+def unindex_coach(sender, instance, **kwargs):
+    unindex(SearchDocument.Kind.COACH, instance.pk)
+
+
+#-----------------------------
+# Conditional-response versions (core/services/versions.py)
+#-----------------------------
+@receiver(post_save, sender=Player)
+@receiver(post_save, sender=Coach)
+@receiver(post_save, sender=Team)
+@receiver(post_save, sender=Sport)
+@receiver(post_save, sender=PlayerSportProfile)
+@receiver(post_delete, sender=Player)
+@receiver(post_delete, sender=Coach)
+@receiver(post_delete, sender=Team)
+@receiver(post_delete, sender=Sport)
+@receiver(post_delete, sender=PlayerSportProfile)
+def bump_directory(sender, **kwargs):
+    """Names, teams, sports and rosters shown by the dashboards and match views."""
+    bump(DIRECTORY)
+
+
+@receiver(post_save, sender=CricketStats)
+@receiver(post_save, sender=FootballStats)
+@receiver(post_save, sender=BasketballStats)
+@receiver(post_save, sender=RunningStats)
+@receiver(post_save, sender=Achievement)
+@receiver(post_save, sender=PlayerCareer)
+@receiver(post_delete, sender=CricketStats)
+@receiver(post_delete, sender=FootballStats)
+@receiver(post_delete, sender=BasketballStats)
+@receiver(post_delete, sender=RunningStats)
+@receiver(post_delete, sender=Achievement)
+@receiver(post_delete, sender=PlayerCareer)
+def bump_results(sender, **kwargs):
+    """Stats, careers and achievements behind the dashboards' numbers and ranks."""
+    bump(RESULTS)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def bump_directory_on_user_change(sender, instance, update_fields=None, **kwargs):
+    # Logins only touch last_login, which no versioned response shows
+    if update_fields is None or set(update_fields) - {"last_login"}:
+        bump(DIRECTORY)
+
+
+@receiver(post_save, sender=SessionAttendance)
+@receiver(post_delete, sender=SessionAttendance)
+def bump_player_training(sender, instance, **kwargs):
+    bump(("player", instance.player_id))
+
+
+@receiver(post_save, sender=Tournament)
+@receiver(post_delete, sender=Tournament)
+def bump_tournament(sender, instance, **kwargs):
+    """The points table nests the tournament: status, dates, manager and counts."""
+    bump(("tournament", instance.pk))
+
+
+@receiver(post_save, sender=TournamentTeam)
+@receiver(post_save, sender=TournamentMatch)
+@receiver(post_save, sender=TournamentPoints)
+@receiver(post_delete, sender=TournamentTeam)
+@receiver(post_delete, sender=TournamentMatch)
+@receiver(post_delete, sender=TournamentPoints)
+def bump_tournament_points(sender, instance, **kwargs):
+    bump(("tournament", instance.tournament_id))
+
+
+@receiver(post_save, sender=DailyPerformanceScore)
+@receiver(post_delete, sender=DailyPerformanceScore)
+def mark_performance_rollups(sender, instance, **kwargs):
+    mark_dirty([(instance.player_id, instance.date)])
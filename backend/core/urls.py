@@ -1,17 +1,16 @@
 from django.urls import path, include
 from rest_framework import routers
 from rest_framework.routers import DefaultRouter
-from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from .views import (
     TeamViewSet, PlayerViewSet, MatchViewSet,
     AttendanceViewSet, LeaderboardViewSet,
     predict_player_start, player_insight, register_user,
     player_dashboard, coach_dashboard,
-    CustomObtainAuthToken, RoleAwareProfileView, player_profile, coach_profile,
+    CustomObtainAuthToken, RoleTokenObtainPairView, RoleTokenRefreshView, RoleAwareProfileView, player_profile, coach_profile,
     PromotionRequestViewSet, CoachingSessionViewSet, CoachPlayerLinkViewSet, NotificationViewSet,
     SportViewSet, TeamProposalViewSet, TeamAssignmentRequestViewSet, TournamentViewSet,
     TournamentMatchViewSet, ManagerSportAssignmentViewSet, PlayerSportProfileViewSet,
-    CoachViewSet,
+    CoachViewSet, export_data,
 )
 
 
@@ -46,8 +45,9 @@ urlpatterns = [
     path('coach/profile/', coach_profile, name='coach-profile'),
     path('dashboard/player/', player_dashboard, name='player-dashboard'),
     path('dashboard/coach/', coach_dashboard, name='coach-dashboard'),
+    path('exports/<str:dataset>.<str:extension>', export_data, name='export-data'),
     
     # ✅ Add JWT authentication endpoints
-    path('token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
-    path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('token/', RoleTokenObtainPairView.as_view(), name='token_obtain_pair'),
+    path('token/refresh/', RoleTokenRefreshView.as_view(), name='token_refresh'),
 ]
@@ -1,19 +1,21 @@
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAuthenticated, SAFE_METHODS
 import csv
 from io import StringIO
 from django.db import models
 from django.db import transaction
+from django.http import HttpResponse, StreamingHttpResponse
 
 from .models import (
     PromotionRequest, Player, Sport, CoachingSession, PlayerSportProfile, SessionAttendance,
     CoachPlayerLinkRequest, Leaderboard, Notification, Manager, ManagerSport, TeamProposal,
     TeamAssignmentRequest, Tournament, TournamentTeam, TournamentMatch, CricketMatchState,
-    MatchPlayerStats, TournamentPoints, Team, Coach
+    MatchPlayerStats, TournamentPoints, Team, Coach, PlayerCareer, SearchDocument
 )
 from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 from .serializers import (
     PromotionRequestCreateSerializer, PromotionRequestSerializer,
     CoachingSessionCreateSerializer, CoachInviteSerializer, PlayerRequestCoachSerializer,
@@ -21,12 +23,31 @@ from .serializers import (
     SportSerializer, TeamProposalCreateSerializer, TeamProposalSerializer,
     TeamAssignmentRequestCreateSerializer, TeamAssignmentRequestSerializer,
     TournamentCreateSerializer, TournamentSerializer, TournamentTeamSerializer, 
-    TournamentMatchCreateSerializer, TournamentMatchSerializer,
+    TournamentMatchCreateSerializer, TournamentMatchSerializer, TournamentMatchListSerializer,
     ManagerSportSerializer, PlayerSportProfileSerializer, PlayerSportProfileUpdateSerializer,
     CricketMatchStateSerializer, MatchPlayerStatsSerializer, TournamentPointsSerializer,
-    CoachSerializer,
+    CoachSerializer, PlayerCareerSerializer, parse_field_names,
+)
+from .permissions import (
+    IsAuthenticatedAndPlayer, IsAuthenticatedAndManagerOrAdmin, IsAuthenticatedAndCoach, IsAuthenticatedAndAdmin,
 )
-from .permissions import IsAuthenticatedAndPlayer, IsAuthenticatedAndManagerOrAdmin, IsAuthenticatedAndCoach
+from .conditional import conditional_response
+from .pagination import LinkHeaderPagination
+from .principal import get_principal
+from .metrics import registry
+from .services import live_scoring
+from .services.achievements import award_match, award_tournament
+from .services.career import refresh_match_careers, roll_up_match
+from .services.deliveries import DeliveryError, SequenceError, apply_deliveries
+from .services.exports import FORMATS as EXPORT_FORMATS, ExportError, encode, export_rows
+from .services.fixtures import FixtureError, generate_fixtures
+from .services.scorecard import cached_scorecard, scorecard_version
+from .services.performance import DEFAULT_SERIES_POINTS, DOWNSAMPLERS, downsample, rating_summaries, series_payload
+from .services.rollups import PERIODS as ROLLUP_PERIODS, performance_trend, recompute_daily_scores
+from .services.search import autocomplete, search as search_index
+from .services.tournament_stats import MAX_K as LEADERS_MAX_K, tournament_leaders
+from .services.versions import DIRECTORY, RESULTS, bump, current_version
+from .services.scoring import change_bowler, score_runs, take_wicket
 from .promotion_services import (
     request_promotion, approve_promotion, reject_promotion, PromotionError,
     coach_invite_player, player_request_coach, accept_link_request, reject_link_request, LinkError,
@@ -39,6 +60,7 @@ class PromotionRequestViewSet(viewsets.GenericViewSet):
     queryset = PromotionRequest.objects.select_related("user", "player", "sport", "decided_by")
     serializer_class = PromotionRequestSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = LinkHeaderPagination
 
     def get_permissions(self):
         if self.action in {"create"}:
@@ -49,8 +71,8 @@ class PromotionRequestViewSet(viewsets.GenericViewSet):
 
     def list(self, request):
         qs = self.get_queryset().order_by("-requested_at")
-        serializer = PromotionRequestSerializer(qs, many=True)
-        return Response(serializer.data)
+        page = self.paginate_queryset(qs)
+        return self.get_paginated_response(PromotionRequestSerializer(page, many=True).data)
 
     def create(self, request):
         serializer = PromotionRequestCreateSerializer(data=request.data, context={"request": request})
@@ -89,21 +111,21 @@ class CoachingSessionViewSet(viewsets.GenericViewSet):
     queryset = CoachingSession.objects.select_related("coach", "team", "sport")
     serializer_class = CoachingSessionCreateSerializer
     permission_classes = [IsAuthenticatedAndCoach]
+    pagination_class = LinkHeaderPagination
 
     def list(self, request):
         """List sessions for the current coach."""
-        qs = self.get_queryset().filter(coach=request.user.coach).order_by("-session_date")
-        serializer = self.get_serializer(qs, many=True)
-        return Response(serializer.data)
+        qs = self.get_queryset().filter(coach_id=get_principal(request).coach_id).order_by("-session_date")
+        page = self.paginate_queryset(qs)
+        return self.get_paginated_response(self.get_serializer(page, many=True).data)
 
     def create(self, request):
         serializer = CoachingSessionCreateSerializer(data=request.data, context={"request": request})
         serializer.is_valid(raise_exception=True)
-        coach = request.user.coach
         # Remove sport_id from validated_data since we've converted it to sport
         validated_data = serializer.validated_data.copy()
         validated_data.pop('sport_id', None)
-        session = CoachingSession.objects.create(coach=coach, **validated_data)
+        session = CoachingSession.objects.create(coach_id=get_principal(request).coach_id, **validated_data)
         return Response({"id": session.id}, status=status.HTTP_201_CREATED)
 
     @action(detail=True, methods=["get"], url_path="csv-template")
@@ -112,12 +134,12 @@ class CoachingSessionViewSet(viewsets.GenericViewSet):
             session = self.get_queryset().get(pk=pk)
         except CoachingSession.DoesNotExist:
             return Response({"detail": "Not found"}, status=status.HTTP_404_NOT_FOUND)
-        if session.coach_id != request.user.coach.id:
+        if session.coach_id != get_principal(request).coach_id:
             return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
 
         # Players under this coach for this sport and currently active
         profiles = PlayerSportProfile.objects.select_related("player").filter(
-            coach=request.user.coach,
+            coach_id=get_principal(request).coach_id,
             sport=session.sport,
             is_active=True,
             player__is_active=True,
@@ -142,7 +164,7 @@ class CoachingSessionViewSet(viewsets.GenericViewSet):
             session = self.get_queryset().get(pk=pk)
         except CoachingSession.DoesNotExist:
             return Response({"detail": "Not found"}, status=status.HTTP_404_NOT_FOUND)
-        if session.coach_id != request.user.coach.id:
+        if session.coach_id != get_principal(request).coach_id:
             return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
 
         file = request.FILES.get("file")
@@ -162,7 +184,7 @@ class CoachingSessionViewSet(viewsets.GenericViewSet):
         # Allowed players: under this coach for this sport and active
         allowed_player_ids = set(
             PlayerSportProfile.objects.select_related("player").filter(
-                coach=request.user.coach,
+                coach_id=get_principal(request).coach_id,
                 sport=session.sport,
                 is_active=True,
                 player__is_active=True,
@@ -171,6 +193,7 @@ class CoachingSessionViewSet(viewsets.GenericViewSet):
 
         updated = 0
         errors = []
+        touched = set()
         for idx, row in enumerate(reader, start=2):  # header is line 1
             pid = (row.get("player_id") or "").strip()
             attended_val = (row.get("attended") or "").strip()
@@ -213,22 +236,10 @@ class CoachingSessionViewSet(viewsets.GenericViewSet):
             sa.rating = score if sa.attended else 0
             sa.save()
             updated += 1
+            touched.add((player.pk, session.session_date.date()))
 
-            # Update DailyPerformanceScore for the calendar day
-            from .models import DailyPerformanceScore
-            day = session.session_date.date()
-            dps, _ = DailyPerformanceScore.objects.get_or_create(player=player, date=day)
-            # recompute as average of all ratings for this player on this day (across sessions)
-            from django.db.models import Avg
-            avg_score = (
-                SessionAttendance.objects.filter(
-                    player=player,
-                    session__session_date__date=day,
-                    attended=True,
-                ).aggregate(Avg("rating"))["rating__avg"] or 0.0
-            )
-            dps.score = float(avg_score)
-            dps.save(update_fields=["score"])
+        # Daily scores average all of the player's ratings that day, across sessions
+        recompute_daily_scores(touched)
 
         status_code = status.HTTP_200_OK if not errors else status.HTTP_207_MULTI_STATUS
         return Response({"updated": updated, "errors": errors}, status=status_code)
@@ -241,7 +252,7 @@ class CoachingSessionViewSet(viewsets.GenericViewSet):
         except CoachingSession.DoesNotExist:
             return Response({"detail": "Not found"}, status=status.HTTP_404_NOT_FOUND)
         
-        if session.coach_id != request.user.coach.id:
+        if session.coach_id != get_principal(request).coach_id:
             return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
         
         if not session.is_active:
@@ -265,7 +276,7 @@ class CoachingSessionViewSet(viewsets.GenericViewSet):
         # Allowed players: under this coach for this sport and active
         allowed_player_ids = set(
             PlayerSportProfile.objects.select_related("player").filter(
-                coach=request.user.coach,
+                coach_id=get_principal(request).coach_id,
                 sport=session.sport,
                 is_active=True,
                 player__is_active=True,
@@ -275,6 +286,7 @@ class CoachingSessionViewSet(viewsets.GenericViewSet):
         updated = 0
         errors = []
         processed_players = []
+        touched = set()
         
         # Process CSV row by row
         for idx, row in enumerate(reader, start=2):  # header is line 1
@@ -320,7 +332,7 @@ class CoachingSessionViewSet(viewsets.GenericViewSet):
                 profile = PlayerSportProfile.objects.get(
                     player=player,
                     sport=session.sport,
-                    coach=request.user.coach,
+                    coach_id=get_principal(request).coach_id,
                     is_active=True
                 )
             except PlayerSportProfile.DoesNotExist:
@@ -339,7 +351,7 @@ class CoachingSessionViewSet(viewsets.GenericViewSet):
             if not created:
                 sa.attended = bool(attended)
                 sa.rating = score if attended else 0
-                sa.save(update_fields=["attended", "rating"])
+                sa.save(update_fields=["attended", "rating", "updated_at"])
 
             # Update PlayerSportProfile: increment session_count if attended
             if attended == 1:
@@ -355,22 +367,10 @@ class CoachingSessionViewSet(viewsets.GenericViewSet):
                 "score": score if attended else 0
             })
             updated += 1
+            touched.add((player.pk, session.session_date.date()))
+
+        recompute_daily_scores(touched)
 
-            # Update DailyPerformanceScore for the calendar day
-            from .models import DailyPerformanceScore
-            day = session.session_date.date()
-            dps, _ = DailyPerformanceScore.objects.get_or_create(player=player, date=day)
-            from django.db.models import Avg
-            avg_score = (
-                SessionAttendance.objects.filter(
-                    player=player,
-                    session__session_date__date=day,
-                    attended=True,
-                ).aggregate(Avg("rating"))["rating__avg"] or 0.0
-            )
-            dps.score = float(avg_score)
-            dps.save(update_fields=["score"])
-        
         if errors:
             return Response({
                 "detail": "Some rows had errors",
@@ -407,6 +407,7 @@ class CoachPlayerLinkViewSet(viewsets.GenericViewSet):
     queryset = CoachPlayerLinkRequest.objects.select_related("coach__user", "player__user", "sport")
     permission_classes = [IsAuthenticated]
     serializer_class = CoachPlayerLinkRequestSerializer
+    pagination_class = LinkHeaderPagination
 
     def get_permissions(self):
         if self.action in {"invite"}:
@@ -417,26 +418,18 @@ class CoachPlayerLinkViewSet(viewsets.GenericViewSet):
 
     def list(self, request):
         """List link requests for current user."""
-        qs = self.get_queryset()
+        qs = self.get_queryset().order_by("-created_at")
         if request.user.role == User.Roles.PLAYER:
             qs = qs.filter(player__user=request.user, status="pending")
         elif request.user.role == User.Roles.COACH:
             # Coaches should see requests where they are the coach (player requesting them)
-            # Check if user has coach profile
-            if not hasattr(request.user, 'coach'):
-                return Response([])
             qs = qs.filter(coach__user=request.user, status="pending", direction="player_to_coach")
-            # Debug logging
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.info(f"Coach {request.user.username} link requests query: {qs.query}")
-            logger.info(f"Found {qs.count()} requests")
         elif request.user.role == User.Roles.ADMIN:
             qs = qs.filter(status="pending")
         else:
             qs = qs.none()
-        serializer = self.get_serializer(qs, many=True)
-        return Response(serializer.data)
+        page = self.paginate_queryset(qs)
+        return self.get_paginated_response(self.get_serializer(page, many=True).data)
 
     @action(detail=False, methods=["post"], url_path="invite")
     def invite(self, request):
@@ -460,10 +453,10 @@ class CoachPlayerLinkViewSet(viewsets.GenericViewSet):
             # Allow admin or the appropriate party
             if request.user.role != User.Roles.ADMIN:
                 if link.direction == CoachPlayerLinkRequest.Direction.COACH_TO_PLAYER:
-                    if not hasattr(request.user, "player") or request.user.player.id != link.player.id:
+                    if get_principal(request).player_id != link.player_id:
                         return Response({"detail": "Only the invited player or admin can accept"}, status=status.HTTP_403_FORBIDDEN)
                 else:
-                    if not hasattr(request.user, "coach") or request.user.coach.id != link.coach.id:
+                    if get_principal(request).coach_id != link.coach_id:
                         return Response({"detail": "Only the invited coach or admin can accept"}, status=status.HTTP_403_FORBIDDEN)
             psp = accept_link_request(link, acting_user=request.user)
         except CoachPlayerLinkRequest.DoesNotExist:
@@ -486,19 +479,23 @@ class CoachPlayerLinkViewSet(viewsets.GenericViewSet):
 
 class LeaderboardViewSet(viewsets.GenericViewSet):
     permission_classes = [IsAuthenticated]
+    pagination_class = LinkHeaderPagination
 
     def list(self, request):
         # filter to active players only
         qs = Leaderboard.objects.select_related("player__user").filter(player__is_active=True).order_by("-score")
-        return Response(LeaderboardSerializer(qs, many=True).data)
+        page = self.paginate_queryset(qs)
+        return self.get_paginated_response(LeaderboardSerializer(page, many=True).data)
 
 
 class NotificationViewSet(viewsets.GenericViewSet):
     permission_classes = [IsAuthenticated]
+    pagination_class = LinkHeaderPagination
 
     def list(self, request):
         qs = Notification.objects.filter(user=request.user).order_by("-created_at")
-        return Response(NotificationSerializer(qs, many=True).data)
+        page = self.paginate_queryset(qs)
+        return self.get_paginated_response(NotificationSerializer(page, many=True).data)
 
     @action(detail=True, methods=["post"], url_path="mark-read")
     def mark_read(self, request, pk=None):
@@ -549,7 +546,10 @@ from .serializers import (
 )
 from rest_framework.views import APIView
 from .serializers import UserProfileSerializer, PlayerSerializer, CoachSerializer
+from .serializers import LoginSerializer, RoleTokenObtainPairSerializer, RoleTokenRefreshSerializer
 from .models import  Coach
+from .authentication import full_user, issue_tokens
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
 
 from .services.model_service import predict_player_start_from_features
@@ -558,12 +558,19 @@ from ai_an.services.gemini_client import gemini_summarize_player
 
 #------------------Authentication View------------------
 class CustomObtainAuthToken(ObtainAuthToken):
+    serializer_class = LoginSerializer
+
     def post(self, request, *args, **kwargs):
-        response = super().post(request, *args, **kwargs)
-        token = Token.objects.get(key=response.data['token'])
-        user = token.user
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        user = serializer.validated_data["user"]
+        # authenticate_login already loaded the token (if any) and the role profiles
+        token = getattr(user, "auth_token", None) or Token.objects.create(user=user)
+        refresh = issue_tokens(user)
         return Response({
             'token': token.key,
+            'access': str(refresh.access_token),
+            'refresh': str(refresh),
             'user_id': user.id,
             'username': user.username,
             'email': user.email,
@@ -571,13 +578,22 @@ class CustomObtainAuthToken(ObtainAuthToken):
             'is_superuser': user.is_superuser,
             'role': user.role,   # from our new column
         })
+
+
+class RoleTokenObtainPairView(TokenObtainPairView):
+    serializer_class = RoleTokenObtainPairSerializer
+
+
+class RoleTokenRefreshView(TokenRefreshView):
+    serializer_class = RoleTokenRefreshSerializer
+
         
 #-------------------Role Based Access Control Decorator------------------
 class RoleAwareProfileView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        user = request.user
+        user = full_user(request.user, "player", "coach")
         user_data = UserProfileSerializer(user).data
         profile_data = {}
 
@@ -635,8 +651,40 @@ def role_required(allowed_roles):
 
 
 
+# ------------------ SPARSE FIELDSETS ------------------
+class DynamicFieldsViewMixin:
+    """`?fields=` and `?expand=` for list/retrieve on DynamicFieldsMixin serializers.
+
+    The selection goes into the serializer context and the queryset is shaped
+    by the serializer's ``optimize()``, so unrequested relations are not joined
+    and, where the selection is fully mapped, unrequested columns not loaded.
+    """
+    dynamic_actions = ("list", "retrieve")
+
+    def _field_selection(self):
+        if self.action not in self.dynamic_actions:
+            return None
+        params = self.request.query_params
+        return parse_field_names(params.get("fields")) or None, parse_field_names(params.get("expand"))
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        selection = self._field_selection()
+        if selection is not None:
+            context["fields"], context["expand"] = selection
+        return context
+
+    def get_queryset(self):
+        qs = super().get_queryset()
+        selection = self._field_selection()
+        serializer_class = self.get_serializer_class()
+        if selection is not None and hasattr(serializer_class, "optimize"):
+            qs = serializer_class.optimize(qs, *selection)
+        return qs
+
+
 # ------------------ TEAM ------------------
-class TeamViewSet(viewsets.ModelViewSet):
+class TeamViewSet(DynamicFieldsViewMixin, viewsets.ModelViewSet):
     queryset = Team.objects.select_related("coach__user", "manager", "sport")
     permission_classes = [IsAuthenticated]
 
@@ -659,18 +707,93 @@ class TeamViewSet(viewsets.ModelViewSet):
             qs = qs.filter(coach__user=user)
         return qs
 
+# ------------------ SEARCH ------------------
+class SearchActionsMixin:
+    """Ranked `search/` and `autocomplete/` list actions backed by core/services/search.py.
+
+    Query params: q (required), limit, sport_id. Only managers, coaches and
+    admins see private or inactive players.
+    """
+    search_kind = None
+    search_related = ()
+
+    def _search_params(self, request, default_limit):
+        try:
+            limit = int(request.query_params.get("limit", default_limit))
+            sport_id = request.query_params.get("sport_id")
+            sport_id = int(sport_id) if sport_id else None
+        except ValueError:
+            return None
+        principal = get_principal(request)
+        return {
+            "limit": limit,
+            "sport_id": sport_id,
+            "public_only": not (principal.is_manager or principal.is_coach or principal.is_admin),
+        }
+
+    @action(detail=False, methods=["get"], url_path="search", permission_classes=[IsAuthenticated])
+    def search(self, request):
+        params = self._search_params(request, 20)
+        if params is None:
+            return Response({"detail": "limit and sport_id must be integers"}, status=status.HTTP_400_BAD_REQUEST)
+        documents = search_index(self.search_kind, request.query_params.get("q", ""), **params)
+        found = self.queryset.select_related(*self.search_related).in_bulk(
+            [document.object_id for document in documents]
+        )
+        results = [found[document.object_id] for document in documents if document.object_id in found]
+        return Response(self.get_serializer(results, many=True).data)
+
+    @action(detail=False, methods=["get"], url_path="autocomplete", permission_classes=[IsAuthenticated])
+    def autocomplete(self, request):
+        params = self._search_params(request, 10)
+        if params is None:
+            return Response({"detail": "limit and sport_id must be integers"}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(autocomplete(self.search_kind, request.query_params.get("q", ""), **params))
+
+
 # ------------------ PLAYER ------------------
-class PlayerViewSet(viewsets.ModelViewSet):
+class PlayerViewSet(DynamicFieldsViewMixin, SearchActionsMixin, viewsets.ModelViewSet):
     """
     Manage players — CRUD endpoints for player data.
     """
     queryset = Player.objects.all()
     permission_classes = [IsAuthenticatedOrReadOnly]
     serializer_class = PlayerSerializer
+    search_kind = SearchDocument.Kind.PLAYER
+    search_related = ["user", "team__coach__user", "team__manager", "team__sport"]
     # Enable filtering and ordering
     filterset_fields = ["team__id", "coach__id"]
     ordering_fields = ["joined_at"]
 
+    @action(detail=True, methods=["get"], url_path="performance-trend", permission_classes=[IsAuthenticated])
+    def performance_trend(self, request, pk=None):
+        """Weekly or monthly average performance scores (?period=week|month&from=&to=), oldest first."""
+        player = self.get_object()
+        user = request.user
+        if user.role == user.Roles.PLAYER and player.user_id != user.id:
+            return Response({"detail": "Players can only view their own trend"}, status=status.HTTP_403_FORBIDDEN)
+
+        period = request.query_params.get("period", "week")
+        if period not in ROLLUP_PERIODS:
+            return Response(
+                {"detail": f"period must be one of {', '.join(ROLLUP_PERIODS)}"}, status=status.HTTP_400_BAD_REQUEST
+            )
+        bounds = {}
+        for param in ("from", "to"):
+            value = request.query_params.get(param)
+            try:
+                bounds[param] = parse_date(value) if value else None
+            except ValueError:
+                bounds[param] = None
+            if value and bounds[param] is None:
+                return Response({"detail": f"{param} must be a date (YYYY-MM-DD)"}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({
+            "player_id": player.player_id,
+            "period": period,
+            "points": performance_trend(player.pk, period, bounds["from"], bounds["to"]),
+        })
+
 
 # ------------------ MATCH ------------------
 class MatchViewSet(viewsets.ModelViewSet):
@@ -829,6 +952,7 @@ def player_profile(request):
     if user.role != user.Roles.PLAYER:
         return Response({"error": "This endpoint is for players only"}, 
                         status=status.HTTP_403_FORBIDDEN)
+    user = full_user(user, "player")
     
     try:
         player = user.player
@@ -848,6 +972,7 @@ def coach_profile(request):
     if user.role != user.Roles.COACH:
         return Response({"error": "This endpoint is for coaches only"}, 
                         status=status.HTTP_403_FORBIDDEN)
+    user = full_user(user, "coach")
     
     try:
         coach = user.coach
@@ -865,16 +990,43 @@ def player_dashboard(request):
     if user.role != user.Roles.PLAYER:
         return Response({"detail": "Players only"}, status=status.HTTP_403_FORBIDDEN)
 
-    try:
-        player = user.player
-    except Player.DoesNotExist:
+    player_id = get_principal(request).player_id
+    if player_id is None:
         return Response({"detail": "Player profile not found"}, status=status.HTTP_404_NOT_FOUND)
 
+    # Performance series are downsampled to at most series_points points (0 = all)
+    series_method = request.query_params.get("series_method", "lttb")
+    try:
+        series_points = int(request.query_params.get("series_points", DEFAULT_SERIES_POINTS))
+    except ValueError:
+        series_points = -1
+    if series_points < 0 or series_method not in DOWNSAMPLERS:
+        return Response(
+            {"detail": f"series_points must be a non-negative integer and series_method one of {', '.join(DOWNSAMPLERS)}"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    version, last_modified = current_version(("player", player_id), DIRECTORY, RESULTS)
+    return conditional_response(
+        request,
+        version and f"{player_id}.{version}",
+        lambda: _player_dashboard(user.player, series_points, series_method),
+        last_modified,
+    )
+
+
+def _player_dashboard(player, series_points=DEFAULT_SERIES_POINTS, series_method="lttb"):
     profiles = PlayerSportProfile.objects.filter(player=player).select_related("sport", "team", "coach")
+    careers = {career.sport_id: career for career in PlayerCareer.objects.filter(player=player).select_related("sport")}
 
     from .models import Achievement  # local import to avoid circulars
     achievements = Achievement.objects.filter(player=player).order_by("-date_awarded")[:10]
 
+    # Running rating averages and attendance for every sport, from one windowed query
+    ratings = rating_summaries(player.pk)
+    if any(profile.sport_id is None for profile in profiles):
+        ratings[None] = rating_summaries(player.pk, per_sport=False).get(None)
+
     # Build per-sport stats and ranks
     def get_stats_and_rank(profile):
         sport_name = (profile.sport.name if profile.sport else "").lower()
@@ -889,39 +1041,34 @@ def player_dashboard(request):
             "stats": {},
             "ranks": {},
             "achievements": [],
-            "performance": {"series": []},
-            "attendance": {"total_sessions": 0, "attended": 0},
         }
         # Collect stats and compute ranks
         if sport_name == "cricket":
             st = getattr(profile, "cricket_stats", None)
             st = st.first() if hasattr(st, "first") else None
+            career = careers.get(profile.sport_id)
             if st:
                 payload["stats"] = {
                     "runs": st.runs,
                     "wickets": st.wickets,
-                    "average": st.average,
+                    # Runs per dismissal, the same figure "average" is ranked by
+                    "average": career.batting_average if career else None,
                     "strike_rate": st.strike_rate,
+                    "economy": st.economy,
                     "matches_played": st.matches_played,
                 }
-                # Ranks (higher better)
-                all_stats = []
-                for p in PlayerSportProfile.objects.filter(sport__name__iexact="Cricket"):
-                    s = getattr(p, "cricket_stats", None)
-                    s = s.first() if hasattr(s, "first") else None
-                    if s:
-                        all_stats.append({"profile_id": p.id, "runs": s.runs, "wickets": s.wickets, "average": s.average, "strike_rate": s.strike_rate})
-                def rank(metric, reverse=True):
-                    arr = sorted(all_stats, key=lambda x: x.get(metric) or 0, reverse=reverse)
-                    positions = {x["profile_id"]: i+1 for i, x in enumerate(arr)}
-                    return positions.get(profile.id)
-                payload["ranks"] = {
-                    "runs": rank("runs", True),
-                    "wickets": rank("wickets", True),
-                    "average": rank("average", True),
-                    "strike_rate": rank("strike_rate", True),
-                    "total_players": len(all_stats),
-                }
+            if career:
+                payload["career"] = PlayerCareerSerializer(career).data
+                # Ranks (higher better) among every career in the sport, counted in one aggregate
+                ahead = PlayerCareer.objects.filter(sport_id=profile.sport_id).aggregate(
+                    runs=models.Count("id", filter=models.Q(runs__gt=career.runs)),
+                    wickets=models.Count("id", filter=models.Q(wickets__gt=career.wickets)),
+                    average=models.Count("id", filter=models.Q(batting_average__gt=career.batting_average or 0)),
+                    strike_rate=models.Count("id", filter=models.Q(strike_rate__gt=career.strike_rate)),
+                    total_players=models.Count("id"),
+                )
+                payload["ranks"] = {metric: count + 1 for metric, count in ahead.items() if metric != "total_players"}
+                payload["ranks"]["total_players"] = ahead["total_players"]
         elif sport_name == "football":
             st = getattr(profile, "football_stats", None)
             st = st.first() if hasattr(st, "first") else None
@@ -1010,30 +1157,16 @@ def player_dashboard(request):
             for a in ach_qs.order_by("-date_awarded")[:10]
         ]
 
-        # Performance series from session ratings for this sport
-        ratings_qs = SessionAttendance.objects.filter(player=player)
-        if sport_obj:
-            ratings_qs = ratings_qs.filter(session__sport=sport_obj)
-        ratings_qs = ratings_qs.select_related("session").order_by("session__session_date", "id")
-        total_r = 0.0
-        count_r = 0
-        series = []
-        for sa in ratings_qs:
-            r = sa.rating or 0
-            if r < 0:
-                r = 0
-            if r > 10:
-                r = 10
-            count_r += 1
-            total_r += float(r)
-            avg = total_r / count_r
-            series.append({"index": count_r, "average": round(avg, 2)})
-        payload["performance"] = {"series": series}
-
-        # Attendance summary for this sport
-        total_sessions = ratings_qs.count()
-        attended_sessions = ratings_qs.filter(attended=True).count()
-        payload["attendance"] = {"total_sessions": total_sessions, "attended": attended_sessions}
+        # Performance series and attendance summary for this sport
+        summary = ratings.get(profile.sport_id)
+        if summary:
+            points = downsample(summary["series"], series_points, series_method)
+            payload["performance"] = {"series": series_payload(points)}
+            payload["attendance"] = summary["attendance"]
+        else:
+            # No sessions in this sport yet: same shape, empty
+            payload["performance"] = {"series": []}
+            payload["attendance"] = {"total_sessions": 0, "attended": 0}
 
         return payload
 
@@ -1063,17 +1196,24 @@ def coach_dashboard(request):
     if user.role != user.Roles.COACH:
         return Response({"detail": "Coaches only"}, status=status.HTTP_403_FORBIDDEN)
 
-    try:
-        coach = user.coach
-    except Coach.DoesNotExist:
+    coach_id = get_principal(request).coach_id
+    if coach_id is None:
         return Response({"detail": "Coach profile not found"}, status=status.HTTP_404_NOT_FOUND)
 
+    version, last_modified = current_version(DIRECTORY, RESULTS)
+    # The coach id keeps one coach's ETag from validating another's cached copy
+    return conditional_response(
+        request, version and f"{coach_id}.{version}", lambda: _coach_dashboard(coach_id), last_modified
+    )
+
+
+def _coach_dashboard(coach_id):
     # Get teams assigned to this coach
-    teams = Team.objects.filter(coach=coach).select_related("sport", "manager")
+    teams = Team.objects.filter(coach_id=coach_id).select_related("sport", "manager")
     
     # Get students (players linked via PlayerSportProfile)
     student_profiles = PlayerSportProfile.objects.filter(
-        coach=coach,
+        coach_id=coach_id,
         is_active=True
     ).select_related("player__user", "sport", "team").prefetch_related("player__achievements")
     
@@ -1122,6 +1262,7 @@ def coach_dashboard(request):
                         "wickets": cricket_stats.wickets,
                         "matches_played": cricket_stats.matches_played,
                         "strike_rate": cricket_stats.strike_rate,
+                        "economy": cricket_stats.economy,
                         "average": cricket_stats.average,
                     }
             elif sport_name == "football":
@@ -1171,6 +1312,7 @@ class SportViewSet(viewsets.GenericViewSet):
     queryset = Sport.objects.all()
     serializer_class = SportSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = LinkHeaderPagination
 
     def get_permissions(self):
         if self.action in {"create"}:
@@ -1181,7 +1323,8 @@ class SportViewSet(viewsets.GenericViewSet):
     def list(self, request):
         """List all sports (public)."""
         qs = self.get_queryset().order_by("name")
-        return Response(SportSerializer(qs, many=True).data)
+        page = self.paginate_queryset(qs)
+        return self.get_paginated_response(SportSerializer(page, many=True).data)
 
     def create(self, request):
         """Create a new sport (admin/manager only)."""
@@ -1198,6 +1341,7 @@ class TeamProposalViewSet(viewsets.GenericViewSet):
     queryset = TeamProposal.objects.select_related("coach__user", "manager", "sport", "created_team")
     serializer_class = TeamProposalSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = LinkHeaderPagination
 
     def get_permissions(self):
         if self.action in {"create"}:
@@ -1231,7 +1375,8 @@ class TeamProposalViewSet(viewsets.GenericViewSet):
             qs = qs.filter(manager=request.user)
         elif request.user.role != User.Roles.ADMIN:
             qs = qs.none()
-        return Response(TeamProposalSerializer(qs, many=True).data)
+        page = self.paginate_queryset(qs)
+        return self.get_paginated_response(TeamProposalSerializer(page, many=True).data)
 
     @action(detail=True, methods=["post"], url_path="approve")
     def approve(self, request, pk=None):
@@ -1274,6 +1419,7 @@ class TeamAssignmentRequestViewSet(viewsets.GenericViewSet):
     queryset = TeamAssignmentRequest.objects.select_related("manager", "coach__user", "team")
     serializer_class = TeamAssignmentRequestSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = LinkHeaderPagination
 
     def get_permissions(self):
         if self.action in {"create"}:
@@ -1292,8 +1438,8 @@ class TeamAssignmentRequestViewSet(viewsets.GenericViewSet):
             qs = qs.filter(manager=request.user)
         elif request.user.role != User.Roles.ADMIN:
             qs = qs.none()
-        serializer = self.get_serializer(qs, many=True)
-        return Response(serializer.data)
+        page = self.paginate_queryset(qs)
+        return self.get_paginated_response(self.get_serializer(page, many=True).data)
 
     def create(self, request):
         """Manager creates team assignment request."""
@@ -1316,7 +1462,7 @@ class TeamAssignmentRequestViewSet(viewsets.GenericViewSet):
             assignment = self.get_queryset().get(pk=pk)
             # Allow admin or assigned coach
             if request.user.role != User.Roles.ADMIN:
-                if not hasattr(request.user, "coach") or request.user.coach_id != assignment.coach_id:
+                if get_principal(request).coach_id != assignment.coach_id:
                     return Response({"detail": "Only the assigned coach or admin can accept"}, status=status.HTTP_403_FORBIDDEN)
             team = accept_team_assignment(assignment, decided_by=request.user)
         except TeamAssignmentRequest.DoesNotExist:
@@ -1333,7 +1479,7 @@ class TeamAssignmentRequestViewSet(viewsets.GenericViewSet):
             assignment = self.get_queryset().get(pk=pk)
             # Allow admin or assigned coach
             if request.user.role != User.Roles.ADMIN:
-                if not hasattr(request.user, "coach") or request.user.coach.id != assignment.coach.id:
+                if get_principal(request).coach_id != assignment.coach_id:
                     return Response({"detail": "Only the assigned coach or admin can reject"}, status=status.HTTP_403_FORBIDDEN)
             reject_team_assignment(assignment, decided_by=request.user, remarks=remarks)
         except TeamAssignmentRequest.DoesNotExist:
@@ -1346,10 +1492,64 @@ class TeamAssignmentRequestViewSet(viewsets.GenericViewSet):
 # -----------------------------
 # Tournament ViewSet
 # -----------------------------
+def _team_related(prefix):
+    """select_related paths TeamSerializer walks for the team at `prefix`."""
+    return [prefix, f"{prefix}__coach__user", f"{prefix}__manager", f"{prefix}__sport"]
+
+
+# What the compact TournamentMatchListSerializer row needs
+TOURNAMENT_MATCH_LIST_RELATED = ["tournament", "team1", "team2", "man_of_the_match__user"]
+
+# Extra paths per ?expand= field, mirroring the full nested serializers
+TOURNAMENT_MATCH_EXPAND_RELATED = {
+    "tournament": ["tournament__sport"],
+    "team1": _team_related("team1"),
+    "team2": _team_related("team2"),
+    "man_of_the_match": ["man_of_the_match__user", *_team_related("man_of_the_match__team")],
+    "cricket_state": [
+        "cricket_state",
+        *_team_related("cricket_state__toss_won_by"),
+        *_team_related("cricket_state__batting_first"),
+        *_team_related("cricket_state__current_batting_team"),
+        *_team_related("cricket_state__current_bowling_team"),
+        "cricket_state__batsman1__user",
+        "cricket_state__batsman2__user",
+        "cricket_state__current_striker__user",
+        "cricket_state__current_bowler__user",
+    ],
+}
+
+# Everything else the full TournamentMatchSerializer touches; its tournament comes from full_tournament()
+TOURNAMENT_MATCH_RELATED = [
+    path for name, paths in TOURNAMENT_MATCH_EXPAND_RELATED.items() if name != "tournament" for path in paths
+]
+
+# The same paths rooted at CricketMatchState, for CricketMatchStateSerializer on its own
+CRICKET_STATE_RELATED = [
+    path.removeprefix("cricket_state__") for path in TOURNAMENT_MATCH_EXPAND_RELATED["cricket_state"][1:]
+]
+
+
+def full_tournament(lookup="tournament"):
+    """Prefetch for a nested TournamentSerializer: its users joined, its counts annotated."""
+    return models.Prefetch(
+        lookup, queryset=Tournament.objects.with_counts().select_related("sport", "manager", "created_by")
+    )
+
+
+def tournament_match_list_related(expand):
+    """select_related paths for a compact match list with the given expansions."""
+    paths = list(TOURNAMENT_MATCH_LIST_RELATED)
+    for name in expand:
+        paths.extend(TOURNAMENT_MATCH_EXPAND_RELATED[name])
+    return paths
+
+
 class TournamentViewSet(viewsets.GenericViewSet):
     queryset = Tournament.objects.select_related("sport", "manager", "created_by")
     serializer_class = TournamentSerializer
     permission_classes = [IsAuthenticatedAndManagerOrAdmin]
+    pagination_class = LinkHeaderPagination
 
     def create(self, request):
         """Create tournament (manager/admin only)."""
@@ -1360,10 +1560,11 @@ class TournamentViewSet(viewsets.GenericViewSet):
 
     def list(self, request):
         """List tournaments (manager sees their own, admin sees all)."""
-        qs = self.get_queryset().order_by("-created_at")
+        qs = self.get_queryset().with_counts().order_by("-created_at")
         if request.user.role == User.Roles.MANAGER:
             qs = qs.filter(manager=request.user)
-        return Response(TournamentSerializer(qs, many=True).data)
+        page = self.paginate_queryset(qs)
+        return self.get_paginated_response(TournamentSerializer(page, many=True).data)
 
     @action(detail=True, methods=["post"], url_path="add-team")
     def add_team(self, request, pk=None):
@@ -1390,8 +1591,46 @@ class TournamentViewSet(viewsets.GenericViewSet):
         """List matches for a tournament."""
         try:
             tournament = self.get_queryset().get(pk=pk)
-            matches = TournamentMatch.objects.filter(tournament=tournament).order_by("match_number")
-            return Response(TournamentMatchSerializer(matches, many=True).data)
+            expand = TournamentMatchListSerializer.parse_expand(request.query_params.get("expand"))
+            matches = TournamentMatch.objects.filter(tournament=tournament).select_related(
+                *tournament_match_list_related(expand)
+            ).order_by("match_number")
+            return Response(TournamentMatchListSerializer(matches, many=True, context={"expand": expand}).data)
+        except Tournament.DoesNotExist:
+            return Response({"detail": "Tournament not found"}, status=status.HTTP_404_NOT_FOUND)
+
+    @action(detail=True, methods=["post"], url_path="generate-fixtures")
+    def generate_fixtures(self, request, pk=None):
+        """Schedule fixtures in bulk: round_robin, groups, or the next knockout round."""
+        try:
+            tournament = self.get_queryset().get(pk=pk)
+            if tournament.status in (Tournament.Status.COMPLETED, Tournament.Status.CANCELLED):
+                return Response({"detail": "Tournament is closed"}, status=status.HTTP_400_BAD_REQUEST)
+
+            options = {"location": request.data.get("location") or None}
+            for name in ("groups", "qualifiers", "interval_days"):
+                value = request.data.get(name)
+                if value in (None, ""):
+                    continue
+                try:
+                    options[name] = int(value)
+                except (ValueError, TypeError):
+                    return Response({"detail": f"{name} must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+                if options[name] < (0 if name == "interval_days" else 1):
+                    return Response({"detail": f"{name} is out of range"}, status=status.HTTP_400_BAD_REQUEST)
+            if request.data.get("start_date"):
+                start = parse_datetime(str(request.data["start_date"]))
+                if start is None:
+                    return Response({"detail": "start_date must be an ISO datetime"}, status=status.HTTP_400_BAD_REQUEST)
+                options["start"] = start if timezone.is_aware(start) else timezone.make_aware(start)
+
+            created = generate_fixtures(tournament, request.data.get("format"), **options)
+            matches = TournamentMatch.objects.filter(pk__in=[m.pk for m in created]).select_related(
+                *TOURNAMENT_MATCH_LIST_RELATED
+            ).order_by("match_number")
+            return Response(TournamentMatchListSerializer(matches, many=True).data, status=status.HTTP_201_CREATED)
+        except FixtureError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
         except Tournament.DoesNotExist:
             return Response({"detail": "Tournament not found"}, status=status.HTTP_404_NOT_FOUND)
 
@@ -1417,46 +1656,42 @@ class TournamentViewSet(viewsets.GenericViewSet):
 
     @action(detail=True, methods=["get"], url_path="points-table")
     def points_table(self, request, pk=None):
-        """Get points table for tournament."""
-        try:
-            tournament = self.get_queryset().get(pk=pk)
-            points = TournamentPoints.objects.filter(tournament=tournament).select_related("team")
-            return Response(TournamentPointsSerializer(points, many=True).data)
-        except Tournament.DoesNotExist:
+        """Get points table for tournament; 304 if the ETag still matches."""
+        if not self.get_queryset().filter(pk=pk).exists():
             return Response({"detail": "Tournament not found"}, status=status.HTTP_404_NOT_FOUND)
+        version, last_modified = current_version(("tournament", pk), DIRECTORY)
+
+        def build():
+            points = TournamentPoints.objects.filter(tournament_id=pk).select_related(
+                *_team_related("team")
+            ).prefetch_related(full_tournament())
+            return Response(TournamentPointsSerializer(points, many=True).data)
+
+        return conditional_response(request, version, build, last_modified)
 
     @action(detail=True, methods=["get"], url_path="leaderboard")
     def leaderboard(self, request, pk=None):
-        """Get tournament leaderboard (top scorer, most wickets, most MoM)."""
+        """Get tournament leaderboards: top-k (?k=, default 5) per stat plus the top scorer, most wickets and most MoM."""
         try:
             tournament = self.get_queryset().get(pk=pk)
-            
-            # Top scorer
-            top_scorer = MatchPlayerStats.objects.filter(
-                match__tournament=tournament
-            ).values("player").annotate(
-                total_runs=models.Sum("runs_scored")
-            ).order_by("-total_runs").first()
-            
-            # Most wickets
-            most_wickets = MatchPlayerStats.objects.filter(
-                match__tournament=tournament
-            ).values("player").annotate(
-                total_wickets=models.Sum("wickets_taken")
-            ).order_by("-total_wickets").first()
-            
-            # Most MoM
-            mom_count = TournamentMatch.objects.filter(
-                tournament=tournament,
-                man_of_the_match__isnull=False
-            ).values("man_of_the_match").annotate(
-                count=models.Count("id")
-            ).order_by("-count").first()
-            
+            try:
+                k = min(max(int(request.query_params.get("k", 5)), 1), LEADERS_MAX_K)
+            except ValueError:
+                return Response({"detail": "k must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+            boards = tournament_leaders(tournament.id, k)
+
+            def first(board, player_key, value_key):
+                # Original single-leader shape, still read by the frontend
+                if not boards[board]:
+                    return None
+                top = boards[board][0]
+                return {player_key: top["player"], f"{player_key}__user__username": top["username"], value_key: top["value"]}
+
             return Response({
-                "top_scorer": top_scorer,
-                "most_wickets": most_wickets,
-                "most_mom": mom_count
+                "top_scorer": first("runs", "player", "total_runs"),
+                "most_wickets": first("wickets", "player", "total_wickets"),
+                "most_mom": first("mom", "man_of_the_match", "count"),
+                "leaders": boards,
             })
         except Tournament.DoesNotExist:
             return Response({"detail": "Tournament not found"}, status=status.HTTP_404_NOT_FOUND)
@@ -1469,78 +1704,7 @@ class TournamentViewSet(viewsets.GenericViewSet):
             if tournament.status != Tournament.Status.ONGOING:
                 return Response({"detail": "Tournament must be ongoing to end"}, status=status.HTTP_400_BAD_REQUEST)
             
-            # Get top scorer and most wickets
-            from django.db.models import Sum
-            top_scorer_stats = MatchPlayerStats.objects.filter(
-                match__tournament=tournament
-            ).values("player", "player__user__username").annotate(
-                total_runs=Sum("runs_scored")
-            ).order_by("-total_runs").first()
-            
-            most_wickets_stats = MatchPlayerStats.objects.filter(
-                match__tournament=tournament
-            ).values("player", "player__user__username").annotate(
-                total_wickets=Sum("wickets_taken")
-            ).order_by("-total_wickets").first()
-            
-            # Get winning team (most points)
-            winning_team_points = TournamentPoints.objects.filter(
-                tournament=tournament
-            ).order_by("-points", "-net_run_rate").first()
-            
-            # Create achievements
-            from .models import Achievement
-            achievements_created = []
-            
-            if top_scorer_stats and top_scorer_stats.get("total_runs", 0) > 0:
-                player = Player.objects.get(id=top_scorer_stats["player"])
-                ach, created = Achievement.objects.get_or_create(
-                    player=player,
-                    title=f"Top Scorer - {tournament.name}",
-                    description=f"Highest run scorer in {tournament.name}",
-                    defaults={
-                        "sport": tournament.sport,
-                        "date_awarded": timezone.now().date()
-                    }
-                )
-                if created:
-                    achievements_created.append("Top Scorer")
-            
-            if most_wickets_stats and most_wickets_stats.get("total_wickets", 0) > 0:
-                player = Player.objects.get(id=most_wickets_stats["player"])
-                ach, created = Achievement.objects.get_or_create(
-                    player=player,
-                    title=f"Highest Wicket Taker - {tournament.name}",
-                    description=f"Most wickets in {tournament.name}",
-                    defaults={
-                        "sport": tournament.sport,
-                        "date_awarded": timezone.now().date()
-                    }
-                )
-                if created:
-                    achievements_created.append("Highest Wicket Taker")
-            
-            if winning_team_points:
-                # Create achievements for all players in winning team
-                winning_team = winning_team_points.team
-                team_players = PlayerSportProfile.objects.filter(
-                    team=winning_team,
-                    sport=tournament.sport,
-                    is_active=True
-                ).select_related("player")
-                
-                for profile in team_players:
-                    ach, created = Achievement.objects.get_or_create(
-                        player=profile.player,
-                        title=f"Tournament Winner - {tournament.name}",
-                        description=f"Won {tournament.name} with {winning_team.name}",
-                        defaults={
-                            "sport": tournament.sport,
-                            "date_awarded": timezone.now().date()
-                        }
-                    )
-                    if created:
-                        achievements_created.append(f"Winner: {profile.player.user.username}")
+            achievements_created, winning_team_points = award_tournament(tournament)
             
             tournament.status = Tournament.Status.COMPLETED
             tournament.end_date = timezone.now()
@@ -1559,13 +1723,26 @@ class TournamentViewSet(viewsets.GenericViewSet):
 # Tournament Match ViewSet
 # -----------------------------
 class TournamentMatchViewSet(viewsets.ModelViewSet):
-    queryset = TournamentMatch.objects.select_related("tournament", "team1", "team2", "man_of_the_match__user")
+    queryset = TournamentMatch.objects.all()
     permission_classes = [IsAuthenticatedAndManagerOrAdmin]
+    # Served from the write-behind engine when LIVE_SCORING_ENABLED is on
+    LIVE_ACTIONS = {"add_score", "add_wicket"}
     
     def get_serializer_class(self):
         if self.action in ("create", "update", "partial_update"):
             return TournamentMatchCreateSerializer
+        if self.action == "list":
+            return TournamentMatchListSerializer
         return TournamentMatchSerializer
+
+    def get_expand(self):
+        return TournamentMatchListSerializer.parse_expand(self.request.query_params.get("expand"))
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.action == "list":
+            context["expand"] = self.get_expand()
+        return context
     
     def get_queryset(self):
         qs = super().get_queryset()
@@ -1573,7 +1750,33 @@ class TournamentMatchViewSet(viewsets.ModelViewSet):
         if user.role == User.Roles.MANAGER:
             # Manager sees matches for their tournaments
             qs = qs.filter(tournament__manager=user)
+        if self.action == "list":
+            qs = qs.select_related(*tournament_match_list_related(self.get_expand()))
+        elif self.action == "retrieve":
+            qs = qs.select_related(*TOURNAMENT_MATCH_RELATED).prefetch_related(full_tournament())
+        else:
+            # Scoring actions only need the match core and its live state
+            qs = qs.select_related("tournament__sport", "team1", "team2", "cricket_state")
         return qs.order_by("tournament", "match_number")
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        engine = live_scoring.get_engine()
+        if engine is None or self.action in self.LIVE_ACTIONS or not str(kwargs.get("pk", "")).isdigit():
+            return
+        # Outside ball-by-ball scoring the database copy is authoritative
+        if request.method in SAFE_METHODS:
+            engine.flush(kwargs["pk"])
+        else:
+            engine.release(kwargs["pk"])
+
+    def get_live_match(self, engine, pk):
+        """Live copy of match `pk`, applying the same visibility rules as get_queryset()."""
+        live = engine.get(pk)
+        user = self.request.user
+        if user.role == User.Roles.MANAGER and live.match.tournament.manager_id != user.id:
+            raise TournamentMatch.DoesNotExist
+        return live
     
     def perform_create(self, serializer):
         """Create match and optionally create achievements on completion."""
@@ -1585,16 +1788,9 @@ class TournamentMatchViewSet(viewsets.ModelViewSet):
     def perform_update(self, serializer):
         """Update match and create achievements if completed."""
         match = serializer.save()
-        if match.is_completed and match.man_of_the_match:
-            # Create achievement for Man of the Match
-            from .models import Achievement
-            Achievement.objects.get_or_create(
-                player=match.man_of_the_match,
-                title=f"Man of the Match - {match.tournament.name}",
-                description=f"Man of the Match in {match.team1.name} vs {match.team2.name}",
-                date_awarded=match.date.date() if match.date else timezone.now().date(),
-                defaults={"sport": match.tournament.sport}
-            )
+        if match.is_completed:
+            award_match(match)
+            refresh_match_careers(match)
 
     @action(detail=True, methods=["post"], url_path="start")
     def start_match(self, request, pk=None):
@@ -1617,14 +1813,20 @@ class TournamentMatchViewSet(viewsets.ModelViewSet):
             if not toss_won_by_id or not batting_first_id:
                 return Response({"detail": "toss_won_by_team_id and batting_first_team_id required"}, status=status.HTTP_400_BAD_REQUEST)
             
+            match_teams = {match.team1_id: match.team1, match.team2_id: match.team2}
             try:
-                toss_team = Team.objects.get(id=toss_won_by_id)
-                batting_team = Team.objects.get(id=batting_first_id)
-            except Team.DoesNotExist:
-                return Response({"detail": "Team not found"}, status=status.HTTP_404_NOT_FOUND)
-            
-            if toss_team not in [match.team1, match.team2] or batting_team not in [match.team1, match.team2]:
+                toss_won_by_id, batting_first_id = int(toss_won_by_id), int(batting_first_id)
+            except (ValueError, TypeError):
+                return Response({"detail": "Team ids must be integers"}, status=status.HTTP_400_BAD_REQUEST)
+
+            requested = {toss_won_by_id, batting_first_id}
+            if not requested <= match_teams.keys():
+                if Team.objects.filter(id__in=requested).count() < len(requested):
+                    return Response({"detail": "Team not found"}, status=status.HTTP_404_NOT_FOUND)
                 return Response({"detail": "Teams must be part of the match"}, status=status.HTTP_400_BAD_REQUEST)
+
+            toss_team = match_teams[toss_won_by_id]
+            batting_team = match_teams[batting_first_id]
             
             bowling_team = match.team2 if batting_team == match.team1 else match.team1
             
@@ -1650,47 +1852,27 @@ class TournamentMatchViewSet(viewsets.ModelViewSet):
                 state.current_bowling_team = bowling_team
                 state.save()
             
-            # Initialize MatchPlayerStats for all players in both teams
-            import logging
-            logger = logging.getLogger(__name__)
-            for team in [match.team1, match.team2]:
-                team_players = PlayerSportProfile.objects.filter(
-                    team=team,
-                    sport=match.tournament.sport,
-                    is_active=True
-                ).select_related("player__user")
-                
-                logger.info(f"Creating MatchPlayerStats for team {team.name} (ID: {team.id}): found {team_players.count()} players")
-                
-                if team_players.count() == 0:
-                    # Try without is_active filter as fallback
-                    team_players = PlayerSportProfile.objects.filter(
-                        team=team,
-                        sport=match.tournament.sport
-                    ).select_related("player__user")
-                    logger.warning(f"No active players found for team {team.name}, trying all players: found {team_players.count()}")
-                
-                for profile in team_players:
-                    stat, created = MatchPlayerStats.objects.get_or_create(
-                        match=match,
-                        player=profile.player,
-                        team=team,
-                        defaults={
-                            "runs_scored": 0,
-                            "balls_faced": 0,
-                            "wickets_taken": 0,
-                            "runs_conceded": 0,
-                        }
-                    )
-                    if created:
-                        logger.info(f"Created MatchPlayerStats for player {profile.player.user.username} (ID: {profile.player.id}) in team {team.name}")
-            
-            # Initialize TournamentPoints if not exists
-            for team in [match.team1, match.team2]:
-                TournamentPoints.objects.get_or_create(
-                    tournament=match.tournament,
-                    team=team
-                )
+            # Load both squads in one query; a team with no active players falls back to all its players
+            active = {team_id: [] for team_id in match_teams}
+            inactive = {team_id: [] for team_id in match_teams}
+            for team_id, player_id, is_active in PlayerSportProfile.objects.filter(
+                team_id__in=match_teams, sport=match.tournament.sport
+            ).values_list("team_id", "player_id", "is_active"):
+                (active if is_active else inactive)[team_id].append(player_id)
+
+            MatchPlayerStats.objects.bulk_create(
+                [
+                    MatchPlayerStats(match=match, player_id=player_id, team_id=team_id)
+                    for team_id in match_teams
+                    for player_id in (active[team_id] or inactive[team_id])
+                ],
+                ignore_conflicts=True,
+            )
+            TournamentPoints.objects.bulk_create(
+                [TournamentPoints(tournament=match.tournament, team_id=team_id) for team_id in match_teams],
+                ignore_conflicts=True,
+            )
+            bump(("tournament", match.tournament_id))
             
             match.status = TournamentMatch.Status.IN_PROGRESS
             match.save(update_fields=["status"])
@@ -1784,8 +1966,9 @@ class TournamentMatchViewSet(viewsets.ModelViewSet):
             if bowler.id not in team_player_ids:
                 return Response({"detail": "Player must be in current bowling team"}, status=status.HTTP_400_BAD_REQUEST)
             
-            state.current_bowler = bowler
-            state.save(update_fields=["current_bowler"])
+            # Advances ball_seq like a change_bowler delivery, so batch clients see one sequence
+            change_bowler(state, bowler)
+            state.save(update_fields=["current_bowler", "ball_seq", "updated_at"])
             
             return Response(CricketMatchStateSerializer(state).data)
         except TournamentMatch.DoesNotExist:
@@ -1794,91 +1977,73 @@ class TournamentMatchViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=["post"], url_path="score")
     def add_score(self, request, pk=None):
         """Add runs to current score (0, 1, 2, 3, 4, 5, 6)."""
+        runs = request.data.get("runs")
+        if runs is None:
+            return Response({"detail": "runs required (0-6)"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            runs = int(runs)
+        except (ValueError, TypeError):
+            return Response({"detail": "runs must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+        
+        if runs < 0 or runs > 6:
+            return Response({"detail": "runs must be between 0 and 6"}, status=status.HTTP_400_BAD_REQUEST)
+
         try:
+            engine = live_scoring.get_engine()
+            if engine is not None:
+                live = engine.record_runs(self.get_live_match(engine, pk), runs)
+                return Response(CricketMatchStateSerializer(live.state).data)
+
             match = self.get_queryset().get(pk=pk)
             state = match.cricket_state
             
             if not state or match.status != TournamentMatch.Status.IN_PROGRESS:
                 return Response({"detail": "Match not in progress"}, status=status.HTTP_400_BAD_REQUEST)
             
-            runs = request.data.get("runs")
-            if runs is None:
-                return Response({"detail": "runs required (0-6)"}, status=status.HTTP_400_BAD_REQUEST)
-            
-            try:
-                runs = int(runs)
-            except (ValueError, TypeError):
-                return Response({"detail": "runs must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
-            
-            if runs < 0 or runs > 6:
-                return Response({"detail": "runs must be between 0 and 6"}, status=status.HTTP_400_BAD_REQUEST)
-            
             if not state.current_striker or not state.current_bowler:
                 return Response({"detail": "Batsman and bowler must be set"}, status=status.HTTP_400_BAD_REQUEST)
             
-            # Update team score
-            if state.current_batting_team == match.team1:
-                state.team1_runs += runs
-                match.score_team1 = state.team1_runs
-            else:
-                state.team2_runs += runs
-                match.score_team2 = state.team2_runs
-            
-            # Update batsman stats
             striker_stats, _ = MatchPlayerStats.objects.get_or_create(
                 match=match,
                 player=state.current_striker,
                 team=state.current_batting_team
             )
-            striker_stats.runs_scored += runs
-            striker_stats.balls_faced += 1
-            if runs == 4:
-                striker_stats.fours += 1
-            elif runs == 6:
-                striker_stats.sixes += 1
-            striker_stats.save()
-            
-            # Update bowler stats
             bowler_stats, _ = MatchPlayerStats.objects.get_or_create(
                 match=match,
                 player=state.current_bowler,
                 team=state.current_bowling_team
             )
-            bowler_stats.runs_conceded += runs
-            bowler_stats.overs_bowled = float(state.total_balls_bowled) / 6.0
+            score_runs(match, state, striker_stats, bowler_stats, runs)
+
+            striker_stats.save()
             bowler_stats.save()
-            
-            # Update ball count
-            state.current_ball += 1
-            state.total_balls_bowled += 1
-            
-            # Check if over is complete (6 balls)
-            if state.current_ball >= 6:
-                state.current_ball = 0
-                state.current_over += 1
-                # Switch striker on odd runs
-                if runs % 2 == 1:
-                    state.current_striker = state.batsman2 if state.current_striker == state.batsman1 else state.batsman1
-            
             state.save()
             match.save(update_fields=["score_team1", "score_team2"])
             
-            # Check if match should end (all overs completed or 10 wickets)
-            max_overs = match.tournament.overs_per_match
-            current_wickets = state.team1_wickets if state.current_batting_team == match.team1 else state.team2_wickets
-            
-            if state.current_over >= max_overs or current_wickets >= 10:
-                # Match innings complete - will need to switch teams or end match
-                pass
-            
             return Response(CricketMatchStateSerializer(state).data)
+        except live_scoring.LiveScoringError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
         except TournamentMatch.DoesNotExist:
             return Response({"detail": "Match not found"}, status=status.HTTP_404_NOT_FOUND)
 
     @action(detail=True, methods=["post"], url_path="wicket")
     def add_wicket(self, request, pk=None):
         """Add a wicket: mark batsman out, select next batsman."""
+        next_batsman_id = request.data.get("next_batsman_id")
+        if not next_batsman_id:
+            return Response({"detail": "next_batsman_id required"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            next_batsman_id = int(next_batsman_id)
+        except (ValueError, TypeError):
+            return Response({"detail": "next_batsman_id must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+
         try:
+            engine = live_scoring.get_engine()
+            if engine is not None:
+                live = engine.record_wicket(self.get_live_match(engine, pk), next_batsman_id)
+                return Response(CricketMatchStateSerializer(live.state).data)
+
             match = self.get_queryset().get(pk=pk)
             state = match.cricket_state
             
@@ -1888,44 +2053,7 @@ class TournamentMatchViewSet(viewsets.ModelViewSet):
             if not state.current_striker:
                 return Response({"detail": "No batsman on strike"}, status=status.HTTP_400_BAD_REQUEST)
             
-            next_batsman_id = request.data.get("next_batsman_id")
-            if not next_batsman_id:
-                return Response({"detail": "next_batsman_id required"}, status=status.HTTP_400_BAD_REQUEST)
-            
-            # Mark current striker as out
-            striker_stats, _ = MatchPlayerStats.objects.get_or_create(
-                match=match,
-                player=state.current_striker,
-                team=state.current_batting_team
-            )
-            striker_stats.is_out = True
-            striker_stats.balls_faced += 1
-            striker_stats.save()
-            
-            # Update bowler stats
-            if state.current_bowler:
-                bowler_stats, _ = MatchPlayerStats.objects.get_or_create(
-                    match=match,
-                    player=state.current_bowler,
-                    team=state.current_bowling_team
-                )
-                bowler_stats.wickets_taken += 1
-                bowler_stats.overs_bowled = float(state.total_balls_bowled) / 6.0
-                bowler_stats.save()
-            
-            # Update wickets
-            if state.current_batting_team == match.team1:
-                state.team1_wickets += 1
-                match.wickets_team1 = state.team1_wickets
-            else:
-                state.team2_wickets += 1
-                match.wickets_team2 = state.team2_wickets
-            
-            # Set next batsman
-            try:
-                next_batsman = Player.objects.get(id=next_batsman_id)
-            except Player.DoesNotExist:
-                return Response({"detail": "Next batsman not found"}, status=status.HTTP_404_NOT_FOUND)
+            next_batsman = Player.objects.get(id=next_batsman_id)
             
             # Verify next batsman is in batting team
             team_player_ids = set(
@@ -1939,32 +2067,51 @@ class TournamentMatchViewSet(viewsets.ModelViewSet):
             if next_batsman.id not in team_player_ids:
                 return Response({"detail": "Next batsman must be in batting team"}, status=status.HTTP_400_BAD_REQUEST)
             
-            # Replace the out batsman
-            if state.current_striker == state.batsman1:
-                state.batsman1 = next_batsman
-                state.current_striker = next_batsman
-            else:
-                state.batsman2 = next_batsman
-                state.current_striker = next_batsman
-            
-            # Update ball count
-            state.current_ball += 1
-            state.total_balls_bowled += 1
-            
-            if state.current_ball >= 6:
-                state.current_ball = 0
-                state.current_over += 1
-            
+            striker_stats, _ = MatchPlayerStats.objects.get_or_create(
+                match=match,
+                player=state.current_striker,
+                team=state.current_batting_team
+            )
+            bowler_stats = None
+            if state.current_bowler:
+                bowler_stats, _ = MatchPlayerStats.objects.get_or_create(
+                    match=match,
+                    player=state.current_bowler,
+                    team=state.current_bowling_team
+                )
+            take_wicket(match, state, striker_stats, bowler_stats, next_batsman)
+
+            striker_stats.save()
+            if bowler_stats is not None:
+                bowler_stats.save()
             state.save()
             match.save(update_fields=["wickets_team1", "wickets_team2"])
             
-            # Check if all out (10 wickets)
-            current_wickets = state.team1_wickets if state.current_batting_team == match.team1 else state.team2_wickets
-            if current_wickets >= 10:
-                # Switch innings or end match
-                pass
-            
             return Response(CricketMatchStateSerializer(state).data)
+        except live_scoring.LiveScoringError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        except Player.DoesNotExist:
+            return Response({"detail": "Next batsman not found"}, status=status.HTTP_404_NOT_FOUND)
+        except TournamentMatch.DoesNotExist:
+            return Response({"detail": "Match not found"}, status=status.HTTP_404_NOT_FOUND)
+
+    @action(detail=True, methods=["post"], url_path="deliveries")
+    def record_deliveries(self, request, pk=None):
+        """Apply a numbered batch of deliveries queued by an offline scorer, all or nothing.
+
+        Body: {"deliveries": [{"seq": n, "type": "runs|extra|wicket|bowler", ...}, ...]} with seq
+        continuing from the state's ball_seq; gaps and replays are rejected with 409.
+        """
+        try:
+            match = self.get_queryset().get(pk=pk)
+            state = apply_deliveries(match, request.data.get("deliveries"))
+            return Response(CricketMatchStateSerializer(state).data)
+        except SequenceError as exc:
+            return Response(
+                {"detail": str(exc), "seq": exc.seq, "expected_seq": exc.expected}, status=status.HTTP_409_CONFLICT
+            )
+        except DeliveryError as exc:
+            return Response({"detail": str(exc), "seq": exc.seq}, status=status.HTTP_400_BAD_REQUEST)
         except TournamentMatch.DoesNotExist:
             return Response({"detail": "Match not found"}, status=status.HTTP_404_NOT_FOUND)
 
@@ -2042,48 +2189,18 @@ class TournamentMatchViewSet(viewsets.ModelViewSet):
                     
                     points_entry.save()
             
-            # Update player career stats from match stats
-            match_stats = MatchPlayerStats.objects.filter(match=match).select_related("player", "team")
-            for stat in match_stats:
-                # Update cricket stats in PlayerSportProfile
-                profile = PlayerSportProfile.objects.filter(
-                    player=stat.player,
-                    sport=match.tournament.sport,
-                    is_active=True
-                ).first()
-                
-                if profile:
-                    # Update cricket-specific stats
-                    from .models import CricketStats
-                    cricket_stats, _ = CricketStats.objects.get_or_create(
-                        profile=profile
-                    )
-                    cricket_stats.runs += stat.runs_scored
-                    cricket_stats.wickets += stat.wickets_taken
-                    cricket_stats.matches_played += 1
-                    
-                    # Recalculate averages
-                    if cricket_stats.matches_played > 0:
-                        cricket_stats.average = cricket_stats.runs / cricket_stats.matches_played if cricket_stats.matches_played > 0 else 0
-                    
-                    cricket_stats.save()
+            # Roll match stats up into career stats in one grouped pass
+            roll_up_match(match)
             
-            # Create Man of the Match achievement
-            if match.man_of_the_match:
-                from .models import Achievement
-                Achievement.objects.get_or_create(
-                    player=match.man_of_the_match,
-                    title=f"Man of the Match - {match.tournament.name}",
-                    description=f"Man of the Match in {match.team1.name} vs {match.team2.name}",
-                    defaults={
-                        "sport": match.tournament.sport,
-                        "date_awarded": match.date.date() if match.date else timezone.now().date()
-                    }
-                )
+            award_match(match)
             
             match.status = TournamentMatch.Status.COMPLETED
             match.is_completed = True
             match.save(update_fields=["status", "is_completed", "man_of_the_match"])
+            refresh_match_careers(match)
+            match = TournamentMatch.objects.select_related(*TOURNAMENT_MATCH_RELATED).prefetch_related(
+                full_tournament()
+            ).get(pk=match.pk)
             
             return Response({
                 "detail": "Match completed",
@@ -2094,16 +2211,26 @@ class TournamentMatchViewSet(viewsets.ModelViewSet):
 
     @action(detail=True, methods=["get"], url_path="state")
     def get_match_state(self, request, pk=None):
-        """Get current match state."""
-        try:
-            match = self.get_queryset().get(pk=pk)
-            try:
-                state = match.cricket_state
-                return Response(CricketMatchStateSerializer(state).data)
-            except CricketMatchState.DoesNotExist:
-                return Response({"detail": "Match not started"}, status=status.HTTP_404_NOT_FOUND)
-        except TournamentMatch.DoesNotExist:
+        """Get current match state; 304 if the ETag still matches."""
+        # One narrow query checks visibility and yields the state's version
+        row = self.get_queryset().filter(pk=pk).values(
+            "status", "cricket_state__ball_seq", "cricket_state__updated_at"
+        ).first()
+        if row is None:
             return Response({"detail": "Match not found"}, status=status.HTTP_404_NOT_FOUND)
+        updated_at = row["cricket_state__updated_at"]
+        if updated_at is None:
+            return Response({"detail": "Match not started"}, status=status.HTTP_404_NOT_FOUND)
+        directory, directory_at = current_version(DIRECTORY)
+        version = directory and (
+            f"{pk}.{row['cricket_state__ball_seq']}.{int(updated_at.timestamp() * 1_000_000)}.{row['status']}.{directory}"
+        )
+
+        def build():
+            state = CricketMatchState.objects.select_related(*CRICKET_STATE_RELATED).get(match_id=pk)
+            return Response(CricketMatchStateSerializer(state).data)
+
+        return conditional_response(request, version, build, directory_at and max(updated_at.timestamp(), directory_at))
 
     @action(detail=True, methods=["get"], url_path="player-stats")
     def get_player_stats(self, request, pk=None):
@@ -2117,6 +2244,23 @@ class TournamentMatchViewSet(viewsets.ModelViewSet):
         except TournamentMatch.DoesNotExist:
             return Response({"detail": "Match not found"}, status=status.HTTP_404_NOT_FOUND)
 
+    @action(detail=True, methods=["get"], url_path="scorecard")
+    def get_scorecard(self, request, pk=None):
+        """Batting and bowling cards, fall of wickets and extras per innings; 304 if the ETag still matches."""
+        try:
+            match = self.get_queryset().get(pk=pk)
+            try:
+                state = match.cricket_state
+            except CricketMatchState.DoesNotExist:
+                return Response({"detail": "Match not started"}, status=status.HTTP_404_NOT_FOUND)
+        except TournamentMatch.DoesNotExist:
+            return Response({"detail": "Match not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        version = scorecard_version(match, state)
+        return conditional_response(
+            request, version, lambda: Response(cached_scorecard(match, state, version)), state.updated_at.timestamp()
+        )
+
     @action(detail=True, methods=["post"], url_path="cancel")
     def cancel_match(self, request, pk=None):
         """Cancel match: set to no result, don't update stats."""
@@ -2147,6 +2291,7 @@ class ManagerSportAssignmentViewSet(viewsets.GenericViewSet):
     queryset = ManagerSport.objects.select_related("manager__user", "sport", "assigned_by")
     serializer_class = ManagerSportSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = LinkHeaderPagination
 
     def get_permissions(self):
         # Only admin can assign managers to sports
@@ -2156,16 +2301,17 @@ class ManagerSportAssignmentViewSet(viewsets.GenericViewSet):
 
     def list(self, request):
         """List manager-sport assignments. Managers see their own, admins see all."""
-        qs = self.get_queryset()
+        qs = self.get_queryset().order_by("-assigned_at")
         if request.user.role == User.Roles.MANAGER:
-            if hasattr(request.user, 'manager'):
-                qs = qs.filter(manager=request.user.manager)
+            manager_id = get_principal(request).manager_id
+            if manager_id is not None:
+                qs = qs.filter(manager_id=manager_id)
             else:
                 qs = qs.none()
         elif request.user.role != User.Roles.ADMIN:
             qs = qs.none()
-        serializer = self.get_serializer(qs, many=True)
-        return Response(serializer.data)
+        page = self.paginate_queryset(qs)
+        return self.get_paginated_response(self.get_serializer(page, many=True).data)
 
     def create(self, request):
         """Admin assigns manager to sport."""
@@ -2202,7 +2348,7 @@ class ManagerSportAssignmentViewSet(viewsets.GenericViewSet):
 # -----------------------------
 # PlayerSportProfile ViewSet
 # -----------------------------
-class PlayerSportProfileViewSet(viewsets.ModelViewSet):
+class PlayerSportProfileViewSet(DynamicFieldsViewMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing PlayerSportProfile - allows managers/coaches to assign players to teams.
     """
@@ -2216,24 +2362,24 @@ class PlayerSportProfileViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         """Filter based on user role"""
-        user = self.request.user
         qs = super().get_queryset()
 
         # Managers can see profiles for their sports
-        if user.role == user.Roles.MANAGER:
-            if hasattr(user, 'manager'):
-                managed_sports = ManagerSport.objects.filter(manager=user.manager).values_list('sport_id', flat=True)
+        principal = get_principal(self.request)
+        if principal.is_manager:
+            if principal.manager_id is not None:
+                managed_sports = ManagerSport.objects.filter(manager_id=principal.manager_id).values_list('sport_id', flat=True)
                 qs = qs.filter(sport_id__in=managed_sports)
 
         # Coaches can see their own players
-        elif user.role == user.Roles.COACH:
-            if hasattr(user, 'coach'):
-                qs = qs.filter(coach=user.coach)
+        elif principal.is_coach:
+            if principal.coach_id is not None:
+                qs = qs.filter(coach_id=principal.coach_id)
 
         # Players can see their own profiles
-        elif user.role == user.Roles.PLAYER:
-            if hasattr(user, 'player'):
-                qs = qs.filter(player=user.player)
+        elif principal.is_player:
+            if principal.player_id is not None:
+                qs = qs.filter(player_id=principal.player_id)
 
         return qs
 
@@ -2243,15 +2389,15 @@ class PlayerSportProfileViewSet(viewsets.ModelViewSet):
         instance = self.get_object()
 
         # Check permissions
-        user = request.user
-        if user.role == user.Roles.MANAGER:
+        principal = get_principal(request)
+        if principal.is_manager:
             # Manager can update if they manage the sport
-            if hasattr(user, 'manager'):
-                if not ManagerSport.objects.filter(manager=user.manager, sport=instance.sport).exists():
+            if principal.manager_id is not None:
+                if not ManagerSport.objects.filter(manager_id=principal.manager_id, sport=instance.sport_id).exists():
                     return Response({"detail": "You don't manage this sport"}, status=status.HTTP_403_FORBIDDEN)
-        elif user.role == user.Roles.COACH:
+        elif principal.is_coach:
             # Coach can update if it's their player
-            if not hasattr(user, 'coach') or instance.coach_id != user.coach.id:
+            if instance.coach_id != principal.coach_id:
                 return Response({"detail": "Not your player"}, status=status.HTTP_403_FORBIDDEN)
         else:
             return Response({"detail": "Only managers and coaches can update profiles"}, status=status.HTTP_403_FORBIDDEN)
@@ -2266,13 +2412,15 @@ class PlayerSportProfileViewSet(viewsets.ModelViewSet):
 # -----------------------------
 # Coach ViewSet
 # -----------------------------
-class CoachViewSet(viewsets.ReadOnlyModelViewSet):
+class CoachViewSet(DynamicFieldsViewMixin, SearchActionsMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for listing coaches. Players can view available coaches by sport.
     """
     queryset = Coach.objects.select_related("user", "primary_sport").filter(primary_sport__isnull=False)
     serializer_class = CoachSerializer
     permission_classes = [IsAuthenticated]
+    search_kind = SearchDocument.Kind.COACH
+    search_related = ["user", "primary_sport"]
 
     def get_queryset(self):
         """Filter coaches by sport if sport_id is provided."""
@@ -2286,3 +2434,54 @@ class CoachViewSet(viewsets.ReadOnlyModelViewSet):
                 # If sport_id is invalid, return empty queryset
                 qs = qs.none()
         return qs
+
+
+# ------------------ EXPORTS ------------------
+EXPORT_ID_PARAMS = {"sport": "sport_id", "coach": "coach_id", "tournament": "tournament_id"}
+
+
+@api_view(["GET"])
+@permission_classes([IsAuthenticatedAndManagerOrAdmin])
+def export_data(request, dataset, extension):
+    """Stream a dataset as CSV or NDJSON: /exports/<dataset>.<csv|ndjson>.
+
+    Filters: sport_id, coach_id, tournament_id, date_from, date_to (YYYY-MM-DD).
+    Managers only get rows for the sports they manage.
+    """
+    params = request.query_params
+    filters = {}
+    try:
+        for name, param in EXPORT_ID_PARAMS.items():
+            if params.get(param):
+                filters[name] = int(params[param])
+        for name in ("date_from", "date_to"):
+            if params.get(name):
+                filters[name] = parse_date(params[name])
+                if filters[name] is None:
+                    raise ValueError
+    except ValueError:
+        return Response(
+            {"detail": "sport_id, coach_id and tournament_id must be integers; dates must be YYYY-MM-DD"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    principal = get_principal(request)
+    sports = None
+    if principal.is_manager:
+        sports = ManagerSport.objects.filter(manager_id=principal.manager_id).values("sport_id")
+    try:
+        header, rows = export_rows(dataset, filters, sports)
+        body = encode(extension, header, rows)
+    except ExportError as exc:
+        return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+    response = StreamingHttpResponse(body, content_type=EXPORT_FORMATS[extension])
+    response["Content-Disposition"] = f'attachment; filename="{dataset}.{extension}"'
+    return response
+
+
+# ------------------ METRICS ------------------
+@api_view(["GET"])
+@permission_classes([IsAuthenticatedAndAdmin])
+def metrics(request):
+    """Per-endpoint request metrics in Prometheus text exposition format."""
+    return HttpResponse(registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -53,8 +53,8 @@ INSTALLED_APPS = [
 # REST Framework settings - consolidated
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
-        'rest_framework.authentication.TokenAuthentication',
+        'core.authentication.StatelessJWTAuthentication',
+        'core.authentication.ProfileTokenAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
@@ -78,8 +78,18 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.QueryMetricsMiddleware',
 ]
 
+# Requests running more SQL queries than this are logged by QueryMetricsMiddleware
+METRICS_QUERY_BUDGET = config('METRICS_QUERY_BUDGET', default=50, cast=int)
+
+# Optional write-behind live scoring (core/services/live_scoring.py). State is held per
+# process, so only enable it when one worker serves scoring traffic for a match.
+LIVE_SCORING_ENABLED = config('LIVE_SCORING_ENABLED', default=False, cast=bool)
+LIVE_SCORING_FLUSH_SECONDS = config('LIVE_SCORING_FLUSH_SECONDS', default=15, cast=int)
+LIVE_SCORING_JOURNAL_DIR = config('LIVE_SCORING_JOURNAL_DIR', default=str(BASE_DIR / 'live_journal'))
+
 ROOT_URLCONF = 'yultimate_project.urls'
 
 TEMPLATES = [
@@ -129,6 +139,45 @@ else:
         }
     }
 
+if DATABASES['default']['ENGINE'].endswith('postgresql'):
+    # Trigram lookups used by player/coach search (core/services/search.py)
+    INSTALLED_APPS.append('django.contrib.postgres')
+
+
+# Cache - shared Redis when REDIS_URL is set, otherwise per-process memory
+REDIS_URL = config('REDIS_URL', default='')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# JWTs are trusted without loading the user only when their revocation marks
+# (kept in the cache, see core/authentication.py) reach every worker
+STATELESS_JWT = bool(REDIS_URL)
+# The same holds for the version stamps behind dashboard/points-table 304s (core/services/versions.py)
+SHARED_VERSION_STAMPS = bool(REDIS_URL)
+SIMPLE_JWT = {
+    # Tokens carry a hash of the password, so the database fallback rejects them once it changes
+    'CHECK_REVOKE_TOKEN': True,
+}
+
+# Tournament leaderboards are cached until a match completes, and at most this long
+TOURNAMENT_LEADERS_CACHE_SECONDS = config('TOURNAMENT_LEADERS_CACHE_SECONDS', default=300, cast=int)
+# Compiled scorecards are keyed by the match state's version, so this only bounds memory
+SCORECARD_CACHE_SECONDS = config('SCORECARD_CACHE_SECONDS', default=3600, cast=int)
+
+# Partitioned Parquet exports for analytics (core/services/columnar.py); needs pyarrow
+ANALYTICS_EXPORT_DIR = config('ANALYTICS_EXPORT_DIR', default=str(BASE_DIR / 'analytics'))
 
 
 # Password validation
@@ -197,6 +246,9 @@ CORS_ALLOW_HEADERS = [
     'x-requested-with',
 ]
 
+# Paging metadata from core.pagination.LinkHeaderPagination travels in headers
+CORS_EXPOSE_HEADERS = ['Link', 'X-Total-Count']
+
 # Media files (for team logos, etc.)
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.urls import path, include
 from django.http import JsonResponse
+from core.views import metrics
 
 def home(request):
     return JsonResponse({
@@ -20,5 +21,6 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('core.urls')),
     path('', home),
+    path('metrics', metrics, name='metrics'),
     path("api/ai_an/", include("ai_an.urls")),
 ]
@@ -783,7 +783,7 @@ export default function ManagerDashboard() {
                               <span className="ml-2 text-xs">({m.score_team1}/{m.wickets_team1} - {m.score_team2}/{m.wickets_team2})</span>
                             )}
                             {m.man_of_the_match && (
-                              <span className="ml-2 text-xs text-blue-600">MOM: {m.man_of_the_match?.user?.username || 'Player'}</span>
+                              <span className="ml-2 text-xs text-blue-600">MOM: {m.man_of_the_match?.username || 'Player'}</span>
                             )}
                             {m.status === 'in_progress' && (
                               <span className="ml-2 text-xs text-[#10b981]">● Live</span>
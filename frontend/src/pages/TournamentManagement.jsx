@@ -457,7 +457,7 @@ export default function TournamentManagement() {
                                   )}
                                   {match.man_of_the_match && (
                                     <div className="text-xs text-[#38bdf8] mt-1">
-                                      MoM: {match.man_of_the_match?.user?.username || 'Player'}
+                                      MoM: {match.man_of_the_match?.username || 'Player'}
                                     </div>
                                   )}
                                 </div>